@@ -1,14 +1,49 @@
 """Эндпойнты аутентификации."""
 
-from fastapi import APIRouter, HTTPException, Request, status
+import time
+from typing import Optional, Tuple
+
+from fastapi import APIRouter, Depends, HTTPException, Request, status
+from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 from pydantic import BaseModel, EmailStr
 
-from app.database import create_user, get_user_by_email, get_user_by_username
-from app.security.auth import Role, create_access_token, get_password_hash, verify_password
+from app.database import (
+    acreate_session,
+    acreate_user,
+    adelete_session,
+    aget_user_by_email,
+    aget_user_by_id,
+    aget_user_by_username,
+    arevoke_token,
+    arotate_session,
+    get_engine,
+)
+from app.dependencies import get_current_user_record
+from app.models import User
+from app.security.auth import (
+    PasswordHasherBusy,
+    Role,
+    aget_password_hash,
+    averify_password,
+    create_access_token,
+    decode_access_token_cached,
+    token_cache,
+)
 from app.security.input_validation import validate_string_length
+from app.security.revocation import revocation_store
+from app.security.sessions import (
+    new_secret,
+    new_session_id,
+    secret_digest,
+    session_store,
+    split_token,
+)
 
 router = APIRouter(prefix="/auth", tags=["auth"])
 
+# Токен для logout необязателен: выход без токена остаётся успешным
+optional_bearer = HTTPBearer(auto_error=False)
+
 
 class RegisterRequest(BaseModel):
     """Запрос на регистрацию."""
@@ -25,11 +60,103 @@ class LoginRequest(BaseModel):
     password: str
 
 
+class RefreshRequest(BaseModel):
+    """Запрос на обновление access-токена."""
+
+    refresh_token: str
+
+
+class LogoutRequest(BaseModel):
+    """Запрос на выход: refresh-токен закрывает сессию."""
+
+    refresh_token: Optional[str] = None
+
+
+class UserResponse(BaseModel):
+    """Данные текущего пользователя."""
+
+    id: int
+    username: str
+    email: str
+    role: str
+
+
+def hasher_busy() -> HTTPException:
+    """Ошибка 503: пул хеширования паролей занят, запрос стоит повторить позже."""
+    return HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail="Authentication is temporarily overloaded, retry later",
+        headers={"Retry-After": "1"},
+    )
+
+
 class TokenResponse(BaseModel):
     """Ответ с токеном."""
 
     access_token: str
     token_type: str = "bearer"
+    refresh_token: Optional[str] = None
+
+
+# Сессии refresh-токенов: в памяти процесса или, если движок делят
+# несколько процессов, в самом движке (иначе refresh работал бы только в
+# воркере, выдавшем токен)
+
+
+async def open_session(user_id: int) -> str:
+    """Открыть сессию пользователя и вернуть её refresh-токен."""
+    if not get_engine().multi_process:
+        return session_store.create(user_id)
+    session_id = new_session_id()
+    token, digest = new_secret(session_id)
+    await acreate_session(session_id, user_id, digest, time.time() + session_store.ttl)
+    return token
+
+
+async def rotate_session(token: str) -> Optional[Tuple[int, str]]:
+    """Обменять refresh-токен на новый: (user_id, новый токен) или None."""
+    if not get_engine().multi_process:
+        return session_store.rotate(token)
+    parts = split_token(token)
+    if parts is None:
+        return None
+    session_id, secret = parts
+    new_token, new_digest = new_secret(session_id)
+    user_id = await arotate_session(
+        session_id, secret_digest(secret), new_digest, time.time() + session_store.ttl
+    )
+    return None if user_id is None else (user_id, new_token)
+
+
+async def close_session(token: str) -> bool:
+    """Закрыть сессию по её действующему refresh-токену."""
+    if not get_engine().multi_process:
+        return session_store.revoke(token)
+    parts = split_token(token)
+    if parts is None:
+        return False
+    session_id, secret = parts
+    return await adelete_session(session_id, secret_digest(secret))
+
+
+async def issue_tokens(user: User) -> TokenResponse:
+    """Access-токен и refresh-токен новой сессии пользователя."""
+    # sub должен быть строкой для JWT
+    access_token = create_access_token(data={"sub": str(user.id), "role": user.role})
+    return TokenResponse(
+        access_token=access_token,
+        token_type="bearer",
+        refresh_token=await open_session(user.id),
+    )
+
+
+def invalid_refresh_token() -> HTTPException:
+    """Ошибка 401: refresh-токен неизвестен, истёк или уже использован."""
+    return HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail="Invalid refresh token",
+        headers={"WWW-Authenticate": "Bearer"},
+    )
 
 
 @router.post("/register", response_model=TokenResponse, status_code=status.HTTP_201_CREATED)
@@ -54,31 +181,36 @@ async def register(request: Request, user_data: RegisterRequest):
         )
 
     # Проверка на существующего пользователя
-    if get_user_by_username(user_data.username):
+    if await aget_user_by_username(user_data.username):
         raise HTTPException(
             status_code=status.HTTP_409_CONFLICT,
             detail="Username already registered",
         )
 
-    if get_user_by_email(user_data.email):
+    if await aget_user_by_email(user_data.email):
         raise HTTPException(
             status_code=status.HTTP_409_CONFLICT,
             detail="Email already registered",
         )
 
     # Создание пользователя
-    hashed_password = get_password_hash(user_data.password)
-    user = create_user(
-        username=user_data.username,
-        email=user_data.email,
-        hashed_password=hashed_password,
-        role=Role.USER,
-    )
-
-    # Создание токена (sub должен быть строкой для JWT)
-    access_token = create_access_token(data={"sub": str(user.id), "role": user.role})
+    try:
+        hashed_password = await aget_password_hash(user_data.password)
+    except PasswordHasherBusy:
+        raise hasher_busy() from None
+    # Пока считался хеш, тот же username/email мог занять параллельный запрос
+    try:
+        user = await acreate_user(
+            username=user_data.username,
+            email=user_data.email,
+            hashed_password=hashed_password,
+            role=Role.USER,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(e)) from None
 
-    return TokenResponse(access_token=access_token, token_type="bearer")
+    # Создание токенов
+    return await issue_tokens(user)
 
 
 @router.post("/login", response_model=TokenResponse)
@@ -87,7 +219,7 @@ async def login(request: Request, credentials: LoginRequest):
     getattr(request.state, "correlation_id", None)
 
     # Поиск пользователя
-    user = get_user_by_username(credentials.username)
+    user = await aget_user_by_username(credentials.username)
     if not user:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -95,23 +227,77 @@ async def login(request: Request, credentials: LoginRequest):
             headers={"WWW-Authenticate": "Bearer"},
         )
 
-    # Проверка пароля
-    if not verify_password(credentials.password, user.hashed_password):
+    # Проверка пароля (в пуле хеширования, не в event loop)
+    try:
+        password_ok = await averify_password(credentials.password, user.hashed_password)
+    except PasswordHasherBusy:
+        raise hasher_busy() from None
+    if not password_ok:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect username or password",
             headers={"WWW-Authenticate": "Bearer"},
         )
 
-    # Создание токена (sub должен быть строкой для JWT)
-    access_token = create_access_token(data={"sub": str(user.id), "role": user.role})
+    # Создание токенов
+    return await issue_tokens(user)
 
-    return TokenResponse(access_token=access_token, token_type="bearer")
+
+@router.post("/refresh", response_model=TokenResponse)
+async def refresh(request: Request, body: RefreshRequest):
+    """Новый access-токен по refresh-токену без проверки пароля.
+
+    Refresh-токен ротируется: в ответе новый, предъявленный больше не
+    действует, а его повторное предъявление закрывает сессию.
+    """
+    getattr(request.state, "correlation_id", None)
+
+    rotated = await rotate_session(body.refresh_token)
+    if rotated is None:
+        raise invalid_refresh_token()
+    user_id, refresh_token = rotated
+
+    # Роль берётся из хранилища: удалённый пользователь сессию не продлит
+    user = await aget_user_by_id(user_id)
+    if user is None:
+        await close_session(refresh_token)
+        raise invalid_refresh_token()
+
+    access_token = create_access_token(data={"sub": str(user.id), "role": user.role})
+    return TokenResponse(
+        access_token=access_token, token_type="bearer", refresh_token=refresh_token
+    )
 
 
 @router.post("/logout")
-async def logout(request: Request):
-    """Выход пользователя (в MVP просто подтверждение)."""
-    # В реальном приложении здесь была бы инвалидация токена
-    # В MVP просто возвращаем успех
+async def logout(
+    request: Request,
+    body: Optional[LogoutRequest] = None,
+    credentials: Optional[HTTPAuthorizationCredentials] = Depends(optional_bearer),
+):
+    """Выход пользователя.
+
+    Переданный Bearer-токен отзывается до своего exp, переданный
+    refresh-токен закрывает свою сессию.
+    """
+    getattr(request.state, "correlation_id", None)
+
+    if body is not None and body.refresh_token:
+        await close_session(body.refresh_token)
+
+    if credentials is not None:
+        payload = decode_access_token_cached(credentials.credentials)
+        if payload is not None and "jti" in payload and "exp" in payload:
+            revocation_store.revoke(payload["jti"], payload["exp"])
+            token_cache.discard(credentials.credentials)
+            # Другие воркеры узнают об отзыве из общего движка
+            if get_engine().multi_process:
+                await arevoke_token(payload["jti"], payload["exp"])
     return {"message": "Successfully logged out"}
+
+
+@router.get("/me", response_model=UserResponse)
+async def me(request: Request, current_user: User = Depends(get_current_user_record)):
+    """Данные текущего пользователя (полная запись из хранилища)."""
+    getattr(request.state, "correlation_id", None)
+    return UserResponse(**current_user.to_dict())
@@ -1,21 +1,62 @@
 """Эндпойнты для работы с items."""
 
-from typing import List, Optional
-
-from fastapi import APIRouter, Depends, HTTPException, Request, status
+import base64
+import binascii
+import hashlib
+import json
+from json.encoder import encode_basestring
+from typing import AsyncIterator, List, Optional, Set, Tuple, Union
+
+from fastapi import APIRouter, Depends, Header, HTTPException, Request, Response, status
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 
-from app.database import create_item, delete_item, get_item_by_id, get_items, update_item
-from app.dependencies import get_current_active_user
-from app.models import Item, User
+from app.cache import CachedItem
+from app.database import (
+    acount_item_owners,
+    acount_items,
+    acreate_item,
+    acreate_items,
+    adelete_item,
+    adelete_items,
+    aget_item_by_id,
+    aget_items,
+    aget_items_by_ids,
+    aget_items_generation,
+    aget_user_by_id,
+    aiter_item_pages,
+    asearch_items,
+    aupdate_item,
+    aupdate_items,
+    change_feed,
+    change_feed_available,
+    get_engine,
+    item_cache,
+)
+from app.dependencies import get_current_active_user, require_admin
+from app.models import Item, Principal
 from app.security.input_validation import (
     validate_integer_range,
     validate_string_format,
     validate_string_length,
 )
+from app.storage.base import VersionConflictError
 
 router = APIRouter(prefix="/items", tags=["items"])
 
+# Максимальное число операций в одном пакетном запросе
+MAX_BATCH_SIZE = 500
+# Максимальная длина поискового запроса
+MAX_SEARCH_QUERY_LENGTH = 100
+# Число items, читаемых из хранилища за раз при экспорте
+EXPORT_PAGE_SIZE = 1000
+# Число строк импорта, вставляемых в хранилище за раз
+IMPORT_CHUNK_SIZE = 1000
+# Максимальная длина строки NDJSON при импорте
+MAX_IMPORT_LINE_BYTES = 64 * 1024
+# Сколько ошибок импорта перечисляется в ответе (остальные только считаются)
+MAX_IMPORT_ERRORS = 1000
+
 
 class ItemCreate(BaseModel):
     """Модель для создания item."""
@@ -40,64 +81,463 @@ class ItemResponse(BaseModel):
     description: Optional[str] = None
 
 
-def check_item_ownership(item: Item, user: User) -> bool:
-    """Проверить владение элементом."""
+class ItemStatsResponse(BaseModel):
+    """Счётчики items: всего, число владельцев и (по запросу) items владельца."""
+
+    total_items: int
+    owners: int
+    owner_items: Optional[int] = None
+
+
+class ItemImportError(BaseModel):
+    """Ошибка строки импорта (строки нумеруются с 1)."""
+
+    line: int
+    detail: str
+
+
+class ItemImportResponse(BaseModel):
+    """Итог импорта: создано, отклонено и первые MAX_IMPORT_ERRORS ошибок."""
+
+    created: int
+    failed: int
+    errors: List[ItemImportError]
+
+
+class ItemBatchUpdateEntry(ItemUpdate):
+    """Элемент пакетного обновления."""
+
+    id: int
+
+
+class ItemBatchCreateRequest(BaseModel):
+    """Запрос на пакетное создание items."""
+
+    items: List[ItemCreate]
+
+
+class ItemBatchUpdateRequest(BaseModel):
+    """Запрос на пакетное обновление items."""
+
+    items: List[ItemBatchUpdateEntry]
+
+
+class ItemBatchDeleteRequest(BaseModel):
+    """Запрос на пакетное удаление items."""
+
+    ids: List[int]
+
+
+class ItemBatchResult(BaseModel):
+    """Результат одной операции пакета (HTTP-статус операции)."""
+
+    status: int
+    id: Optional[int] = None
+    item: Optional[ItemResponse] = None
+    detail: Optional[str] = None
+
+
+class ItemBatchResponse(BaseModel):
+    """Ответ пакетной операции: результаты в порядке запроса."""
+
+    results: List[ItemBatchResult]
+
+
+def check_item_ownership(item: Union[Item, CachedItem], user: Principal) -> bool:
+    """Проверить владение элементом (item или его ответ из кэша)."""
     return item.owner_id == user.id or user.role == "admin"
 
 
+def validate_item_fields(name: Optional[str], description: Optional[str]) -> Optional[str]:
+    """Проверить поля item (None — поле не передано). Возвращает текст ошибки или None."""
+    if name is not None:
+        is_valid_length, length_error = validate_string_length(name, max_length=100, min_length=1)
+        if not is_valid_length:
+            return length_error or "Invalid name length"
+
+        is_valid_format, format_error = validate_string_format(name)
+        if not is_valid_format:
+            return format_error or "Invalid name format"
+
+    if description is not None:
+        is_valid_length, length_error = validate_string_length(
+            description, max_length=500, min_length=1
+        )
+        if not is_valid_length:
+            return length_error or "Invalid description length"
+
+    return None
+
+
+def encode_cursor(item_id: int) -> str:
+    """Закодировать курсор пагинации (непрозрачный для клиента)."""
+    return base64.urlsafe_b64encode(f"id:{item_id}".encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Optional[int]:
+    """Декодировать курсор пагинации. None если курсор некорректен."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        return None
+    prefix, _, value = raw.partition(":")
+    if prefix != "id" or not value.isdigit():
+        return None
+    return int(value)
+
+
+def item_etag(item: Item) -> str:
+    """Сильный ETag item: меняется с каждой версией item."""
+    return f'"{get_engine().epoch}-{item.id}-{item.version}"'
+
+
+def collection_etag(generation: int, *params) -> str:
+    """Сильный ETag страницы списка: поколение набора и параметры запроса."""
+    digest = hashlib.blake2b(repr(params).encode(), digest_size=8).hexdigest()
+    return f'"{get_engine().epoch}-g{generation}-{digest}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Совпадает ли ETag с заголовком If-None-Match (слабое сравнение)."""
+    if if_none_match is None:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    return any(tag.strip().removeprefix("W/") == etag for tag in if_none_match.split(","))
+
+
+def not_modified(etag: str) -> Response:
+    """Ответ 304 Not Modified без тела."""
+    return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+
+
+def precondition_failed() -> HTTPException:
+    """Ошибка 412: item изменён после получения клиентом его ETag."""
+    return HTTPException(
+        status_code=status.HTTP_412_PRECONDITION_FAILED,
+        detail="Item has been modified",
+    )
+
+
+def if_match_version(if_match: Optional[str], item: Item) -> Optional[int]:
+    """Версия item для compare-and-set по заголовку If-Match (сильное сравнение).
+
+    Returns:
+        None, если заголовка нет или передан If-Match: *
+    Raises:
+        HTTPException: 412, если ни один ETag не совпал с текущей версией item
+    """
+    if if_match is None or if_match.strip() == "*":
+        return None
+    etag = item_etag(item)
+    if not any(tag.strip() == etag for tag in if_match.split(",")):
+        raise precondition_failed()
+    return item.version
+
+
 @router.post("", response_model=ItemResponse, status_code=status.HTTP_201_CREATED)
 async def create_item_endpoint(
     request: Request,
+    response: Response,
     item_data: ItemCreate,
-    current_user: User = Depends(get_current_active_user),
+    current_user: Principal = Depends(get_current_active_user),
 ):
     """Создать новый item."""
     getattr(request.state, "correlation_id", None)
 
-    # Валидация name
-    is_valid_length, length_error = validate_string_length(
-        item_data.name, max_length=100, min_length=1
+    # Валидация name и description (если есть)
+    error = validate_item_fields(item_data.name, item_data.description or None)
+    if error:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=error,
+        )
+
+    item = await acreate_item(
+        name=item_data.name,
+        owner_id=current_user.id,
+        description=item_data.description,
+    )
+
+    response.headers["ETag"] = item_etag(item)
+    return ItemResponse(**item.to_dict())
+
+
+@router.get("/search", response_model=List[ItemResponse])
+async def search_items_endpoint(
+    request: Request,
+    q: str,
+    limit: int = 10,
+    current_user: Principal = Depends(get_current_active_user),
+):
+    """Поиск items по словам из name и description.
+
+    Все слова запроса должны встречаться в item, последнее — как префикс
+    слова. Пользователь ищет среди своих items, admin — среди всех.
+    Результаты упорядочены по id.
+    """
+    getattr(request.state, "correlation_id", None)
+
+    is_valid_query, query_error = validate_string_length(
+        q, max_length=MAX_SEARCH_QUERY_LENGTH, min_length=1
     )
-    if not is_valid_length:
+    if not is_valid_query:
         raise HTTPException(
             status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
-            detail=length_error or "Invalid name length",
+            detail=query_error or "Invalid search query",
         )
 
-    is_valid_format, format_error = validate_string_format(item_data.name)
-    if not is_valid_format:
+    is_valid_limit, _ = validate_integer_range(limit, min_value=1, max_value=100)
+    if not is_valid_limit:
         raise HTTPException(
             status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
-            detail=format_error or "Invalid name format",
+            detail="limit must be between 1 and 100",
         )
 
-    # Валидация description если есть
-    if item_data.description:
-        is_valid_length, length_error = validate_string_length(
-            item_data.description, max_length=500, min_length=1
+    # Та же видимость, что и в check_item_ownership
+    owner_id = None if current_user.role == "admin" else current_user.id
+    items = await asearch_items(q, owner_id=owner_id, limit=limit)
+    return [ItemResponse(**item.to_dict()) for item in items]
+
+
+@router.get("/changes", response_class=StreamingResponse)
+async def item_changes_endpoint(
+    request: Request,
+    last_event_id: Optional[str] = Header(None, alias="Last-Event-ID"),
+    current_user: Principal = Depends(get_current_active_user),
+):
+    """Лента изменений items (Server-Sent Events).
+
+    События create/update/delete приходят с id (seq) и телом item в JSON.
+    При переподключении клиент передаёт Last-Event-ID и получает
+    пропущенные события; если они уже вытеснены из буфера, приходит
+    событие reset — состояние нужно перечитать. Пользователь получает
+    события своих items, admin — всех. С движками, общими для нескольких
+    воркеров (sqlite, shared), лента не ведётся — 501.
+    """
+    getattr(request.state, "correlation_id", None)
+
+    if not change_feed_available():
+        raise HTTPException(
+            status_code=status.HTTP_501_NOT_IMPLEMENTED,
+            detail="Change feed is not available with a multi-process storage engine",
         )
-        if not is_valid_length:
+
+    after_seq = None
+    if last_event_id is not None:
+        if not last_event_id.isdigit():
             raise HTTPException(
                 status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
-                detail=length_error or "Invalid description length",
+                detail="Invalid Last-Event-ID",
             )
+        after_seq = int(last_event_id)
 
-    item = create_item(
-        name=item_data.name,
-        owner_id=current_user.id,
-        description=item_data.description,
+    owner_id = None if current_user.role == "admin" else current_user.id
+    return StreamingResponse(
+        change_feed.stream(owner_id, after_seq),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
     )
 
-    return ItemResponse(**item.to_dict())
+
+@router.get("/stats", response_model=ItemStatsResponse)
+async def item_stats_endpoint(
+    request: Request,
+    owner_id: Optional[int] = None,
+    current_user: Principal = Depends(require_admin),
+):
+    """Счётчики items (только admin).
+
+    Счётчики ведёт хранилище при создании и удалении items, запрос не
+    обходит items.
+    """
+    getattr(request.state, "correlation_id", None)
+
+    stats = ItemStatsResponse(total_items=await acount_items(), owners=await acount_item_owners())
+    if owner_id is not None:
+        stats.owner_items = await acount_items(owner_id)
+    return stats
+
+
+def ndjson_line(item: Item) -> str:
+    """Item строкой JSON с полями ItemResponse (без пробелов и перевода строки).
+
+    Собирается форматированием: id и owner_id — int, строки кодирует
+    json (encode_basestring); в разы быстрее json.dumps словаря.
+    """
+    description = encode_basestring(item.description) if item.description else "null"
+    return (
+        f'{{"id":{item.id},"name":{encode_basestring(item.name)},'
+        f'"owner_id":{item.owner_id},"description":{description}}}'
+    )
+
+
+async def export_ndjson() -> AsyncIterator[bytes]:
+    """NDJSON всех items, один блок на страницу хранилища."""
+    async for page in aiter_item_pages(EXPORT_PAGE_SIZE):
+        lines = [ndjson_line(item) for item in page]
+        lines.append("")
+        yield "\n".join(lines).encode()
+
+
+@router.get("/export", response_class=StreamingResponse)
+async def export_items_endpoint(
+    request: Request,
+    current_user: Principal = Depends(require_admin),
+):
+    """Выгрузить все items в NDJSON (только admin).
+
+    Ответ формируется потоком по мере чтения страниц хранилища, память не
+    зависит от числа items. Выгрузка не снимок: items, изменённые во
+    время неё, попадают в неё в состоянии на момент чтения их страницы.
+    """
+    getattr(request.state, "correlation_id", None)
+
+    return StreamingResponse(
+        export_ndjson(),
+        media_type="application/x-ndjson",
+        headers={"Content-Disposition": 'attachment; filename="items.ndjson"'},
+    )
+
+
+async def ndjson_lines(chunks: AsyncIterator[bytes]) -> AsyncIterator[List[Optional[bytes]]]:
+    """Строки тела NDJSON по мере поступления, списком на каждый блок тела.
+
+    Строка длиннее MAX_IMPORT_LINE_BYTES не накапливается: вместо неё
+    выдаётся None, остаток пропускается до перевода строки.
+    """
+    buffer = b""
+    oversized = False
+    async for chunk in chunks:
+        buffer += chunk
+        if b"\n" not in chunk:
+            if len(buffer) > MAX_IMPORT_LINE_BYTES:
+                buffer, oversized = b"", True
+            continue
+        lines: List[Optional[bytes]] = buffer.split(b"\n")
+        buffer = lines.pop()
+        if oversized:
+            lines[0], oversized = None, False
+        for index, line in enumerate(lines):
+            if line is not None and len(line) > MAX_IMPORT_LINE_BYTES:
+                lines[index] = None
+        if len(buffer) > MAX_IMPORT_LINE_BYTES:
+            buffer, oversized = b"", True
+        yield lines
+    if oversized:
+        yield [None]
+    elif buffer:
+        yield [buffer]
+
+
+def parse_import_line(line: Optional[bytes], default_owner_id: int) -> Tuple[tuple, Optional[str]]:
+    """Разобрать строку импорта в (name, owner_id, description).
+
+    Поля id и прочие (например, из выгрузки) игнорируются; без owner_id
+    item получает импортирующий. Возвращает (запись, текст ошибки).
+    """
+    if line is None:
+        return (), f"Line is longer than {MAX_IMPORT_LINE_BYTES} bytes"
+    try:
+        data = json.loads(line)
+    except (UnicodeDecodeError, ValueError):
+        return (), "Invalid JSON"
+    if not isinstance(data, dict):
+        return (), "Line must be a JSON object"
+
+    name = data.get("name")
+    description = data.get("description")
+    owner_id = data.get("owner_id", default_owner_id)
+    if not isinstance(name, str):
+        return (), "name must be a string"
+    if description is not None and not isinstance(description, str):
+        return (), "description must be a string or null"
+    if not isinstance(owner_id, int) or isinstance(owner_id, bool):
+        return (), "owner_id must be an integer"
+    # Вне диапазона движок не ищет владельца (sqlite: OverflowError)
+    is_valid, error_msg = validate_integer_range(owner_id, min_value=1)
+    if not is_valid:
+        return (), error_msg or "Invalid owner_id"
+
+    error = validate_item_fields(name, description or None)
+    if error:
+        return (), error
+    return (name, owner_id, description), None
+
+
+@router.post("/import", response_model=ItemImportResponse)
+async def import_items_endpoint(
+    request: Request,
+    current_user: Principal = Depends(require_admin),
+):
+    """Загрузить items из тела NDJSON (только admin).
+
+    Тело читается потоком: строки проверяются по мере поступления (те же
+    правила, что у POST /items, и существование владельца) и
+    вставляются пакетами по IMPORT_CHUNK_SIZE. Импорт не атомарен:
+    корректные строки создаются, ошибочные перечисляются в errors с
+    номерами строк. Пустые строки пропускаются.
+    """
+    getattr(request.state, "correlation_id", None)
+
+    created = failed = line_no = 0
+    errors: List[ItemImportError] = []
+    pending: List[tuple] = []
+    # Только найденные владельцы: несуществующие id из тела не копятся
+    known_owners: Set[int] = {current_user.id}
+
+    async for lines in ndjson_lines(request.stream()):
+        for line in lines:
+            line_no += 1
+            if line is not None and not line.strip():
+                continue
+            entry, error = parse_import_line(line, current_user.id)
+            if not error:
+                owner_id = entry[1]
+                if owner_id not in known_owners:
+                    if await aget_user_by_id(owner_id) is None:
+                        error = "Unknown owner_id"
+                    else:
+                        known_owners.add(owner_id)
+            if error:
+                failed += 1
+                if len(errors) < MAX_IMPORT_ERRORS:
+                    errors.append(ItemImportError(line=line_no, detail=error))
+                continue
+            pending.append(entry)
+            if len(pending) >= IMPORT_CHUNK_SIZE:
+                created += len(await acreate_items(pending))
+                pending = []
+    if pending:
+        created += len(await acreate_items(pending))
+
+    return ItemImportResponse(created=created, failed=failed, errors=errors)
+
+
+@router.get("/cache-stats")
+async def item_cache_stats_endpoint(
+    request: Request,
+    current_user: Principal = Depends(require_admin),
+):
+    """Счётчики кэша ответов items (только admin)."""
+    getattr(request.state, "correlation_id", None)
+    return item_cache.stats()
 
 
 @router.get("/{item_id}", response_model=ItemResponse)
 async def get_item_endpoint(
     request: Request,
     item_id: int,
-    current_user: User = Depends(get_current_active_user),
+    if_none_match: Optional[str] = Header(None),
+    current_user: Principal = Depends(get_current_active_user),
 ):
-    """Получить item по ID."""
+    """Получить item по ID.
+
+    Ответ несёт ETag версии item; при совпадении If-None-Match
+    возвращается 304 без тела (тело не строится и при промахе кэша).
+    Сериализованные ответы кэшируются (app.cache), проверка доступа
+    выполняется и для ответа из кэша.
+    """
     getattr(request.state, "correlation_id", None)
 
     # Валидация item_id
@@ -108,31 +548,63 @@ async def get_item_endpoint(
             detail=error_msg or "Invalid item_id",
         )
 
-    item = get_item_by_id(item_id)
-    if not item:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Item not found",
-        )
+    cached = item_cache.get(item_id)
+    item: Optional[Item] = None
+    if cached is None:
+        item = await aget_item_by_id(item_id)
+        if not item:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Item not found",
+            )
+        etag = item_etag(item)
+    else:
+        etag = cached.etag
 
     # Проверка доступа (только владелец или admin)
-    if not check_item_ownership(item, current_user):
+    if not check_item_ownership(item or cached, current_user):
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Not enough permissions to access this item",
         )
 
-    return ItemResponse(**item.to_dict())
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag)
+    if cached is None:
+        # Тело сериализуется только для ответа 200
+        cached = CachedItem(
+            owner_id=item.owner_id,
+            version=item.version,
+            etag=etag,
+            body=ItemResponse(**item.to_dict()).model_dump_json().encode(),
+        )
+        item_cache.put(item_id, cached)
+    return Response(
+        content=cached.body, media_type="application/json", headers={"ETag": cached.etag}
+    )
 
 
 @router.get("", response_model=List[ItemResponse])
 async def list_items(
     request: Request,
+    response: Response,
     limit: int = 10,
     offset: int = 0,
-    current_user: User = Depends(get_current_active_user),
+    cursor: Optional[str] = None,
+    if_none_match: Optional[str] = Header(None),
+    current_user: Principal = Depends(get_current_active_user),
 ):
-    """Получить список items с пагинацией."""
+    """Получить список items с пагинацией.
+
+    Поддерживаются два режима: limit/offset и keyset-пагинация по курсору.
+    Если есть следующая страница, её курсор возвращается в заголовке
+    X-Next-Cursor (в обоих режимах), общее число items пользователя
+    (для admin — всех) — в заголовке X-Total-Count.
+
+    ETag страницы строится из поколения набора items (меняется при любом
+    изменении набора) и параметров запроса; при совпадении If-None-Match
+    возвращается 304, страница не читается.
+    """
     getattr(request.state, "correlation_id", None)
 
     # Валидация параметров пагинации
@@ -150,9 +622,35 @@ async def list_items(
             detail="offset must be >= 0",
         )
 
+    after_id = None
+    if cursor is not None:
+        if offset:
+            raise HTTPException(
+                status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                detail="cursor cannot be combined with offset",
+            )
+        after_id = decode_cursor(cursor)
+        if after_id is None:
+            raise HTTPException(
+                status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                detail="Invalid cursor",
+            )
+
     # Получаем только items текущего пользователя (или все для admin)
     owner_id = None if current_user.role == "admin" else current_user.id
-    items = get_items(owner_id=owner_id, limit=limit, offset=offset)
+    # Поколение читается до страницы: изменение между ними сменит ETag
+    generation = await aget_items_generation(owner_id)
+    etag = collection_etag(generation, owner_id, limit, offset, after_id)
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag)
+    response.headers["ETag"] = etag
+    response.headers["X-Total-Count"] = str(await acount_items(owner_id))
+
+    # Запрашиваем на один элемент больше, чтобы узнать о следующей странице
+    items = await aget_items(owner_id=owner_id, limit=limit + 1, offset=offset, after_id=after_id)
+    if len(items) > limit:
+        items = items[:limit]
+        response.headers["X-Next-Cursor"] = encode_cursor(items[-1].id)
 
     return [ItemResponse(**item.to_dict()) for item in items]
 
@@ -160,11 +658,17 @@ async def list_items(
 @router.patch("/{item_id}", response_model=ItemResponse)
 async def update_item_endpoint(
     request: Request,
+    response: Response,
     item_id: int,
     item_data: ItemUpdate,
-    current_user: User = Depends(get_current_active_user),
+    if_match: Optional[str] = Header(None),
+    current_user: Principal = Depends(get_current_active_user),
 ):
-    """Обновить item."""
+    """Обновить item.
+
+    С заголовком If-Match обновление выполняется, только если item не
+    изменился с момента получения ETag (иначе 412).
+    """
     getattr(request.state, "correlation_id", None)
 
     # Валидация item_id
@@ -175,7 +679,7 @@ async def update_item_endpoint(
             detail=error_msg or "Invalid item_id",
         )
 
-    item = get_item_by_id(item_id)
+    item = await aget_item_by_id(item_id)
     if not item:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -189,40 +693,34 @@ async def update_item_endpoint(
             detail="Not enough permissions to update this item",
         )
 
+    # Предусловие If-Match (RFC 9110): версия, с которой клиент работал
+    expected_version = if_match_version(if_match, item)
+
     # Валидация полей если они обновляются
-    if item_data.name is not None:
-        is_valid_length, length_error = validate_string_length(
-            item_data.name, max_length=100, min_length=1
+    error = validate_item_fields(item_data.name, item_data.description)
+    if error:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=error,
         )
-        if not is_valid_length:
-            raise HTTPException(
-                status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
-                detail=length_error or "Invalid name length",
-            )
 
-        is_valid_format, format_error = validate_string_format(item_data.name)
-        if not is_valid_format:
-            raise HTTPException(
-                status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
-                detail=format_error or "Invalid name format",
-            )
-
-    if item_data.description is not None:
-        is_valid_length, length_error = validate_string_length(
-            item_data.description, max_length=500, min_length=1
+    try:
+        updated_item = await aupdate_item(
+            item_id=item_id,
+            name=item_data.name,
+            description=item_data.description,
+            expected_version=expected_version,
+        )
+    except VersionConflictError:
+        raise precondition_failed()
+    if updated_item is None:
+        # Удалён между проверкой и обновлением
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Item not found",
         )
-        if not is_valid_length:
-            raise HTTPException(
-                status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
-                detail=length_error or "Invalid description length",
-            )
-
-    updated_item = update_item(
-        item_id=item_id,
-        name=item_data.name,
-        description=item_data.description,
-    )
 
+    response.headers["ETag"] = item_etag(updated_item)
     return ItemResponse(**updated_item.to_dict())
 
 
@@ -230,9 +728,14 @@ async def update_item_endpoint(
 async def delete_item_endpoint(
     request: Request,
     item_id: int,
-    current_user: User = Depends(get_current_active_user),
+    if_match: Optional[str] = Header(None),
+    current_user: Principal = Depends(get_current_active_user),
 ):
-    """Удалить item."""
+    """Удалить item.
+
+    С заголовком If-Match удаление выполняется, только если item не
+    изменился с момента получения ETag (иначе 412).
+    """
     getattr(request.state, "correlation_id", None)
 
     # Валидация item_id
@@ -243,7 +746,7 @@ async def delete_item_endpoint(
             detail=error_msg or "Invalid item_id",
         )
 
-    item = get_item_by_id(item_id)
+    item = await aget_item_by_id(item_id)
     if not item:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -257,5 +760,158 @@ async def delete_item_endpoint(
             detail="Not enough permissions to delete this item",
         )
 
-    delete_item(item_id)
+    # Предусловие If-Match (RFC 9110): версия, с которой клиент работал
+    expected_version = if_match_version(if_match, item)
+
+    try:
+        await adelete_item(item_id, expected_version)
+    except VersionConflictError:
+        raise precondition_failed()
     return None
+
+
+# ========== Пакетные операции ==========
+
+
+def check_batch_size(size: int) -> None:
+    """Проверить размер пакета."""
+    is_valid, _ = validate_integer_range(size, min_value=1, max_value=MAX_BATCH_SIZE)
+    if not is_valid:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=f"batch must contain between 1 and {MAX_BATCH_SIZE} operations",
+        )
+
+
+async def authorize_batch(
+    item_ids: List[int], current_user: Principal, action: str
+) -> List[Optional[ItemBatchResult]]:
+    """Проверить id, существование и владение для пакета одним запросом к хранилищу.
+
+    Returns:
+        Для каждого id — результат с ошибкой или None, если операцию можно выполнять
+    """
+    errors: List[Optional[ItemBatchResult]] = [None] * len(item_ids)
+    lookup = []
+    for index, item_id in enumerate(item_ids):
+        is_valid, error_msg = validate_integer_range(item_id, min_value=1)
+        if not is_valid:
+            errors[index] = ItemBatchResult(
+                status=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                id=item_id,
+                detail=error_msg or "Invalid item_id",
+            )
+        else:
+            lookup.append(index)
+
+    items = await aget_items_by_ids([item_ids[index] for index in lookup])
+    for index, item in zip(lookup, items):
+        if item is None:
+            errors[index] = ItemBatchResult(
+                status=status.HTTP_404_NOT_FOUND, id=item_ids[index], detail="Item not found"
+            )
+        elif not check_item_ownership(item, current_user):
+            errors[index] = ItemBatchResult(
+                status=status.HTTP_403_FORBIDDEN,
+                id=item_ids[index],
+                detail=f"Not enough permissions to {action} this item",
+            )
+    return errors
+
+
+@router.post(":batch", response_model=ItemBatchResponse)
+async def create_items_batch_endpoint(
+    request: Request,
+    batch: ItemBatchCreateRequest,
+    current_user: Principal = Depends(get_current_active_user),
+):
+    """Создать пакет items. Результат каждой операции — в results."""
+    getattr(request.state, "correlation_id", None)
+    check_batch_size(len(batch.items))
+
+    results: List[Optional[ItemBatchResult]] = [None] * len(batch.items)
+    valid = []
+    for index, entry in enumerate(batch.items):
+        error = validate_item_fields(entry.name, entry.description or None)
+        if error:
+            results[index] = ItemBatchResult(
+                status=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=error
+            )
+        else:
+            valid.append(index)
+
+    created = await acreate_items(
+        [(batch.items[i].name, current_user.id, batch.items[i].description) for i in valid]
+    )
+    for index, item in zip(valid, created):
+        results[index] = ItemBatchResult(
+            status=status.HTTP_201_CREATED, id=item.id, item=ItemResponse(**item.to_dict())
+        )
+
+    return ItemBatchResponse(results=results)
+
+
+@router.patch(":batch", response_model=ItemBatchResponse)
+async def update_items_batch_endpoint(
+    request: Request,
+    batch: ItemBatchUpdateRequest,
+    current_user: Principal = Depends(get_current_active_user),
+):
+    """Обновить пакет items. Результат каждой операции — в results."""
+    getattr(request.state, "correlation_id", None)
+    check_batch_size(len(batch.items))
+
+    results = await authorize_batch([entry.id for entry in batch.items], current_user, "update")
+    allowed = []
+    for index, entry in enumerate(batch.items):
+        if results[index] is not None:
+            continue
+        error = validate_item_fields(entry.name, entry.description)
+        if error:
+            results[index] = ItemBatchResult(
+                status=status.HTTP_422_UNPROCESSABLE_ENTITY, id=entry.id, detail=error
+            )
+        else:
+            allowed.append(index)
+
+    updated = await aupdate_items(
+        [(batch.items[i].id, batch.items[i].name, batch.items[i].description) for i in allowed]
+    )
+    for index, item in zip(allowed, updated):
+        if item is None:
+            # Удалён между проверкой и обновлением
+            results[index] = ItemBatchResult(
+                status=status.HTTP_404_NOT_FOUND, id=batch.items[index].id, detail="Item not found"
+            )
+        else:
+            results[index] = ItemBatchResult(
+                status=status.HTTP_200_OK, id=item.id, item=ItemResponse(**item.to_dict())
+            )
+
+    return ItemBatchResponse(results=results)
+
+
+@router.delete(":batch", response_model=ItemBatchResponse)
+async def delete_items_batch_endpoint(
+    request: Request,
+    batch: ItemBatchDeleteRequest,
+    current_user: Principal = Depends(get_current_active_user),
+):
+    """Удалить пакет items. Результат каждой операции — в results."""
+    getattr(request.state, "correlation_id", None)
+    check_batch_size(len(batch.ids))
+
+    results = await authorize_batch(batch.ids, current_user, "delete")
+    allowed = [index for index, result in enumerate(results) if result is None]
+
+    deleted = await adelete_items([batch.ids[i] for i in allowed])
+    for index, was_deleted in zip(allowed, deleted):
+        if was_deleted:
+            results[index] = ItemBatchResult(status=status.HTTP_204_NO_CONTENT, id=batch.ids[index])
+        else:
+            # Повтор id в пакете или удалён параллельно
+            results[index] = ItemBatchResult(
+                status=status.HTTP_404_NOT_FOUND, id=batch.ids[index], detail="Item not found"
+            )
+
+    return ItemBatchResponse(results=results)
@@ -0,0 +1,118 @@
+"""Кэш сериализованных ответов GET /api/v1/items/{id}.
+
+LRU с ограничением числа записей и временем жизни (TTL). Хранятся
+готовые байты JSON-ответа, ETag и owner_id (для проверки доступа без
+обращения к хранилищу).
+
+Запись в хранилище инвалидирует ровно один item: на его месте остаётся
+метка (tombstone) с новой версией. Метка не даёт читателю, начавшему
+чтение до записи, положить в кэш устаревшее тело: тело с версией ниже
+метки не принимается. Удаление ставит метку, которую не пройдёт ни одна
+версия (id не переиспользуются).
+"""
+
+import sys
+import threading
+import time
+from collections import OrderedDict
+from typing import NamedTuple, Optional, Tuple
+
+# Число записей и время жизни по умолчанию
+DEFAULT_MAX_ENTRIES = 10_000
+DEFAULT_TTL = 30.0
+
+_DELETED = sys.maxsize
+
+
+class CachedItem(NamedTuple):
+    """Закэшированный ответ item."""
+
+    owner_id: int
+    version: int
+    etag: str
+    body: bytes
+
+
+# Запись кэша: (момент истечения, ответ или None для метки, минимальная версия)
+_Entry = Tuple[float, Optional[CachedItem], int]
+
+
+class ItemResponseCache:
+    """Потокобезопасный LRU+TTL кэш ответов item со счётчиками.
+
+    max_entries = 0 отключает кэш.
+    """
+
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES, ttl: float = DEFAULT_TTL):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries: "OrderedDict[int, _Entry]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def get(self, item_id: int) -> Optional[CachedItem]:
+        """Ответ item из кэша или None (промах)."""
+        if not self.max_entries:
+            return None
+        with self._lock:
+            entry = self._entries.get(item_id)
+            if entry is None or entry[1] is None:
+                self.misses += 1
+                return None
+            if entry[0] <= time.monotonic():
+                del self._entries[item_id]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(item_id)
+            self.hits += 1
+            return entry[1]
+
+    def put(self, item_id: int, cached: CachedItem) -> None:
+        """Положить ответ в кэш, если он не старее последней записи item."""
+        if not self.max_entries:
+            return
+        with self._lock:
+            entry = self._entries.get(item_id)
+            if entry is not None:
+                current = entry[1].version if entry[1] is not None else entry[2]
+                if cached.version < current:
+                    return
+            self._store(item_id, (time.monotonic() + self.ttl, cached, cached.version))
+
+    def invalidate(self, item_id: int, version: Optional[int] = None) -> None:
+        """Инвалидировать item после записи (version — новая версия, None — удаление)."""
+        if not self.max_entries:
+            return
+        with self._lock:
+            floor = _DELETED if version is None else version
+            self._store(item_id, (time.monotonic() + self.ttl, None, floor))
+            self.invalidations += 1
+
+    def _store(self, item_id: int, entry: _Entry) -> None:
+        """Записать и вытеснить самые давние записи сверх лимита (под _lock)."""
+        self._entries[item_id] = entry
+        self._entries.move_to_end(item_id)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def clear(self) -> None:
+        """Очистить кэш (счётчики сохраняются)."""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        """Счётчики кэша."""
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "ttl": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+            }
@@ -0,0 +1,172 @@
+"""Лента изменений items (create/update/delete) для Server-Sent Events.
+
+События получают последовательные номера (seq) и хранятся в кольцевом
+буфере фиксированного размера: клиент, переподключившийся с
+Last-Event-ID, получает пропущенные события, если они ещё в буфере,
+иначе — событие reset (состояние нужно перечитать целиком). Потеря
+считается по владельцу: для каждого владельца хранятся seq его событий в
+буфере и наибольший вытесненный seq, так что подписчика владельца не
+сбрасывают события чужих владельцев, и чтение стоит O(его новых событий).
+
+Кадр SSE кодируется один раз при публикации и отдаётся всем подписчикам
+как есть. Подписчики не держат задач и очередей: ожидающие события
+одного владельца в одном event loop ждут общий future, который
+публикация завершает одним вызовом; подписчики других владельцев не
+просыпаются.
+"""
+
+import asyncio
+import json
+import threading
+from collections import deque
+from typing import AsyncIterator, Deque, Dict, List, Optional, Tuple
+
+# Размер кольцевого буфера событий по умолчанию
+DEFAULT_CAPACITY = 10_000
+# Интервал комментария keep-alive в потоке SSE, секунды
+HEARTBEAT_INTERVAL = 15.0
+
+KEEP_ALIVE_FRAME = ": keep-alive\n\n"
+
+# Событие в буфере: (seq, owner_id, кадр SSE)
+Change = Tuple[int, Optional[int], str]
+
+
+def reset_frame(seq: int) -> str:
+    """Кадр reset: события до seq потеряны, состояние нужно перечитать."""
+    return f"id: {seq}\nevent: reset\ndata: {{}}\n\n"
+
+
+class ChangeFeed:
+    """Кольцевой буфер событий с последовательными номерами.
+
+    publish() потокобезопасен и может вызываться как из event loop,
+    так и из рабочих потоков.
+    """
+
+    def __init__(self, capacity: int = DEFAULT_CAPACITY):
+        self.capacity = capacity
+        self._ring: List[Optional[Change]] = [None] * capacity
+        self._seq = 0
+        self._lock = threading.Lock()
+        # owner_id -> seq его событий в буфере по возрастанию
+        self._owner_seqs: Dict[Optional[int], Deque[int]] = {}
+        # owner_id -> наибольший seq его события, вытесненного из буфера
+        self._evicted: Dict[Optional[int], int] = {}
+        # owner_id (None — подписчики-admin) -> {event loop: общий future}
+        self._waiters: Dict[Optional[int], Dict[asyncio.AbstractEventLoop, asyncio.Future]] = {}
+
+    @property
+    def last_seq(self) -> int:
+        """Номер последнего опубликованного события (0 — событий не было)."""
+        return self._seq
+
+    def publish(self, op: str, owner_id: Optional[int], data: dict) -> int:
+        """Опубликовать событие op (create/update/delete). Возвращает его seq."""
+        payload = json.dumps(data, ensure_ascii=False, separators=(",", ":"))
+        with self._lock:
+            self._seq += 1
+            seq = self._seq
+            frame = f"id: {seq}\nevent: {op}\ndata: {payload}\n\n"
+            slot = seq % self.capacity
+            old = self._ring[slot]
+            if old is not None:
+                old_seq, old_owner, _ = old
+                self._evicted[old_owner] = old_seq
+                old_seqs = self._owner_seqs[old_owner]
+                old_seqs.popleft()
+                if not old_seqs:
+                    del self._owner_seqs[old_owner]
+            self._ring[slot] = (seq, owner_id, frame)
+            self._owner_seqs.setdefault(owner_id, deque()).append(seq)
+            woken = list(self._waiters.pop(owner_id, {}).values())
+            if owner_id is not None:
+                woken.extend(self._waiters.pop(None, {}).values())
+        for future in woken:
+            loop = future.get_loop()
+            # Ожидание могло остаться от уже завершённого event loop
+            if not loop.is_closed():
+                loop.call_soon_threadsafe(_resolve, future)
+        return seq
+
+    def read(self, owner_id: Optional[int], after_seq: int) -> Tuple[List[str], int, bool]:
+        """Прочитать кадры событий после after_seq.
+
+        Args:
+            owner_id: владелец (None — события всех владельцев)
+            after_seq: последний полученный клиентом seq
+
+        Returns:
+            (кадры, seq последнего события, потеряны ли события). При потере
+            (вытеснено событие после after_seq, видимое этому подписчику,
+            или after_seq из другого запуска процесса) кадры не
+            возвращаются: клиент перечитывает состояние целиком.
+        """
+        with self._lock:
+            last = self._seq
+            if after_seq > last:
+                return [], last, True
+            ring, capacity = self._ring, self.capacity
+            if owner_id is None:
+                first = max(last - capacity + 1, 1)
+                if after_seq + 1 < first:
+                    return [], last, True
+                seqs = range(after_seq + 1, last + 1)
+            else:
+                if self._evicted.get(owner_id, 0) > after_seq:
+                    return [], last, True
+                seqs = []
+                # Новые события владельца — в конце его очереди
+                for seq in reversed(self._owner_seqs.get(owner_id, ())):
+                    if seq <= after_seq:
+                        break
+                    seqs.append(seq)
+                seqs.reverse()
+            return [ring[seq % capacity][2] for seq in seqs], last, False
+
+    def _waiter(self, owner_id: Optional[int], seen_seq: int) -> Optional[asyncio.Future]:
+        """Future, завершаемый следующим событием владельца.
+
+        None, если после seen_seq уже были события (нужно читать снова).
+        """
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            if self._seq != seen_seq:
+                return None
+            waiters = self._waiters.setdefault(owner_id, {})
+            future = waiters.get(loop)
+            if future is None:
+                future = waiters[loop] = loop.create_future()
+            return future
+
+    async def stream(
+        self,
+        owner_id: Optional[int],
+        after_seq: Optional[int] = None,
+        heartbeat: float = HEARTBEAT_INTERVAL,
+    ) -> AsyncIterator[str]:
+        """Бесконечный поток кадров SSE для владельца (None — для всех).
+
+        Если after_seq не задан, поток начинается с новых событий.
+        """
+        seen = self._seq if after_seq is None else after_seq
+        while True:
+            frames, last, lost = self.read(owner_id, seen)
+            if lost:
+                yield reset_frame(last)
+            for frame in frames:
+                yield frame
+            seen = last
+            future = self._waiter(owner_id, seen)
+            if future is None:
+                continue
+            try:
+                # shield: future общий для подписчиков и не должен отменяться таймаутом
+                await asyncio.wait_for(asyncio.shield(future), heartbeat)
+            except asyncio.TimeoutError:
+                yield KEEP_ALIVE_FRAME
+
+
+def _resolve(future: asyncio.Future) -> None:
+    if not future.done():
+        future.set_result(None)
@@ -1,97 +1,481 @@
-"""Простое in-memory хранилище данных (для MVP)."""
+"""Хранилище данных приложения.
 
-from typing import Dict, List, Optional
+Функции модуля делегируют текущему движку хранилища (app.storage),
+поэтому эндпойнты не зависят от того, где лежат данные. Движок
+выбирается переменной окружения STORAGE_ENGINE:
+- memory (по умолчанию) — in-memory словари с индексами;
+- sqlite — файл SQLite по пути SQLITE_PATH;
+- journal — in-memory словари с WAL и снапшотами в каталоге JOURNAL_DIR;
+- shared — общая для всех воркеров uvicorn разделяемая память
+  (SHARED_STORE_PATH, по умолчанию /dev/shm).
 
+Для async-эндпойнтов есть awaitable-версии функций (префикс a):
+блокирующие движки выполняются в ограниченном пуле потоков
+(STORAGE_EXECUTOR_WORKERS), чтобы не останавливать event loop.
+
+Изменения items (create/update/delete) поддерживают поисковый индекс
+процесса (app.search), перестраиваемый при смене движка, и публикуются
+в ленту изменений (app.changes). Движки sqlite и shared ищут сами
+(FTS5 в той же базе видит записи всех воркеров), а ленту изменений не
+ведут: воркер не узнаёт о чужих изменениях, и подписчик пропускал бы их.
+
+Они же точечно инвалидируют кэш ответов item (app.cache). С движками,
+данные которых могут менять другие процессы (sqlite, shared), кэш по
+умолчанию выключен: записи других воркеров он бы не увидел.
+"""
+
+import asyncio
+import functools
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import AsyncIterator, Iterator, List, Optional, Sequence, Tuple
+
+from app.cache import DEFAULT_MAX_ENTRIES, DEFAULT_TTL, ItemResponseCache
+from app.changes import DEFAULT_CAPACITY, ChangeFeed
 from app.models import Item, User
+from app.search import SearchIndex
+from app.storage.base import StorageEngine
+from app.storage.journal import (
+    DEFAULT_FSYNC_BATCH,
+    DEFAULT_FSYNC_INTERVAL,
+    DEFAULT_SNAPSHOT_EVERY,
+    JournaledMemoryStorage,
+)
+from app.storage.memory import MemoryStorage
+from app.storage.shared import SharedMemoryStorage
+from app.storage.sqlite import SQLiteStorage
+
+DEFAULT_SQLITE_PATH = "data/app.db"
+DEFAULT_JOURNAL_DIR = "data/journal"
+# По умолчанию равно размеру пула соединений SQLite: потоки не ждут соединение
+DEFAULT_EXECUTOR_WORKERS = 4
+# Размер страницы при обходе всех items движка (перестроение индекса)
+SCAN_PAGE_SIZE = 1000
+
+
+def create_engine(name: Optional[str] = None) -> StorageEngine:
+    """Создать движок хранилища по имени (по умолчанию из STORAGE_ENGINE)."""
+    name = name or os.getenv("STORAGE_ENGINE", "memory")
+    if name == "memory":
+        return MemoryStorage()
+    if name == "sqlite":
+        return SQLiteStorage(os.getenv("SQLITE_PATH", DEFAULT_SQLITE_PATH))
+    if name == "shared":
+        return SharedMemoryStorage(os.getenv("SHARED_STORE_PATH", ""))
+    if name == "journal":
+        return JournaledMemoryStorage(
+            os.getenv("JOURNAL_DIR", DEFAULT_JOURNAL_DIR),
+            fsync_batch=int(os.getenv("JOURNAL_FSYNC_BATCH", DEFAULT_FSYNC_BATCH)),
+            fsync_interval=float(os.getenv("JOURNAL_FSYNC_INTERVAL", DEFAULT_FSYNC_INTERVAL)),
+            snapshot_every=int(os.getenv("JOURNAL_SNAPSHOT_EVERY", DEFAULT_SNAPSHOT_EVERY)),
+        )
+    raise ValueError(f"Unknown storage engine: {name}")
+
+
+_engine: StorageEngine = create_engine()
+_executor = ThreadPoolExecutor(
+    max_workers=int(os.getenv("STORAGE_EXECUTOR_WORKERS", DEFAULT_EXECUTOR_WORKERS)),
+    thread_name_prefix="storage",
+)
+
+
+def _scan_items(engine: StorageEngine) -> Iterator[Item]:
+    """Обойти все items движка страницами по курсору."""
+    after_id = 0
+    while True:
+        page = engine.get_items(limit=SCAN_PAGE_SIZE, after_id=after_id)
+        yield from page
+        if len(page) < SCAN_PAGE_SIZE:
+            return
+        after_id = page[-1].id
+
+
+def _indexed_items(engine: StorageEngine) -> Iterator[Item]:
+    """Items для индекса процесса (движок с собственным поиском его не использует)."""
+    return iter(()) if engine.full_text_search else _scan_items(engine)
+
+
+_search_index = SearchIndex()
+_search_index.rebuild(_indexed_items(_engine))
+change_feed = ChangeFeed(int(os.getenv("CHANGE_FEED_CAPACITY", DEFAULT_CAPACITY)))
+
+
+def _item_cache_size(engine: StorageEngine) -> int:
+    """Размер кэша ответов item: ITEM_CACHE_SIZE или 0 для многопроцессных движков."""
+    size = os.getenv("ITEM_CACHE_SIZE")
+    if size is not None:
+        return int(size)
+    return 0 if engine.multi_process else DEFAULT_MAX_ENTRIES
+
+
+item_cache = ItemResponseCache(
+    _item_cache_size(_engine), float(os.getenv("ITEM_CACHE_TTL", DEFAULT_TTL))
+)
+
+
+def _item_saved(op: str, item: Item) -> None:
+    """Учесть созданный или изменённый item в кэше, индексе и ленте изменений."""
+    if op == "update":
+        item_cache.invalidate(item.id, item.version)
+    if not _engine.full_text_search:
+        _search_index.add(item)
+    if not _engine.multi_process:
+        change_feed.publish(op, item.owner_id, item.to_dict())
+
+
+def _item_deleted(item_id: int) -> None:
+    """Учесть удалённый item в кэше, индексе и ленте изменений."""
+    item_cache.invalidate(item_id)
+    owner_id = None if _engine.full_text_search else _search_index.remove(item_id)
+    if not _engine.multi_process:
+        change_feed.publish("delete", owner_id, {"id": item_id, "owner_id": owner_id})
+
+
+def _items_saved(op: str, items: Sequence[Optional[Item]]) -> None:
+    """Учесть результат пакетного создания или обновления."""
+    for item in items:
+        if item is not None:
+            _item_saved(op, item)
+
+
+def _items_deleted(item_ids: Sequence[int], deleted: Sequence[bool]) -> None:
+    """Учесть результат пакетного удаления."""
+    for item_id, was_deleted in zip(item_ids, deleted):
+        if was_deleted:
+            _item_deleted(item_id)
+
 
-# In-memory база данных
-_users_db: Dict[int, User] = {}
-_items_db: Dict[int, Item] = {}
-_user_id_counter = 1
-_item_id_counter = 1
+def get_engine() -> StorageEngine:
+    """Получить текущий движок хранилища."""
+    return _engine
+
+
+def set_engine(engine: StorageEngine) -> StorageEngine:
+    """Заменить движок хранилища. Возвращает предыдущий движок."""
+    global _engine
+    previous, _engine = _engine, engine
+    item_cache.clear()
+    item_cache.max_entries = _item_cache_size(engine)
+    _search_index.rebuild(_indexed_items(engine))
+    return previous
+
+
+def change_feed_available() -> bool:
+    """Ведётся ли лента изменений (движок не меняют другие процессы)."""
+    return not _engine.multi_process
 
 
 def get_user_by_id(user_id: int) -> Optional[User]:
     """Получить пользователя по ID."""
-    return _users_db.get(user_id)
+    return _engine.get_user_by_id(user_id)
 
 
 def get_user_by_username(username: str) -> Optional[User]:
     """Получить пользователя по username."""
-    for user in _users_db.values():
-        if user.username == username:
-            return user
-    return None
+    return _engine.get_user_by_username(username)
 
 
 def get_user_by_email(email: str) -> Optional[User]:
-    """Получить пользователя по email."""
-    for user in _users_db.values():
-        if user.email == email:
-            return user
-    return None
+    """Получить пользователя по email (без учёта регистра)."""
+    return _engine.get_user_by_email(email)
 
 
 def create_user(username: str, email: str, hashed_password: str, role: str = "user") -> User:
-    """Создать нового пользователя."""
-    global _user_id_counter
-    user_id = _user_id_counter
-    _user_id_counter += 1
-    user = User(
-        id=user_id,
-        username=username,
-        email=email,
-        hashed_password=hashed_password,
-        role=role,
-    )
-    _users_db[user_id] = user
-    return user
+    """Создать нового пользователя.
+
+    Raises:
+        ValueError: если username или email уже заняты
+    """
+    return _engine.create_user(username, email, hashed_password, role)
 
 
 def get_item_by_id(item_id: int) -> Optional[Item]:
     """Получить элемент по ID."""
-    return _items_db.get(item_id)
-
+    return _engine.get_item_by_id(item_id)
 
-def get_items(owner_id: Optional[int] = None, limit: int = 10, offset: int = 0) -> List[Item]:
-    """Получить список элементов с пагинацией."""
-    items = list(_items_db.values())
 
-    # Фильтр по владельцу
-    if owner_id is not None:
-        items = [item for item in items if item.owner_id == owner_id]
+def get_items(
+    owner_id: Optional[int] = None,
+    limit: int = 10,
+    offset: int = 0,
+    after_id: Optional[int] = None,
+) -> List[Item]:
+    """Получить список элементов с пагинацией.
 
-    # Пагинация
-    return items[offset : offset + limit]
+    Если указан after_id (keyset-пагинация), страница начинается
+    с первого id > after_id, offset отсчитывается от этой позиции.
+    """
+    return _engine.get_items(owner_id=owner_id, limit=limit, offset=offset, after_id=after_id)
 
 
 def create_item(name: str, owner_id: int, description: Optional[str] = None) -> Item:
     """Создать новый элемент."""
-    global _item_id_counter
-    item_id = _item_id_counter
-    _item_id_counter += 1
-    item = Item(id=item_id, name=name, owner_id=owner_id, description=description)
-    _items_db[item_id] = item
+    item = _engine.create_item(name, owner_id, description)
+    _item_saved("create", item)
     return item
 
 
 def update_item(
-    item_id: int, name: Optional[str] = None, description: Optional[str] = None
+    item_id: int,
+    name: Optional[str] = None,
+    description: Optional[str] = None,
+    expected_version: Optional[int] = None,
 ) -> Optional[Item]:
-    """Обновить элемент."""
-    item = _items_db.get(item_id)
-    if not item:
-        return None
-    if name is not None:
-        item.name = name
-    if description is not None:
-        item.description = description
+    """Обновить элемент.
+
+    Если задан expected_version — только при совпадении версии item.
+
+    Raises:
+        VersionConflictError: если версия item не равна expected_version
+    """
+    item = _engine.update_item(item_id, name, description, expected_version)
+    if item is not None:
+        _item_saved("update", item)
     return item
 
 
-def delete_item(item_id: int) -> bool:
-    """Удалить элемент."""
-    if item_id in _items_db:
-        del _items_db[item_id]
-        return True
-    return False
+def delete_item(item_id: int, expected_version: Optional[int] = None) -> bool:
+    """Удалить элемент.
+
+    Raises:
+        VersionConflictError: если версия item не равна expected_version
+    """
+    deleted = _engine.delete_item(item_id, expected_version)
+    if deleted:
+        _item_deleted(item_id)
+    return deleted
+
+
+def get_items_generation(owner_id: Optional[int] = None) -> int:
+    """Поколение набора items владельца (None — всех items).
+
+    Меняется при каждом создании, изменении и удалении item набора.
+    """
+    return _engine.get_items_generation(owner_id)
+
+
+def count_items(owner_id: Optional[int] = None) -> int:
+    """Число items владельца (None — всех items), без обхода."""
+    return _engine.count_items(owner_id)
+
+
+def count_item_owners() -> int:
+    """Число владельцев, у которых есть items."""
+    return _engine.count_item_owners()
+
+
+def get_items_by_ids(item_ids: Sequence[int]) -> List[Optional[Item]]:
+    """Получить items по списку ID (None для отсутствующих)."""
+    return _engine.get_items_by_ids(item_ids)
+
+
+def create_items(entries: Sequence[Tuple[str, int, Optional[str]]]) -> List[Item]:
+    """Создать пакет items из кортежей (name, owner_id, description)."""
+    items = _engine.create_items(entries)
+    _items_saved("create", items)
+    return items
+
+
+def update_items(
+    updates: Sequence[Tuple[int, Optional[str], Optional[str]]],
+) -> List[Optional[Item]]:
+    """Обновить пакет items из кортежей (item_id, name, description)."""
+    items = _engine.update_items(updates)
+    _items_saved("update", items)
+    return items
+
+
+def delete_items(item_ids: Sequence[int]) -> List[bool]:
+    """Удалить пакет items по списку ID."""
+    deleted = _engine.delete_items(item_ids)
+    _items_deleted(item_ids, deleted)
+    return deleted
+
+
+def search_items(query: str, owner_id: Optional[int] = None, limit: int = 10) -> List[Item]:
+    """Найти items по словам из name/description (последнее слово — префикс).
+
+    Если указан owner_id, ищутся только items этого владельца.
+    """
+    if _engine.full_text_search:
+        return _engine.search_items(query, owner_id, limit)
+    found = _engine.get_items_by_ids(_search_index.search(query, owner_id, limit))
+    return [item for item in found if item is not None]
+
+
+# ========== Async API ==========
+
+
+async def _run(method: str, *args, **kwargs):
+    """Вызвать метод движка, не блокируя event loop.
+
+    Неблокирующие (in-memory) движки вызываются напрямую: переключение
+    в поток стоило бы дороже самой операции.
+    """
+    engine = _engine
+    fn = getattr(engine, method)
+    if not engine.blocking:
+        return fn(*args, **kwargs)
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_executor, functools.partial(fn, *args, **kwargs))
+
+
+async def aget_user_by_id(user_id: int) -> Optional[User]:
+    """Получить пользователя по ID (async)."""
+    return await _run("get_user_by_id", user_id)
+
+
+async def aget_user_by_username(username: str) -> Optional[User]:
+    """Получить пользователя по username (async)."""
+    return await _run("get_user_by_username", username)
+
+
+async def aget_user_by_email(email: str) -> Optional[User]:
+    """Получить пользователя по email (async)."""
+    return await _run("get_user_by_email", email)
+
+
+async def acreate_user(username: str, email: str, hashed_password: str, role: str = "user") -> User:
+    """Создать нового пользователя (async)."""
+    return await _run("create_user", username, email, hashed_password, role)
+
+
+async def aget_item_by_id(item_id: int) -> Optional[Item]:
+    """Получить элемент по ID (async)."""
+    return await _run("get_item_by_id", item_id)
+
+
+async def aget_items(
+    owner_id: Optional[int] = None,
+    limit: int = 10,
+    offset: int = 0,
+    after_id: Optional[int] = None,
+) -> List[Item]:
+    """Получить список элементов с пагинацией (async)."""
+    return await _run("get_items", owner_id=owner_id, limit=limit, offset=offset, after_id=after_id)
+
+
+async def aiter_item_pages(page_size: int = SCAN_PAGE_SIZE) -> AsyncIterator[List[Item]]:
+    """Обойти все items страницами по курсору (async).
+
+    В памяти одна страница; items, созданные во время обхода после
+    курсора, тоже попадут в обход.
+    """
+    after_id = 0
+    while True:
+        page = await aget_items(limit=page_size, after_id=after_id)
+        if page:
+            yield page
+        if len(page) < page_size:
+            return
+        after_id = page[-1].id
+
+
+async def acreate_item(name: str, owner_id: int, description: Optional[str] = None) -> Item:
+    """Создать новый элемент (async)."""
+    item = await _run("create_item", name, owner_id, description)
+    _item_saved("create", item)
+    return item
+
+
+async def aupdate_item(
+    item_id: int,
+    name: Optional[str] = None,
+    description: Optional[str] = None,
+    expected_version: Optional[int] = None,
+) -> Optional[Item]:
+    """Обновить элемент (async)."""
+    item = await _run("update_item", item_id, name, description, expected_version)
+    if item is not None:
+        _item_saved("update", item)
+    return item
+
+
+async def adelete_item(item_id: int, expected_version: Optional[int] = None) -> bool:
+    """Удалить элемент (async)."""
+    deleted = await _run("delete_item", item_id, expected_version)
+    if deleted:
+        _item_deleted(item_id)
+    return deleted
+
+
+async def aget_items_generation(owner_id: Optional[int] = None) -> int:
+    """Поколение набора items владельца (async)."""
+    return await _run("get_items_generation", owner_id)
+
+
+async def acount_items(owner_id: Optional[int] = None) -> int:
+    """Число items владельца (async)."""
+    return await _run("count_items", owner_id)
+
+
+async def acount_item_owners() -> int:
+    """Число владельцев, у которых есть items (async)."""
+    return await _run("count_item_owners")
+
+
+async def aget_items_by_ids(item_ids: Sequence[int]) -> List[Optional[Item]]:
+    """Получить items по списку ID (async)."""
+    return await _run("get_items_by_ids", item_ids)
+
+
+async def acreate_items(entries: Sequence[Tuple[str, int, Optional[str]]]) -> List[Item]:
+    """Создать пакет items (async)."""
+    items = await _run("create_items", entries)
+    _items_saved("create", items)
+    return items
+
+
+async def aupdate_items(
+    updates: Sequence[Tuple[int, Optional[str], Optional[str]]],
+) -> List[Optional[Item]]:
+    """Обновить пакет items (async)."""
+    items = await _run("update_items", updates)
+    _items_saved("update", items)
+    return items
+
+
+async def adelete_items(item_ids: Sequence[int]) -> List[bool]:
+    """Удалить пакет items (async)."""
+    deleted = await _run("delete_items", item_ids)
+    _items_deleted(item_ids, deleted)
+    return deleted
+
+
+async def arevoke_token(jti: str, expires_at: float) -> None:
+    """Записать отзыв токена в движок (async, только multi_process)."""
+    await _run("revoke_token", jti, expires_at)
+
+
+async def aget_revoked_tokens(after_seq: int = 0) -> List[Tuple[int, str, float]]:
+    """Отзывы токенов из движка после after_seq (async, только multi_process)."""
+    return await _run("get_revoked_tokens", after_seq)
+
+
+async def acreate_session(session_id: str, user_id: int, digest: bytes, expires_at: float) -> None:
+    """Открыть сессию refresh-токена в движке (async, только multi_process)."""
+    await _run("create_session", session_id, user_id, digest, expires_at)
+
+
+async def arotate_session(
+    session_id: str, digest: bytes, new_digest: bytes, expires_at: float
+) -> Optional[int]:
+    """Заменить секрет сессии в движке (async, только multi_process)."""
+    return await _run("rotate_session", session_id, digest, new_digest, expires_at)
+
+
+async def adelete_session(session_id: str, digest: bytes) -> bool:
+    """Закрыть сессию в движке (async, только multi_process)."""
+    return await _run("delete_session", session_id, digest)
+
+
+async def asearch_items(query: str, owner_id: Optional[int] = None, limit: int = 10) -> List[Item]:
+    """Найти items по словам из name/description (async).
+
+    Поиск по индексу выполняется в памяти процесса, из движка читаются
+    только найденные items; движок с собственным поиском ищет сам.
+    """
+    if _engine.full_text_search:
+        return await _run("search_items", query, owner_id, limit)
+    found = await _run("get_items_by_ids", _search_index.search(query, owner_id, limit))
+    return [item for item in found if item is not None]
@@ -1,28 +1,61 @@
-"""Зависимости FastAPI для аутентификации и авторизации."""
+"""Зависимости FastAPI для аутентификации и авторизации.
+
+В stateless-режиме (AUTH_STATELESS=1) get_current_user не читает
+пользователя из хранилища: субъект (id и роль) строится из проверенных
+claims токена. Смена роли тогда вступает в силу с новым токеном (не
+позже exp), отзыв токена действует сразу. Эндпойнты, которым нужна
+полная запись пользователя, берут её через get_current_user_record.
+"""
+
+import os
 
 from fastapi import Depends, HTTPException, Request, status
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 
-from app.database import get_user_by_id
-from app.models import User
-from app.security.auth import Role, decode_access_token
+from app.database import aget_revoked_tokens, aget_user_by_id, get_engine
+from app.models import Principal, User
+from app.security.auth import Role, decode_access_token_cached
+from app.security.revocation import revocation_store
 
 security = HTTPBearer()
 
+# Субъект из claims токена без чтения пользователя на каждом запросе
+STATELESS_AUTH = os.getenv("AUTH_STATELESS", "").lower() in ("1", "true", "yes")
+
+
+async def is_token_revoked(jti: str) -> bool:
+    """Отозван ли jti. С multi_process движком сначала дочитываются его отзывы."""
+    engine = get_engine()
+    if engine.multi_process:
+        since = revocation_store.synced_seq(engine.epoch)
+        revocation_store.merge(engine.epoch, await aget_revoked_tokens(since))
+    return revocation_store.is_revoked(jti)
+
 
 async def get_current_user(
     request: Request,
     credentials: HTTPAuthorizationCredentials = Depends(security),
-) -> User:
-    """Получить текущего пользователя из JWT токена."""
+) -> Principal:
+    """Получить текущего пользователя из JWT токена.
+
+    Возвращает запись User или, в stateless-режиме, Principal из claims.
+    """
     token = credentials.credentials
-    payload = decode_access_token(token)
+    payload = decode_access_token_cached(token)
     if payload is None:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid authentication credentials",
             headers={"WWW-Authenticate": "Bearer"},
         )
+    # Отзыв проверяется на каждом запросе, в том числе для токенов из кэша
+    jti = payload.get("jti")
+    if jti is not None and await is_token_revoked(jti):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Token has been revoked",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
     user_id_raw = payload.get("sub")
     if user_id_raw is None:
         raise HTTPException(
@@ -39,7 +72,10 @@ async def get_current_user(
             detail="Invalid authentication credentials",
             headers={"WWW-Authenticate": "Bearer"},
         )
-    user = get_user_by_id(user_id)
+    if STATELESS_AUTH:
+        role = payload.get("role")
+        return Principal(user_id, role if isinstance(role, str) else Role.USER)
+    user = await aget_user_by_id(user_id)
     if user is None:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -50,16 +86,32 @@ async def get_current_user(
 
 
 async def get_current_active_user(
-    current_user: User = Depends(get_current_user),
-) -> User:
+    current_user: Principal = Depends(get_current_user),
+) -> Principal:
     """Получить текущего активного пользователя."""
     # В MVP все пользователи активны, но можно добавить проверку is_active
     return current_user
 
 
-async def require_admin(
-    current_user: User = Depends(get_current_active_user),
+async def get_current_user_record(
+    current_user: Principal = Depends(get_current_active_user),
 ) -> User:
+    """Полная запись текущего пользователя (в stateless-режиме читается здесь)."""
+    if isinstance(current_user, User):
+        return current_user
+    user = await aget_user_by_id(current_user.id)
+    if user is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="User not found",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    return user
+
+
+async def require_admin(
+    current_user: Principal = Depends(get_current_active_user),
+) -> Principal:
     """Требовать роль admin."""
     if current_user.role != Role.ADMIN:
         raise HTTPException(
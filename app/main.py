@@ -1,9 +1,13 @@
 import logging
 import os
+import threading
+from contextlib import asynccontextmanager
 from pathlib import Path
 
 from fastapi import FastAPI, File, HTTPException, Request, UploadFile
 
+from app import database
+
 # Импорт роутеров API v1
 from app.api.v1 import auth, items
 from app.security.file_validation import (
@@ -26,7 +30,18 @@ logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 
-app = FastAPI(title="SecDev Course App", version="0.1.0")
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Жизненный цикл приложения: при остановке закрыть движок хранилища.
+
+    Журналируемый движок дописывает на диск буфер уже подтверждённых
+    записей (фоновый поток group commit — daemon и сам этого не сделает).
+    """
+    yield
+    database.get_engine().close()
+
+
+app = FastAPI(title="SecDev Course App", version="0.1.0", lifespan=lifespan)
 
 # Подключение роутеров API v1
 app.include_router(auth.router, prefix="/api/v1")
@@ -110,7 +125,7 @@ async def http_exception_handler(request: Request, exc: HTTPException):
 
     mask_detail = os.getenv("ENVIRONMENT", "development") == "production"
 
-    return create_problem_detail(
+    response = create_problem_detail(
         request=request,
         status=exc.status_code,
         title="HTTP Error",
@@ -118,6 +133,10 @@ async def http_exception_handler(request: Request, exc: HTTPException):
         correlation_id=correlation_id,
         mask_detail=mask_detail,
     )
+    # Заголовки исключения (WWW-Authenticate, Retry-After) сохраняются
+    if exc.headers:
+        response.headers.update(exc.headers)
+    return response
 
 
 @app.get("/health")
@@ -126,7 +145,11 @@ def health():
 
 
 # Example minimal entity (for tests/demo)
+# Список плотный: id = позиция + 1 (id выдаётся как длина списка + 1,
+# items не удаляются), поэтому поиск по id — индексация за O(1)
 _DB = {"items": []}
+# Синхронные эндпойнты выполняются в пуле потоков: выдача id и вставка атомарны
+_DB_LOCK = threading.Lock()
 
 
 def validate_item_name(name: str) -> str:
@@ -178,8 +201,9 @@ def create_item(name: str):
     # Используем функцию валидации для переиспользования
     validated_name = validate_item_name(name)
 
-    item = {"id": len(_DB["items"]) + 1, "name": validated_name}
-    _DB["items"].append(item)
+    with _DB_LOCK:
+        item = {"id": len(_DB["items"]) + 1, "name": validated_name}
+        _DB["items"].append(item)
     return item
 
 
@@ -195,9 +219,9 @@ def get_item(item_id: int):
             type_uri="https://api.example.com/problems/validation-error",
         )
 
-    for it in _DB["items"]:
-        if it["id"] == item_id:
-            return it
+    items = _DB["items"]
+    if item_id <= len(items):
+        return items[item_id - 1]
     raise ApiError(
         title="Not Found",
         detail="item not found",
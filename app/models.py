@@ -1,11 +1,33 @@
-"""Модели данных для приложения."""
+"""Модели данных для приложения.
 
+Модели объявлены со __slots__: у экземпляров нет собственного __dict__,
+что при миллионах записей в in-memory хранилище экономит сотни байт
+на объект. Повторяющиеся строки (роль) интернируются.
+"""
+
+import sys
 from typing import Optional
 
 
-class User:
+class Principal:
+    """Аутентифицированный субъект: id и роль.
+
+    Достаточен для проверок владения и роли. В stateless-режиме
+    аутентификации строится из claims токена без обращения к хранилищу.
+    """
+
+    __slots__ = ("id", "role")
+
+    def __init__(self, id: int, role: str = "user"):
+        self.id = id
+        self.role = sys.intern(role)
+
+
+class User(Principal):
     """Модель пользователя."""
 
+    __slots__ = ("username", "email", "hashed_password")
+
     def __init__(
         self,
         id: int,
@@ -18,7 +40,7 @@ class User:
         self.username = username
         self.email = email
         self.hashed_password = hashed_password
-        self.role = role
+        self.role = sys.intern(role)
 
     def to_dict(self) -> dict:
         """Преобразовать в словарь (без пароля)."""
@@ -33,17 +55,22 @@ class User:
 class Item:
     """Модель элемента."""
 
+    __slots__ = ("id", "name", "owner_id", "description", "version")
+
     def __init__(
         self,
         id: int,
         name: str,
         owner_id: int,
         description: Optional[str] = None,
+        version: int = 1,
     ):
         self.id = id
         self.name = name
         self.owner_id = owner_id
         self.description = description
+        # Номер версии: увеличивается при каждом изменении item
+        self.version = version
 
     def to_dict(self) -> dict:
         """Преобразовать в словарь."""
@@ -0,0 +1,190 @@
+"""Полнотекстовый поиск по name и description items.
+
+Инвертированный индекс: токен -> упорядоченный по id список item
+(posting list, IdIndex: удаление item не сдвигает весь список). Для
+поиска по префиксу (последнее слово запроса, пока пользователь его
+печатает) словарь токенов хранится отсортированным:
+все токены с префиксом — непрерывный диапазон, который находится
+бинарным поиском. Токен, оставшийся без items, из словаря сразу не
+удаляется (это сдвигало бы весь словарь): такие токены пропускаются при
+поиске и вычищаются одним проходом, когда их становится больше половины.
+
+Запрос выполняется от самого короткого списка кандидатов (posting list
+точного слова, items владельца или объединение posting lists префикса),
+остальные условия проверяются по токенам кандидата. Кандидаты идут по
+возрастанию id, поэтому обход останавливается, как только набран limit.
+"""
+
+import heapq
+import re
+import threading
+from bisect import bisect_left
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from app.models import Item
+from app.storage.id_index import IdIndex
+
+_TOKEN_RE = re.compile(r"\w+")
+
+
+def tokenize(text: Optional[str]) -> List[str]:
+    """Разбить текст на токены в нижнем регистре (в порядке появления)."""
+    if not text:
+        return []
+    return _TOKEN_RE.findall(text.casefold())
+
+
+class SearchIndex:
+    """Инкрементальный инвертированный индекс items.
+
+    Все операции потокобезопасны (одна блокировка: изменения индекса
+    коротки, а поиск ограничен limit).
+    """
+
+    def __init__(self):
+        self._postings: Dict[str, IdIndex] = {}
+        # Отсортированный словарь токенов — структура для поиска по префиксу
+        self._terms: List[str] = []
+        # Число токенов словаря, оставшихся без posting list
+        self._stale_terms = 0
+        # id -> (owner_id, токены item)
+        self._docs: Dict[int, Tuple[int, Tuple[str, ...]]] = {}
+        self._ids_by_owner: Dict[int, IdIndex] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._docs)
+
+    def rebuild(self, items: Iterable[Item]) -> None:
+        """Перестроить индекс с нуля."""
+        with self._lock:
+            self._postings.clear()
+            self._terms.clear()
+            self._stale_terms = 0
+            self._docs.clear()
+            self._ids_by_owner.clear()
+        for item in items:
+            self.add(item)
+
+    def add(self, item: Item) -> None:
+        """Проиндексировать новый или изменённый item."""
+        tokens = tuple(dict.fromkeys(tokenize(item.name) + tokenize(item.description)))
+        with self._lock:
+            previous = self._docs.get(item.id)
+            if previous is None:
+                owner_ids = self._ids_by_owner.get(item.owner_id)
+                if owner_ids is None:
+                    owner_ids = self._ids_by_owner[item.owner_id] = IdIndex()
+                owner_ids.add(item.id)
+                old_tokens: Tuple[str, ...] = ()
+            else:
+                old_tokens = previous[1]
+            for token in old_tokens:
+                if token not in tokens:
+                    self._unpost(token, item.id)
+            for token in tokens:
+                if token not in old_tokens:
+                    self._post(token, item.id)
+            self._docs[item.id] = (item.owner_id, tokens)
+
+    def remove(self, item_id: int) -> Optional[int]:
+        """Удалить item из индекса. Возвращает owner_id (None, если item не найден)."""
+        with self._lock:
+            doc = self._docs.pop(item_id, None)
+            if doc is None:
+                return None
+            owner_id, tokens = doc
+            for token in tokens:
+                self._unpost(token, item_id)
+            owner_ids = self._ids_by_owner[owner_id]
+            owner_ids.remove(item_id)
+            if not owner_ids:
+                del self._ids_by_owner[owner_id]
+            return owner_id
+
+    def _post(self, token: str, item_id: int) -> None:
+        ids = self._postings.get(token)
+        if ids is None:
+            ids = self._postings[token] = IdIndex()
+            terms = self._terms
+            pos = bisect_left(terms, token)
+            if pos < len(terms) and terms[pos] == token:
+                self._stale_terms -= 1
+            else:
+                terms.insert(pos, token)
+        ids.add(item_id)
+
+    def _unpost(self, token: str, item_id: int) -> None:
+        ids = self._postings[token]
+        ids.remove(item_id)
+        if not ids:
+            del self._postings[token]
+            self._stale_terms += 1
+            if self._stale_terms > len(self._terms) // 2:
+                self._terms = [term for term in self._terms if term in self._postings]
+                self._stale_terms = 0
+
+    def search(self, query: str, owner_id: Optional[int] = None, limit: int = 10) -> List[int]:
+        """Найти id items по запросу, по возрастанию id.
+
+        Все слова запроса, кроме последнего, должны встречаться в item
+        целиком, последнее — как префикс токена.
+
+        Args:
+            query: строка запроса
+            owner_id: если задан — искать только среди items владельца
+            limit: максимальное число результатов
+        """
+        terms = tokenize(query)
+        if not terms:
+            return []
+        *exact, prefix = terms
+        with self._lock:
+            sources = []
+            for term in exact:
+                ids = self._postings.get(term)
+                if ids is None:
+                    return []
+                sources.append(ids)
+            if owner_id is not None:
+                sources.append(self._ids_by_owner.get(owner_id, IdIndex()))
+
+            prefix_lists = [self._postings[term] for term in self._prefix_terms(prefix)]
+            prefix_size = sum(len(ids) for ids in prefix_lists)
+            smallest = min(sources, key=len, default=None)
+            if smallest is None or prefix_size < len(smallest):
+                candidates: Iterable[int] = _merge_unique(prefix_lists)
+            else:
+                candidates = smallest
+
+            found = []
+            for item_id in candidates:
+                doc_owner, tokens = self._docs[item_id]
+                if owner_id is not None and doc_owner != owner_id:
+                    continue
+                if any(term not in tokens for term in exact):
+                    continue
+                if not any(token.startswith(prefix) for token in tokens):
+                    continue
+                found.append(item_id)
+                if len(found) == limit:
+                    break
+            return found
+
+    def _prefix_terms(self, prefix: str) -> Iterator[str]:
+        """Токены словаря, начинающиеся с prefix (диапазон отсортированного списка)."""
+        terms, postings = self._terms, self._postings
+        pos = bisect_left(terms, prefix)
+        while pos < len(terms) and terms[pos].startswith(prefix):
+            if terms[pos] in postings:
+                yield terms[pos]
+            pos += 1
+
+
+def _merge_unique(lists: Sequence[Iterable[int]]) -> Iterator[int]:
+    """Слить отсортированные списки id без повторов (лениво)."""
+    last = None
+    for item_id in heapq.merge(*lists):
+        if item_id != last:
+            yield item_id
+            last = item_id
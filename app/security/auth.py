@@ -1,12 +1,21 @@
 """Аутентификация и авторизация пользователей."""
 
+import asyncio
+import hashlib
 import os
+import secrets
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
 from datetime import datetime, timedelta
-from typing import Optional
+from typing import Callable, Dict, Optional, Tuple, TypeVar
 
 from jose import JWTError, jwt
 from passlib.context import CryptContext
 
+from app.security.jwt_hs256 import HS256Codec, supports_key
+
 # Настройка хеширования паролей (Argon2id согласно NFR-005)
 pwd_context = CryptContext(schemes=["argon2"], deprecated="auto")
 
@@ -14,6 +23,19 @@ pwd_context = CryptContext(schemes=["argon2"], deprecated="auto")
 SECRET_KEY = os.getenv("JWT_SECRET_KEY", "your-secret-key-change-in-production")
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 60  # 1 час согласно NFR-006
+# Собственный кодек HS256 (app.security.jwt_hs256); python-jose — запасной путь,
+# если кодек выключен (JWT_FAST_CODEC=0) или ключ он не обрабатывает
+JWT_FAST_CODEC = os.getenv("JWT_FAST_CODEC", "1").lower() not in ("0", "false", "no")
+
+# Пул хеширования паролей: число потоков и сколько операций может ждать в очереди
+DEFAULT_PASSWORD_HASH_WORKERS = min(4, os.cpu_count() or 1)
+DEFAULT_PASSWORD_HASH_QUEUE = 32
+
+# Кэш проверенных токенов: число записей и наибольшее время жизни записи (с)
+DEFAULT_TOKEN_CACHE_SIZE = 10_000
+DEFAULT_TOKEN_CACHE_TTL = 300.0
+
+T = TypeVar("T")
 
 
 # Роли
@@ -32,28 +54,217 @@ def get_password_hash(password: str) -> str:
     return pwd_context.hash(password)
 
 
+class PasswordHasherBusy(Exception):
+    """Пул хеширования паролей занят: очередь заполнена."""
+
+
+class PasswordHashPool:
+    """Ограниченный пул потоков для хеширования и проверки паролей.
+
+    Argon2 намеренно тяжёл (десятки-сотни мс CPU и память на вызов) и в
+    event loop остановил бы все запросы. argon2-cffi отпускает GIL на время
+    хеширования, поэтому хватает потоков. Одновременно принимается не
+    больше workers + max_queue операций, сверх этого — PasswordHasherBusy:
+    очередь не растёт без предела, а клиенту отвечают 503 сразу.
+    """
+
+    def __init__(
+        self,
+        workers: int = DEFAULT_PASSWORD_HASH_WORKERS,
+        max_queue: int = DEFAULT_PASSWORD_HASH_QUEUE,
+    ):
+        self.limit = workers + max_queue
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="argon2")
+        self._pending = 0
+        self._lock = threading.Lock()
+
+    @property
+    def pending(self) -> int:
+        """Число операций в работе и в очереди."""
+        return self._pending
+
+    def _release(self, _: Future) -> None:
+        with self._lock:
+            self._pending -= 1
+
+    async def run(self, fn: Callable[..., T], *args) -> T:
+        """Выполнить fn в пуле, не блокируя event loop.
+
+        Место в очереди освобождается, когда операция завершится в потоке,
+        даже если ожидавший её запрос отменён.
+
+        Raises:
+            PasswordHasherBusy: если пул и очередь заполнены
+        """
+        with self._lock:
+            if self._pending >= self.limit:
+                raise PasswordHasherBusy("Password hashing queue is full")
+            self._pending += 1
+        future = self._executor.submit(fn, *args)
+        future.add_done_callback(self._release)
+        return await asyncio.wrap_future(future)
+
+
+password_hash_pool = PasswordHashPool(
+    int(os.getenv("PASSWORD_HASH_WORKERS", DEFAULT_PASSWORD_HASH_WORKERS)),
+    int(os.getenv("PASSWORD_HASH_QUEUE", DEFAULT_PASSWORD_HASH_QUEUE)),
+)
+
+
+async def averify_password(plain_password: str, hashed_password: str) -> bool:
+    """Проверить пароль в пуле хеширования (async).
+
+    Raises:
+        PasswordHasherBusy: если пул хеширования занят
+    """
+    return await password_hash_pool.run(verify_password, plain_password, hashed_password)
+
+
+async def aget_password_hash(password: str) -> str:
+    """Получить хеш пароля в пуле хеширования (async).
+
+    Raises:
+        PasswordHasherBusy: если пул хеширования занят
+    """
+    return await password_hash_pool.run(get_password_hash, password)
+
+
+_codec = HS256Codec(SECRET_KEY) if JWT_FAST_CODEC and supports_key(SECRET_KEY) else None
+
+
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
-    """Создать JWT токен."""
+    """Создать JWT токен.
+
+    Каждый токен получает уникальный jti — по нему токен отзывается
+    (app.security.revocation).
+    """
     to_encode = data.copy()
+    to_encode.setdefault("jti", secrets.token_urlsafe(16))
     if expires_delta:
         expire = datetime.utcnow() + expires_delta
     else:
         expire = datetime.utcnow() + timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
     to_encode.update({"exp": expire})
+    if _codec is not None:
+        return _codec.encode(to_encode)
     encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
     return encoded_jwt
 
 
 def decode_access_token(token: str) -> Optional[dict]:
     """Декодировать JWT токен."""
-    try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        # Преобразуем sub в int если это строка
-        if "sub" in payload and isinstance(payload["sub"], str):
-            try:
-                payload["sub"] = int(payload["sub"])
-            except (ValueError, TypeError):
-                pass
-        return payload
-    except JWTError:
+    if _codec is not None:
+        payload = _codec.decode(token)
+    else:
+        try:
+            payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+        except JWTError:
+            return None
+    if payload is None:
         return None
+    # Преобразуем sub в int если это строка
+    if "sub" in payload and isinstance(payload["sub"], str):
+        try:
+            payload["sub"] = int(payload["sub"])
+        except (ValueError, TypeError):
+            pass
+    return payload
+
+
+class VerifiedTokenCache:
+    """LRU кэш claims уже проверенных токенов.
+
+    Ключ — blake2b-дайджест токена (сами токены в памяти не хранятся).
+    Запись живёт не дольше ttl и не дольше exp токена, так что истёкший
+    токен не пройдёт по кэшу. discard удаляет запись (отзыв токена).
+    Невалидные токены не кэшируются. max_entries = 0 отключает кэш.
+    Возвращаемые claims общие для всех запросов с этим токеном — их
+    нельзя изменять.
+    """
+
+    def __init__(
+        self, max_entries: int = DEFAULT_TOKEN_CACHE_SIZE, ttl: float = DEFAULT_TOKEN_CACHE_TTL
+    ):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries: "OrderedDict[bytes, Tuple[float, Dict]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def _key(token: str) -> bytes:
+        return hashlib.blake2b(token.encode(), digest_size=16).digest()
+
+    def get(self, token: str) -> Optional[dict]:
+        """Claims токена из кэша или None (промах)."""
+        if not self.max_entries:
+            return None
+        key = self._key(token)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            if entry[0] <= time.time():
+                del self._entries[key]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def put(self, token: str, claims: dict) -> None:
+        """Запомнить claims проверенного токена."""
+        if not self.max_entries:
+            return
+        expires = time.time() + self.ttl
+        exp = claims.get("exp")
+        if isinstance(exp, (int, float)):
+            expires = min(expires, exp)
+        key = self._key(token)
+        with self._lock:
+            self._entries[key] = (expires, claims)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def discard(self, token: str) -> None:
+        """Удалить токен из кэша (при отзыве)."""
+        with self._lock:
+            self._entries.pop(self._key(token), None)
+
+    def clear(self) -> None:
+        """Очистить кэш (счётчики сохраняются)."""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        """Счётчики кэша."""
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "ttl": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
+
+
+token_cache = VerifiedTokenCache(
+    int(os.getenv("TOKEN_CACHE_SIZE", DEFAULT_TOKEN_CACHE_SIZE)),
+    float(os.getenv("TOKEN_CACHE_TTL", DEFAULT_TOKEN_CACHE_TTL)),
+)
+
+
+def decode_access_token_cached(token: str) -> Optional[dict]:
+    """Декодировать JWT токен, повторные проверки того же токена — из кэша."""
+    payload = token_cache.get(token)
+    if payload is None:
+        payload = decode_access_token(token)
+        if payload is not None:
+            token_cache.put(token, payload)
+    return payload
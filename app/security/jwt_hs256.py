@@ -0,0 +1,169 @@
+"""Кодек JWT только для HS256 с одним ключом.
+
+python-jose на каждый вызов заново строит ключ (jwk.construct), разбирает
+заголовок и проходит общий JWS-конвейер — на дешёвых эндпойнтах это
+заметная доля CPU. Здесь всё, что зависит только от ключа, считается один
+раз: состояния SHA-256 после блоков ipad/opad (HMAC = две копии и два
+update), закодированный заголовок. base64url — через binascii без
+промежуточных замен.
+
+Токены совместимы с python-jose байт в байт: тот же заголовок
+{"alg":"HS256","typ":"JWT"}, тот же json.dumps claims, exp/iat/nbf из
+datetime переводятся в unix time так же.
+
+Проверка строже jose: заголовок обязан иметь alg HS256 (alg "none",
+RS256 и любые другие отклоняются — защита от подмены алгоритма), typ —
+отсутствовать или быть JWT, crit не допускается; base64url без паддинга
+и лишних символов; подпись сравнивается за постоянное время. Claims
+проверяются как в jose.decode без audience: exp, nbf, iat, sub, jti, а
+токен с aud или at_hash отклоняется.
+"""
+
+import binascii
+import hashlib
+import hmac
+import json
+import time
+from calendar import timegm
+from datetime import datetime
+from typing import Optional
+
+ALGORITHM = "HS256"
+
+_BLOCK_SIZE = 64  # размер блока SHA-256
+_ENCODE = bytes.maketrans(b"+/", b"-_")
+_DECODE = bytes.maketrans(b"-_", b"+/")
+_PADDING = (b"", None, b"==", b"=")
+_TIME_CLAIMS = ("exp", "iat", "nbf")
+# Таблицы XOR ключа с ipad/opad HMAC
+_IPAD = bytes(b ^ 0x36 for b in range(256))
+_OPAD = bytes(b ^ 0x5C for b in range(256))
+
+# Как json.dumps(claims, separators=(",", ":")) в jose, без разбора аргументов на вызов
+_dumps = json.JSONEncoder(separators=(",", ":")).encode
+
+# Ключи, которые HMACKey python-jose не принимает как секрет HMAC
+_ASYMMETRIC_MARKERS = (
+    b"-----BEGIN PUBLIC KEY-----",
+    b"-----BEGIN RSA PUBLIC KEY-----",
+    b"-----BEGIN CERTIFICATE-----",
+    b"ssh-rsa",
+)
+
+
+def b64url_encode(data: bytes) -> bytes:
+    """base64url без паддинга."""
+    return binascii.b2a_base64(data, newline=False).translate(_ENCODE).rstrip(b"=")
+
+
+def b64url_decode(data: bytes) -> bytes:
+    """Строгий base64url без паддинга.
+
+    Raises:
+        binascii.Error: если есть паддинг, лишние символы или неверная длина
+    """
+    padding = _PADDING[len(data) % 4]
+    if padding is None:
+        raise binascii.Error("Invalid base64url length")
+    if b"=" in data or b"+" in data or b"/" in data:
+        raise binascii.Error("Invalid base64url character")
+    return binascii.a2b_base64(data.translate(_DECODE) + padding, strict_mode=True)
+
+
+def supports_key(key: str) -> bool:
+    """Обрабатывает ли кодек ключ так же, как python-jose.
+
+    jose пытается разобрать ключ как JSON (JWK или набор ключей) и
+    отклоняет ключи, похожие на асимметричные, — такие ключи остаются jose.
+    """
+    try:
+        json.loads(key)
+    except ValueError:
+        pass
+    else:
+        return False
+    raw = key.encode()
+    return not any(marker in raw for marker in _ASYMMETRIC_MARKERS)
+
+
+class HS256Codec:
+    """Подпись и проверка JWT HS256 с предвычисленным состоянием HMAC."""
+
+    def __init__(self, key: str):
+        secret = key.encode()
+        if len(secret) > _BLOCK_SIZE:
+            secret = hashlib.sha256(secret).digest()
+        secret = secret.ljust(_BLOCK_SIZE, b"\0")
+        self._inner = hashlib.sha256(secret.translate(_IPAD))
+        self._outer = hashlib.sha256(secret.translate(_OPAD))
+        header = json.dumps({"alg": ALGORITHM, "typ": "JWT"}, separators=(",", ":"))
+        self._header = b64url_encode(header.encode())
+
+    def _sign(self, signing_input: bytes) -> bytes:
+        inner = self._inner.copy()
+        inner.update(signing_input)
+        outer = self._outer.copy()
+        outer.update(inner.digest())
+        return b64url_encode(outer.digest())
+
+    def encode(self, claims: dict) -> str:
+        """Подписать claims (exp/iat/nbf из datetime изменяются на месте, как в jose)."""
+        for name in _TIME_CLAIMS:
+            value = claims.get(name)
+            if isinstance(value, datetime):
+                claims[name] = timegm(value.utctimetuple())
+        signing_input = self._header + b"." + b64url_encode(_dumps(claims).encode())
+        return (signing_input + b"." + self._sign(signing_input)).decode()
+
+    def decode(self, token: str) -> Optional[dict]:
+        """Claims проверенного токена или None, если токен невалиден."""
+        try:
+            raw = token.encode("ascii")
+        except (AttributeError, UnicodeEncodeError):
+            return None
+        if raw.count(b".") != 2:
+            return None
+        signing_input, _, signature = raw.rpartition(b".")
+        header, _, payload = signing_input.partition(b".")
+        try:
+            if header != self._header and not self._check_header(header):
+                return None
+            if not hmac.compare_digest(signature, self._sign(signing_input)):
+                return None
+            claims = json.loads(b64url_decode(payload).decode())
+        except ValueError:  # binascii.Error, UnicodeDecodeError, JSONDecodeError
+            return None
+        if not isinstance(claims, dict) or not _valid_claims(claims):
+            return None
+        return claims
+
+    @staticmethod
+    def _check_header(segment: bytes) -> bool:
+        """Заголовок в другой записи (порядок полей, пробелы): проверить поля."""
+        header = json.loads(b64url_decode(segment).decode())
+        return (
+            isinstance(header, dict)
+            and header.get("alg") == ALGORITHM
+            and header.get("typ", "JWT") == "JWT"
+            and "crit" not in header
+        )
+
+
+def _valid_claims(claims: dict) -> bool:
+    """Зарегистрированные claims, как в jose.decode без audience/access_token."""
+    if "aud" in claims or "at_hash" in claims:
+        return False
+    now = int(time.time())
+    try:
+        if "iat" in claims:
+            int(claims["iat"])
+        if "nbf" in claims and int(claims["nbf"]) > now:
+            return False
+        if "exp" in claims and int(claims["exp"]) < now:
+            return False
+    except (TypeError, ValueError, OverflowError):
+        return False
+    for name in ("sub", "jti"):
+        if name in claims and not isinstance(claims[name], str):
+            return False
+    return True
@@ -0,0 +1,146 @@
+"""Отзыв JWT токенов (logout) по claim jti.
+
+Проверка выполняется на каждом аутентифицированном запросе, поэтому
+частый случай «токен не отозван» должен быть дешёвым. Быстрый путь —
+фильтр Блума по jti: если хотя бы один из k битов не установлен, токен
+точно не отозван. Положительный ответ фильтра подтверждается точным
+словарём jti -> exp (ложные срабатывания фильтра не отклоняют токен).
+
+Отзыв нужен только до истечения токена: не чаще раза в PRUNE_INTERVAL
+(при отзыве или срабатывании фильтра) истёкшие jti удаляются из
+словаря, а фильтр перестраивается из оставшихся (из фильтра Блума нельзя
+удалять). При переполнении ёмкость удваивается.
+
+С движком, который делят несколько процессов (multi_process), logout
+записывает отзыв ещё и в движок, а перед проверкой процесс дочитывает
+из него отзывы, появившиеся после последнего виденного seq (merge).
+Фильтр Блума остаётся быстрым путём проверки в каждом процессе.
+"""
+
+import math
+import threading
+import time
+from typing import Dict, Iterable, Tuple
+
+# Ожидаемое число одновременно отозванных (неистёкших) токенов и доля
+# ложных срабатываний фильтра при этом числе
+DEFAULT_CAPACITY = 100_000
+DEFAULT_ERROR_RATE = 0.001
+# Период удаления истёкших jti, с
+PRUNE_INTERVAL = 60.0
+
+_MASK32 = 0xFFFFFFFF
+
+
+class BloomFilter:
+    """Фильтр Блума по строкам на bytearray.
+
+    Позиции битов — двойное хеширование встроенного hash строки (он
+    кэшируется в объекте str): h1 + i * h2. Фильтр живёт только в памяти
+    процесса, поэтому случайная соль hash не мешает.
+    """
+
+    def __init__(self, capacity: int, error_rate: float = DEFAULT_ERROR_RATE):
+        capacity = max(capacity, 1)
+        self.size = max(8, int(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self._bits = bytearray((self.size + 7) // 8)
+
+    def add(self, key: str) -> None:
+        h = hash(key)
+        h1, h2 = h & _MASK32, (h >> 32) & _MASK32 | 1
+        bits, size = self._bits, self.size
+        for i in range(self.hashes):
+            pos = (h1 + i * h2) % size
+            bits[pos >> 3] |= 1 << (pos & 7)
+
+    def __contains__(self, key: str) -> bool:
+        # Без генератора позиций: это горячий путь каждого запроса
+        h = hash(key)
+        h1, h2 = h & _MASK32, (h >> 32) & _MASK32 | 1
+        bits, size = self._bits, self.size
+        for i in range(self.hashes):
+            pos = (h1 + i * h2) % size
+            if not bits[pos >> 3] & (1 << (pos & 7)):
+                return False
+        return True
+
+
+class RevocationStore:
+    """Отозванные jti до истечения их токенов: фильтр Блума + точный словарь."""
+
+    def __init__(self, capacity: int = DEFAULT_CAPACITY, error_rate: float = DEFAULT_ERROR_RATE):
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self._revoked: Dict[str, float] = {}
+        self._filter = BloomFilter(capacity, error_rate)
+        self._lock = threading.Lock()
+        self._next_prune = time.time() + PRUNE_INTERVAL
+        # epoch движка -> seq последнего перенесённого из него отзыва
+        self._synced: Dict[str, int] = {}
+
+    def __len__(self) -> int:
+        return len(self._revoked)
+
+    def revoke(self, jti: str, expires_at: float) -> None:
+        """Отозвать jti до момента expires_at (exp токена, unix time)."""
+        if expires_at <= time.time():
+            return
+        with self._lock:
+            self._revoked[jti] = expires_at
+            if len(self._revoked) > self.capacity:
+                self.capacity *= 2
+                self._rebuild()
+            else:
+                self._filter.add(jti)
+        self.prune_if_due()
+
+    def is_revoked(self, jti: str) -> bool:
+        """Отозван ли jti. Быстрый путь — промах фильтра без блокировок."""
+        if jti not in self._filter:
+            return False
+        self.prune_if_due()
+        expires_at = self._revoked.get(jti)
+        return expires_at is not None and expires_at > time.time()
+
+    def synced_seq(self, epoch: str) -> int:
+        """seq последнего отзыва, перенесённого из движка с данным epoch."""
+        return self._synced.get(epoch, 0)
+
+    def merge(self, epoch: str, revocations: Iterable[Tuple[int, str, float]]) -> None:
+        """Перенести отзывы (seq, jti, expires_at), прочитанные из движка."""
+        for seq, jti, expires_at in revocations:
+            self.revoke(jti, expires_at)
+            with self._lock:
+                self._synced[epoch] = max(self._synced.get(epoch, 0), seq)
+
+    def prune_if_due(self) -> None:
+        """Раз в PRUNE_INTERVAL удалить истёкшие jti и перестроить фильтр."""
+        now = time.time()
+        if now < self._next_prune:
+            return
+        with self._lock:
+            if now < self._next_prune:
+                return
+            self._next_prune = now + PRUNE_INTERVAL
+            self._revoked = {
+                jti: expires_at for jti, expires_at in self._revoked.items() if expires_at > now
+            }
+            self._rebuild()
+
+    def _rebuild(self) -> None:
+        """Собрать новый фильтр из словаря и подменить (вызывается под _lock)."""
+        bloom = BloomFilter(self.capacity, self.error_rate)
+        for jti in self._revoked:
+            bloom.add(jti)
+        self._filter = bloom
+
+    def clear(self) -> None:
+        """Забыть все отзывы."""
+        with self._lock:
+            self._revoked = {}
+            self._synced = {}
+            self._rebuild()
+
+
+revocation_store = RevocationStore()
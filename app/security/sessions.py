@@ -0,0 +1,228 @@
+"""Сессии refresh-токенов в памяти процесса.
+
+Refresh-токен — "<id сессии>.<секрет>". Сессия хранит пользователя,
+blake2b-дайджест текущего секрета (сами токены в памяти не хранятся) и
+момент истечения. Каждый refresh ротирует секрет и продлевает сессию на
+ttl. Предъявление уже заменённого секрета — признак кражи токена: сессия
+отзывается целиком, и ни старый, ни новый токен больше не работают.
+
+Хранилище разбито на шарды по id сессии, у каждого своя блокировка,
+чтобы одновременные refresh не ждали друг друга. Истечение — корзины по
+bucket_seconds (упрощённое колесо таймеров): сессия лежит в корзине
+своего момента истечения, и очистка забирает только прошедшие корзины,
+без просмотра всех сессий. Очистка шарда выполняется попутно с операциями
+над ним; истёкшая, но ещё не убранная сессия всё равно не принимается.
+
+SessionStore держит сессии в памяти процесса. С движком, который делят
+несколько процессов (multi_process), сессии хранятся в движке
+(create_session, rotate_session, delete_session), а отсюда берутся
+только формат токена и дайджест секрета.
+"""
+
+import hashlib
+import hmac
+import os
+import secrets
+import threading
+import time
+from typing import Dict, Optional, Set, Tuple
+
+# Время жизни refresh-токена (с), число шардов и ширина корзины истечения (с)
+DEFAULT_REFRESH_TOKEN_TTL = 7 * 24 * 3600.0
+DEFAULT_SHARDS = 16
+DEFAULT_BUCKET_SECONDS = 60.0
+
+
+def new_session_id() -> str:
+    """Случайный id новой сессии."""
+    return secrets.token_urlsafe(12)
+
+
+def new_secret(session_id: str) -> Tuple[str, bytes]:
+    """Новый секрет сессии: (refresh-токен, дайджест секрета)."""
+    secret = secrets.token_urlsafe(32)
+    return f"{session_id}.{secret}", secret_digest(secret)
+
+
+def secret_digest(secret: str) -> bytes:
+    """Дайджест секрета, который хранится вместо самого токена."""
+    return hashlib.blake2b(secret.encode(), digest_size=16).digest()
+
+
+def split_token(token: str) -> Optional[Tuple[str, str]]:
+    """Разобрать refresh-токен на (id сессии, секрет) или None."""
+    session_id, sep, secret = token.partition(".")
+    if not sep or not session_id or not secret:
+        return None
+    return session_id, secret
+
+
+class Session:
+    """Сессия refresh-токена."""
+
+    __slots__ = ("user_id", "digest", "expires_at", "bucket")
+
+    def __init__(self, user_id: int, digest: bytes, expires_at: float, bucket: int):
+        self.user_id = user_id
+        self.digest = digest
+        self.expires_at = expires_at
+        self.bucket = bucket
+
+
+class _Shard:
+    """Сессии одного шарда и их корзины истечения (всё под lock)."""
+
+    __slots__ = ("lock", "sessions", "buckets", "swept")
+
+    def __init__(self, swept: int):
+        self.lock = threading.Lock()
+        self.sessions: Dict[str, Session] = {}
+        self.buckets: Dict[int, Set[str]] = {}
+        # Все корзины с номером меньше swept уже очищены
+        self.swept = swept
+
+
+class SessionStore:
+    """Шардированное TTL-хранилище сессий с ротацией refresh-токенов."""
+
+    def __init__(
+        self,
+        ttl: float = DEFAULT_REFRESH_TOKEN_TTL,
+        shards: int = DEFAULT_SHARDS,
+        bucket_seconds: float = DEFAULT_BUCKET_SECONDS,
+    ):
+        self.ttl = ttl
+        self.bucket_seconds = bucket_seconds
+        now_bucket = self._bucket(time.time())
+        self._shards = tuple(_Shard(now_bucket) for _ in range(max(shards, 1)))
+        self.rotations = 0
+        self.reuse_detected = 0
+        self.expired = 0
+
+    def __len__(self) -> int:
+        return sum(len(shard.sessions) for shard in self._shards)
+
+    def _bucket(self, moment: float) -> int:
+        return int(moment // self.bucket_seconds)
+
+    def _shard(self, session_id: str) -> _Shard:
+        return self._shards[hash(session_id) % len(self._shards)]
+
+    def _schedule(self, shard: _Shard, session_id: str, session: Session, now: float) -> str:
+        """Новый секрет и срок сессии; перенос в корзину нового срока (под lock)."""
+        token, session.digest = new_secret(session_id)
+        session.expires_at = now + self.ttl
+        bucket = self._bucket(session.expires_at)
+        if bucket != session.bucket:
+            self._unschedule(shard, session_id, session)
+            session.bucket = bucket
+            shard.buckets.setdefault(bucket, set()).add(session_id)
+        return token
+
+    @staticmethod
+    def _unschedule(shard: _Shard, session_id: str, session: Session) -> None:
+        """Убрать сессию из её корзины (под lock)."""
+        ids = shard.buckets.get(session.bucket)
+        if ids is not None:
+            ids.discard(session_id)
+            if not ids:
+                del shard.buckets[session.bucket]
+
+    def _sweep(self, shard: _Shard, now: float) -> None:
+        """Удалить сессии из прошедших корзин шарда (под lock).
+
+        Стоимость пропорциональна числу истёкших сессий и прошедших
+        корзин, но не числу живых сессий.
+        """
+        current = self._bucket(now)
+        if current <= shard.swept:
+            return
+        if current - shard.swept > len(shard.buckets):
+            # Долгий простой: дешевле пройти по непустым корзинам
+            due = [bucket for bucket in shard.buckets if bucket < current]
+        else:
+            due = range(shard.swept, current)
+        for bucket in due:
+            for session_id in shard.buckets.pop(bucket, ()):
+                del shard.sessions[session_id]
+                self.expired += 1
+        shard.swept = current
+
+    def create(self, user_id: int) -> str:
+        """Открыть сессию пользователя и вернуть её refresh-токен."""
+        session_id = new_session_id()
+        shard = self._shard(session_id)
+        now = time.time()
+        with shard.lock:
+            self._sweep(shard, now)
+            session = Session(user_id, b"", 0.0, -1)
+            shard.sessions[session_id] = session
+            return self._schedule(shard, session_id, session, now)
+
+    def rotate(self, token: str) -> Optional[Tuple[int, str]]:
+        """Обменять refresh-токен на новый: (user_id, новый токен) или None.
+
+        Заменённый ранее секрет отзывает сессию целиком.
+        """
+        parts = split_token(token)
+        if parts is None:
+            return None
+        session_id, secret = parts
+        shard = self._shard(session_id)
+        now = time.time()
+        with shard.lock:
+            self._sweep(shard, now)
+            session = shard.sessions.get(session_id)
+            if session is None or session.expires_at <= now:
+                return None
+            if not hmac.compare_digest(session.digest, secret_digest(secret)):
+                self.reuse_detected += 1
+                self._drop(shard, session_id)
+                return None
+            self.rotations += 1
+            return session.user_id, self._schedule(shard, session_id, session, now)
+
+    def revoke(self, token: str) -> bool:
+        """Закрыть сессию по её действующему refresh-токену (logout)."""
+        parts = split_token(token)
+        if parts is None:
+            return False
+        session_id, secret = parts
+        shard = self._shard(session_id)
+        with shard.lock:
+            session = shard.sessions.get(session_id)
+            if session is None or not hmac.compare_digest(session.digest, secret_digest(secret)):
+                return False
+            self._drop(shard, session_id)
+            return True
+
+    def _drop(self, shard: _Shard, session_id: str) -> None:
+        """Удалить сессию (под lock)."""
+        session = shard.sessions.pop(session_id)
+        self._unschedule(shard, session_id, session)
+
+    def clear(self) -> None:
+        """Закрыть все сессии (счётчики сохраняются)."""
+        now_bucket = self._bucket(time.time())
+        for shard in self._shards:
+            with shard.lock:
+                shard.sessions.clear()
+                shard.buckets.clear()
+                shard.swept = now_bucket
+
+    def stats(self) -> dict:
+        """Счётчики хранилища."""
+        return {
+            "sessions": len(self),
+            "shards": len(self._shards),
+            "ttl": self.ttl,
+            "rotations": self.rotations,
+            "reuse_detected": self.reuse_detected,
+            "expired": self.expired,
+        }
+
+
+session_store = SessionStore(
+    float(os.getenv("REFRESH_TOKEN_TTL", DEFAULT_REFRESH_TOKEN_TTL)),
+    int(os.getenv("SESSION_STORE_SHARDS", DEFAULT_SHARDS)),
+)
@@ -0,0 +1,163 @@
+"""Базовый интерфейс движка хранилища."""
+
+from abc import ABC, abstractmethod
+from typing import List, Optional, Sequence, Tuple
+
+from app.models import Item, User
+
+
+class VersionConflictError(ValueError):
+    """Версия item не совпала с ожидаемой (compare-and-set не выполнен)."""
+
+
+def normalize_email(email: str) -> str:
+    """Нормализовать email для индекса (email не чувствителен к регистру)."""
+    return email.strip().lower()
+
+
+class StorageEngine(ABC):
+    """Движок хранилища пользователей и items.
+
+    Реализации обязаны поддерживать одинаковую семантику:
+    - username уникален (с учётом регистра), email уникален без учёта регистра;
+    - id выдаются монотонно и не переиспользуются после удаления;
+    - списки items упорядочены по id;
+    - Item.version начинается с 1 и увеличивается при каждом изменении item;
+    - поколение набора items (get_items_generation) меняется при каждом
+      создании, изменении и удалении item этого набора.
+
+    Атрибут epoch отличает экземпляр данных: версии и поколения сравнимы
+    только в пределах одного epoch (in-memory движок после перезапуска
+    начинает их заново).
+
+    Атрибут blocking говорит, выполняет ли движок блокирующий I/O:
+    асинхронный API (app.database.a*) запускает такие движки в пуле потоков.
+
+    Атрибут multi_process говорит, могут ли те же данные менять другие
+    процессы (воркеры uvicorn над одним файлом): состояние, которое процесс
+    держит рядом с движком (кэш ответов, поисковый индекс, лента
+    изменений), тогда может устареть без его ведома. Такие движки хранят
+    и общее для воркеров состояние аутентификации: отзывы access-токенов
+    (revoke_token, get_revoked_tokens) и сессии refresh-токенов
+    (create_session, rotate_session, delete_session).
+
+    Атрибут full_text_search говорит, что движок сам ведёт полнотекстовый
+    индекс items и реализует search_items(query, owner_id, limit) — как
+    SearchIndex.search, но возвращает сами items; app.database вызывает его
+    только у таких движков. Иначе поиск выполняет индекс процесса (app.search).
+    """
+
+    blocking: bool = False
+    multi_process: bool = False
+    full_text_search: bool = False
+    epoch: str = ""
+
+    @abstractmethod
+    def get_user_by_id(self, user_id: int) -> Optional[User]:
+        """Получить пользователя по ID."""
+
+    @abstractmethod
+    def get_user_by_username(self, username: str) -> Optional[User]:
+        """Получить пользователя по username."""
+
+    @abstractmethod
+    def get_user_by_email(self, email: str) -> Optional[User]:
+        """Получить пользователя по email (без учёта регистра)."""
+
+    @abstractmethod
+    def create_user(
+        self, username: str, email: str, hashed_password: str, role: str = "user"
+    ) -> User:
+        """Создать нового пользователя.
+
+        Raises:
+            ValueError: если username или email уже заняты
+        """
+
+    @abstractmethod
+    def get_item_by_id(self, item_id: int) -> Optional[Item]:
+        """Получить элемент по ID."""
+
+    @abstractmethod
+    def get_items(
+        self,
+        owner_id: Optional[int] = None,
+        limit: int = 10,
+        offset: int = 0,
+        after_id: Optional[int] = None,
+    ) -> List[Item]:
+        """Получить страницу элементов (все или одного владельца) в порядке id.
+
+        Если указан after_id, страница начинается с первого id > after_id,
+        offset отсчитывается от этой позиции.
+        """
+
+    @abstractmethod
+    def create_item(self, name: str, owner_id: int, description: Optional[str] = None) -> Item:
+        """Создать новый элемент."""
+
+    @abstractmethod
+    def update_item(
+        self,
+        item_id: int,
+        name: Optional[str] = None,
+        description: Optional[str] = None,
+        expected_version: Optional[int] = None,
+    ) -> Optional[Item]:
+        """Обновить элемент. None если элемент не найден.
+
+        Если задан expected_version, обновление выполняется только при
+        совпадении версии item (compare-and-set).
+
+        Raises:
+            VersionConflictError: если версия item не равна expected_version
+        """
+
+    @abstractmethod
+    def delete_item(self, item_id: int, expected_version: Optional[int] = None) -> bool:
+        """Удалить элемент. False если элемент не найден.
+
+        Raises:
+            VersionConflictError: если версия item не равна expected_version
+        """
+
+    @abstractmethod
+    def get_items_generation(self, owner_id: Optional[int] = None) -> int:
+        """Поколение набора items владельца (None — всех items)."""
+
+    @abstractmethod
+    def count_items(self, owner_id: Optional[int] = None) -> int:
+        """Число items владельца (None — всех items) за O(1), без обхода."""
+
+    @abstractmethod
+    def count_item_owners(self) -> int:
+        """Число владельцев, у которых есть items, за O(1)."""
+
+    # ========== Пакетные операции ==========
+    # Реализации по умолчанию выполняют операции по одной; движки
+    # переопределяют их, чтобы применить пакет за одну блокировку/транзакцию.
+
+    def get_items_by_ids(self, item_ids: Sequence[int]) -> List[Optional[Item]]:
+        """Получить items по списку ID (None для отсутствующих), порядок сохраняется."""
+        return [self.get_item_by_id(item_id) for item_id in item_ids]
+
+    def create_items(self, entries: Sequence[Tuple[str, int, Optional[str]]]) -> List[Item]:
+        """Создать items из кортежей (name, owner_id, description)."""
+        return [
+            self.create_item(name, owner_id, description) for name, owner_id, description in entries
+        ]
+
+    def update_items(
+        self, updates: Sequence[Tuple[int, Optional[str], Optional[str]]]
+    ) -> List[Optional[Item]]:
+        """Обновить items из кортежей (item_id, name, description)."""
+        return [
+            self.update_item(item_id, name, description) for item_id, name, description in updates
+        ]
+
+    def delete_items(self, item_ids: Sequence[int]) -> List[bool]:
+        """Удалить items по списку ID. Для каждого — удалён ли он."""
+        return [self.delete_item(item_id) for item_id in item_ids]
+
+    def close(self) -> None:
+        """Освободить ресурсы движка."""
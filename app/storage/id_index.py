@@ -0,0 +1,123 @@
+"""Упорядоченный индекс id items для in-memory движка.
+
+Плоский отсортированный список дёшев для вставки в конец и для среза
+страницы, но удаление из середины сдвигает весь хвост: O(n) под
+блокировкой, которую ждут все вставки. Здесь id лежат блоками не длиннее
+BLOCK_SIZE: удаление и вставка в середину сдвигают только свой блок.
+Блок ищется бинарным поиском по последним id блоков. Для страницы по
+offset нужны позиции начала блоков — они пересчитываются лениво, один
+раз после изменения (O(n / BLOCK_SIZE)), добавление в конец их не
+сбрасывает.
+
+Писатели сериализуются внешней блокировкой движка, читатели блокировок
+не берут. Пустых блоков в индексе не бывает. Разбиение блока и удаление
+опустевшего блока публикуются заменой списка блоков целиком, поэтому
+читатель, уже взявший список, не увидит сдвига номеров блоков.
+"""
+
+from bisect import bisect_left, bisect_right, insort
+from itertools import accumulate
+from operator import itemgetter
+from typing import Iterable, List, Optional, Tuple
+
+# Наибольший размер блока; переполненный блок делится пополам
+BLOCK_SIZE = 1024
+
+_last = itemgetter(-1)
+
+
+class IdIndex:
+    """Отсортированный набор id блоками с удалением за O(BLOCK_SIZE)."""
+
+    __slots__ = ("_blocks", "_len", "_version", "_starts")
+
+    def __init__(self, ids: Iterable[int] = ()):
+        self._blocks: List[List[int]] = []
+        self._len = 0
+        # Версия меняется при сдвиге позиций (не при добавлении в конец)
+        self._version = 0
+        self._starts: Optional[Tuple[int, List[int]]] = None
+        self.extend(ids)
+
+    def __len__(self) -> int:
+        return self._len
+
+    def __iter__(self):
+        for block in self._blocks:
+            yield from block
+
+    def add(self, item_id: int) -> None:
+        """Добавить id (в конец — за O(1))."""
+        blocks = self._blocks
+        if not blocks:
+            blocks.append([item_id])
+        elif item_id > blocks[-1][-1]:
+            if len(blocks[-1]) < BLOCK_SIZE:
+                blocks[-1].append(item_id)
+            else:
+                blocks.append([item_id])
+        else:
+            index = bisect_left(blocks, item_id, key=_last)
+            block = blocks[index]
+            insort(block, item_id)
+            if len(block) > BLOCK_SIZE:
+                half = len(block) // 2
+                self._blocks = blocks[:index] + [block[:half], block[half:]] + blocks[index + 1 :]
+            self._version += 1
+        self._len += 1
+
+    def extend(self, ids: Iterable[int]) -> None:
+        """Добавить id по возрастанию."""
+        for item_id in ids:
+            self.add(item_id)
+
+    def remove(self, item_id: int) -> bool:
+        """Удалить id; False, если его нет."""
+        blocks = self._blocks
+        index = bisect_left(blocks, item_id, key=_last)
+        if index == len(blocks):
+            return False
+        block = blocks[index]
+        pos = bisect_left(block, item_id)
+        if block[pos] != item_id:
+            return False
+        if len(block) == 1:
+            self._blocks = blocks[:index] + blocks[index + 1 :]
+        else:
+            del block[pos]
+        self._version += 1
+        self._len -= 1
+        return True
+
+    def _positions(self, blocks: List[List[int]]) -> List[int]:
+        """Позиции начала блоков (кэш действителен до сдвига позиций)."""
+        version = self._version
+        cached = self._starts
+        if cached is not None and cached[0] == version and len(cached[1]) == len(blocks):
+            return cached[1]
+        starts = list(accumulate(map(len, blocks), initial=0))
+        starts.pop()
+        self._starts = (version, starts)
+        return starts
+
+    def page(self, offset: int = 0, limit: int = 10, after_id: Optional[int] = None) -> List[int]:
+        """До limit id после after_id (если задан), пропустив offset."""
+        blocks = self._blocks
+        if not blocks or limit <= 0:
+            return []
+        index, pos = 0, 0
+        if after_id is not None:
+            index = bisect_right(blocks, after_id, key=_last)
+            if index == len(blocks):
+                return []
+            pos = bisect_right(blocks[index], after_id)
+        if offset:
+            starts = self._positions(blocks)
+            target = starts[index] + pos + offset
+            index = bisect_right(starts, target) - 1
+            pos = target - starts[index]
+        page = blocks[index][pos : pos + limit]
+        while len(page) < limit and index + 1 < len(blocks):
+            index += 1
+            page += blocks[index][: limit - len(page)]
+        return page
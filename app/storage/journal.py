@@ -0,0 +1,325 @@
+"""In-memory хранилище с журналом упреждающей записи (WAL) и снапшотами.
+
+Данные живут в словарях MemoryStorage (скорость чтения та же), а каждая
+изменяющая операция дописывается в журнал. Журнал сбрасывается на диск
+группами (group commit): фоновый поток делает write+fsync раз в
+fsync_interval секунд или как только накопится fsync_batch записей,
+поэтому запись в хранилище не ждёт fsync.
+
+Каждые snapshot_every записей делается компактный снапшот: журнал
+переключается на новый сегмент, состояние сериализуется в snapshot.jsonl,
+после чего старые сегменты удаляются. При старте загружается снапшот и
+проигрываются сегменты журнала после него.
+
+Формат и снапшота, и журнала — JSON lines, по одной записи на строку:
+    ["cu", id, username, email, hashed_password, role]  — создание пользователя
+    ["ci", id, name, owner_id, description(, version)]   — создание item
+    ["ui", id, name, description(, version)]             — итоговые поля item
+    ["di", id]                                           — удаление item
+Запись ["ui", ...] несёт итоговые значения (включая версию), поэтому
+повторное применение идемпотентно; ["ci", ...] для уже существующего id
+пропускается. Записи без версии (старый формат) создают item с версией 1
+и увеличивают версию на единицу.
+"""
+
+import json
+import logging
+import os
+import threading
+from pathlib import Path
+from typing import List, Optional, Sequence, Tuple
+
+from app.models import Item, User
+from app.storage.memory import MemoryStorage
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_FILE = "snapshot.jsonl"
+SNAPSHOT_VERSION = 1
+DEFAULT_FSYNC_BATCH = 256
+DEFAULT_FSYNC_INTERVAL = 0.01
+DEFAULT_SNAPSHOT_EVERY = 100_000
+
+
+def _segment_name(number: int) -> str:
+    return f"wal-{number:08d}.jsonl"
+
+
+def _fsync_dir(path: Path) -> None:
+    """Сбросить на диск изменения каталога (переименования, новые файлы)."""
+    if os.name != "posix":
+        return
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+class JournaledMemoryStorage(MemoryStorage):
+    """MemoryStorage, переживающий перезапуск процесса."""
+
+    def __init__(
+        self,
+        directory: str,
+        fsync_batch: int = DEFAULT_FSYNC_BATCH,
+        fsync_interval: float = DEFAULT_FSYNC_INTERVAL,
+        snapshot_every: int = DEFAULT_SNAPSHOT_EVERY,
+    ):
+        super().__init__()
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.fsync_batch = fsync_batch
+        self.fsync_interval = fsync_interval
+        self.snapshot_every = snapshot_every
+
+        # _lock защищает состояние и буфер журнала, _io_lock — файл сегмента.
+        # Порядок захвата всегда _io_lock -> _lock. Изменения сериализуются
+        # под _lock, чтобы порядок записей в журнале совпадал с порядком
+        # применения (полосатые блокировки MemoryStorage берутся внутри).
+        self._lock = threading.Lock()
+        self._io_lock = threading.Lock()
+        self._pending: List[str] = []
+        self._records_since_snapshot = 0
+
+        self._segment = self._recover()
+        self._wal = open(self.directory / _segment_name(self._segment), "a", encoding="utf-8")
+
+        self._closed = False
+        self._wake = threading.Event()
+        self._flusher = threading.Thread(target=self._flush_loop, name="wal-flusher", daemon=True)
+        self._flusher.start()
+
+    # ========== Восстановление ==========
+
+    def _recover(self) -> int:
+        """Загрузить снапшот и проиграть журнал. Возвращает номер текущего сегмента."""
+        first_segment = 1
+        snapshot_path = self.directory / SNAPSHOT_FILE
+        if snapshot_path.exists():
+            with open(snapshot_path, encoding="utf-8") as f:
+                header = json.loads(f.readline())
+                if header.get("version") != SNAPSHOT_VERSION:
+                    raise ValueError(f"Unsupported snapshot version: {header.get('version')}")
+                for line in f:
+                    self._apply(json.loads(line))
+            first_segment = header["wal_segment"]
+            self._user_id_counter = max(self._user_id_counter, header["user_id_counter"])
+            self._item_id_counter = max(self._item_id_counter, header["item_id_counter"])
+
+        segments = sorted(int(path.name[4:12]) for path in self.directory.glob("wal-*.jsonl"))
+        for number in segments:
+            if number < first_segment:
+                # Сегмент уже вошёл в снапшот, но не успел удалиться
+                (self.directory / _segment_name(number)).unlink()
+                continue
+            self._records_since_snapshot += self._replay_segment(
+                self.directory / _segment_name(number)
+            )
+        # Дописываем всегда в новый сегмент: хвост старого может быть недописан
+        return max([first_segment, *segments]) + 1
+
+    def _replay_segment(self, path: Path) -> int:
+        """Проиграть сегмент журнала. Возвращает число применённых записей."""
+        applied = 0
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    # Недописанная последняя запись (сбой во время write)
+                    logger.warning("Truncated WAL record in %s ignored", path.name)
+                    break
+                self._apply(record)
+                applied += 1
+        return applied
+
+    def _apply(self, record: list) -> None:
+        """Применить запись журнала или снапшота к состоянию в памяти."""
+        op = record[0]
+        if op == "cu":
+            _, user_id, username, email, hashed_password, role = record
+            self._add_user(User(user_id, username, email, hashed_password, role))
+        elif op == "ci":
+            # Повтор создания не должен второй раз добавить id в индексы и счётчики
+            if self.get_item_by_id(record[1]) is None:
+                self._add_item(Item(*record[1:]))
+        elif op == "ui":
+            _, item_id, name, description, *version = record
+            item = self.get_item_by_id(item_id)
+            if item is not None:
+                item.name = name
+                item.description = description
+                item.version = version[0] if version else item.version + 1
+                self._touch(item.owner_id)
+        elif op == "di":
+            super().delete_item(record[1])
+        else:
+            raise ValueError(f"Unknown WAL record: {op}")
+
+    # ========== Журналируемые операции ==========
+
+    def _append(self, record: list) -> None:
+        """Добавить запись в буфер журнала (вызывается под _lock)."""
+        self._pending.append(json.dumps(record, ensure_ascii=False) + "\n")
+        self._records_since_snapshot += 1
+        if (
+            len(self._pending) >= self.fsync_batch
+            or self._records_since_snapshot >= self.snapshot_every
+        ):
+            self._wake.set()
+
+    def create_user(
+        self, username: str, email: str, hashed_password: str, role: str = "user"
+    ) -> User:
+        with self._lock:
+            user = super().create_user(username, email, hashed_password, role)
+            self._append(["cu", user.id, username, email, hashed_password, role])
+        return user
+
+    def create_item(self, name: str, owner_id: int, description: Optional[str] = None) -> Item:
+        with self._lock:
+            item = super().create_item(name, owner_id, description)
+            self._append(["ci", item.id, name, owner_id, description])
+        return item
+
+    def update_item(
+        self,
+        item_id: int,
+        name: Optional[str] = None,
+        description: Optional[str] = None,
+        expected_version: Optional[int] = None,
+    ) -> Optional[Item]:
+        with self._lock:
+            item = super().update_item(item_id, name, description, expected_version)
+            if item is not None:
+                self._append(["ui", item.id, item.name, item.description, item.version])
+        return item
+
+    def delete_item(self, item_id: int, expected_version: Optional[int] = None) -> bool:
+        with self._lock:
+            deleted = super().delete_item(item_id, expected_version)
+            if deleted:
+                self._append(["di", item_id])
+        return deleted
+
+    def create_items(self, entries: Sequence[Tuple[str, int, Optional[str]]]) -> List[Item]:
+        with self._lock:
+            items = super().create_items(entries)
+            for item in items:
+                self._append(["ci", item.id, item.name, item.owner_id, item.description])
+        return items
+
+    def update_items(
+        self, updates: Sequence[Tuple[int, Optional[str], Optional[str]]]
+    ) -> List[Optional[Item]]:
+        with self._lock:
+            results = [
+                MemoryStorage.update_item(self, item_id, name, description)
+                for item_id, name, description in updates
+            ]
+            for item in results:
+                if item is not None:
+                    self._append(["ui", item.id, item.name, item.description, item.version])
+        return results
+
+    def delete_items(self, item_ids: Sequence[int]) -> List[bool]:
+        with self._lock:
+            results = [MemoryStorage.delete_item(self, item_id) for item_id in item_ids]
+            for item_id, deleted in zip(item_ids, results):
+                if deleted:
+                    self._append(["di", item_id])
+        return results
+
+    # ========== Сброс журнала и снапшоты ==========
+
+    def _take_pending(self) -> str:
+        """Забрать буфер журнала (вызывается под _lock)."""
+        data = "".join(self._pending)
+        self._pending.clear()
+        return data
+
+    def _write(self, data: str) -> None:
+        """Записать данные в текущий сегмент и сделать fsync (под _io_lock)."""
+        if data:
+            self._wal.write(data)
+            self._wal.flush()
+            os.fsync(self._wal.fileno())
+
+    def _write_pending(self) -> None:
+        """Записать буфер в текущий сегмент и сделать fsync (под _io_lock)."""
+        with self._lock:
+            data = self._take_pending()
+        self._write(data)
+
+    def flush(self) -> None:
+        """Гарантировать, что все выполненные операции записаны на диск."""
+        with self._io_lock:
+            self._write_pending()
+
+    def snapshot(self) -> None:
+        """Сохранить снапшот состояния и удалить покрытые им сегменты журнала."""
+        with self._io_lock:
+            self._write_pending()
+            with self._lock:
+                # Дозапись буфера в старый сегмент, его переключение и копия
+                # состояния атомарны относительно записи: каждая запись попадает
+                # либо в старый сегмент (и состояние снапшота), либо только в новый.
+                # Копируются ссылки на объекты: изменения после этой точки попадут
+                # и в новый сегмент, а записи ["ui", ...] идемпотентны.
+                self._write(self._take_pending())
+                self._wal.close()
+                old_segment = self._segment
+                self._segment += 1
+                self._wal = open(
+                    self.directory / _segment_name(self._segment), "a", encoding="utf-8"
+                )
+                users = list(self._users_db.values())
+                items = [item for item in self._items if item is not None]
+                header = {
+                    "version": SNAPSHOT_VERSION,
+                    "wal_segment": self._segment,
+                    "user_id_counter": self._user_id_counter,
+                    "item_id_counter": self._item_id_counter,
+                }
+                self._records_since_snapshot = 0
+
+            tmp_path = self.directory / (SNAPSHOT_FILE + ".tmp")
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                f.write(json.dumps(header) + "\n")
+                for u in users:
+                    record = ["cu", u.id, u.username, u.email, u.hashed_password, u.role]
+                    f.write(json.dumps(record, ensure_ascii=False) + "\n")
+                for i in items:
+                    record = ["ci", i.id, i.name, i.owner_id, i.description, i.version]
+                    f.write(json.dumps(record, ensure_ascii=False) + "\n")
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, self.directory / SNAPSHOT_FILE)
+            _fsync_dir(self.directory)
+
+            for number in range(1, old_segment + 1):
+                path = self.directory / _segment_name(number)
+                if path.exists():
+                    path.unlink()
+
+    def _flush_loop(self) -> None:
+        """Фоновый group commit и периодические снапшоты."""
+        while not self._closed:
+            self._wake.wait(self.fsync_interval)
+            self._wake.clear()
+            try:
+                self.flush()
+                if self._records_since_snapshot >= self.snapshot_every:
+                    self.snapshot()
+            except Exception:
+                logger.exception("WAL flush failed")
+
+    def close(self) -> None:
+        if self._closed:
+            return
+        self._closed = True
+        self._wake.set()
+        self._flusher.join()
+        self.flush()
+        self._wal.close()
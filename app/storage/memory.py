@@ -0,0 +1,253 @@
+"""In-memory движок хранилища на словарях и индексах."""
+
+import itertools
+import secrets
+import threading
+from itertools import repeat
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from app.models import Item, User
+from app.storage.base import StorageEngine, VersionConflictError, normalize_email
+from app.storage.id_index import IdIndex
+
+# Число полос (stripes) блокировок для items и индексов владельцев
+LOCK_STRIPES = 64
+
+
+class MemoryStorage(StorageEngine):
+    """Хранилище в памяти процесса.
+
+    Пользователи ищутся через уникальные индексы username/email за O(1).
+    Items индексируются упорядоченными по id индексами IdIndex (общим и по
+    владельцу): id выдаются монотонно, поэтому вставка — добавление в конец,
+    страница — срез, а удаление сдвигает только свой блок индекса.
+    Сами items лежат в плотном списке, где позиция равна id: это дешевле
+    словаря id -> Item (8 байт на слот против записи хэш-таблицы и объекта
+    int ключа); удалённый id оставляет пустой слот None. owner_id
+    приводятся к одному объекту int на владельца.
+
+    Хранилище потокобезопасно (синхронные эндпойнты выполняются в пуле
+    потоков Starlette). Выдача id атомарна и вместе с добавлением в общий
+    индекс выполняется под коротким _id_lock. Изменения item и индекса
+    владельца защищены полосатыми блокировками (по item_id и по owner_id),
+    так что писатели в разные полосы не ждут друг друга. Порядок захвата:
+    блокировка item -> _id_lock -> блокировка владельца. Читатели
+    блокировок не берут.
+
+    Длины индексов — счётчики items (общий и по владельцу): они меняются
+    на каждой вставке и удалении, так что подсчёт не требует обхода.
+
+    Поколения наборов items — уникальные метки из общего атомарного
+    счётчика, записываемые после изменения: метка, которую видел клиент,
+    после следующего изменения набора уже не вернётся.
+    """
+
+    def __init__(self):
+        self._users_db: Dict[int, User] = {}
+        # Плотный список items: позиция = id, слот 0 не используется
+        self._items: List[Optional[Item]] = [None]
+        # Уникальные вторичные индексы для O(1) поиска пользователей
+        self._users_by_username: Dict[str, User] = {}
+        self._users_by_email: Dict[str, User] = {}
+        # Упорядоченные по id индексы элементов: все id и id по владельцу
+        self._item_ids = IdIndex()
+        self._items_by_owner: Dict[int, IdIndex] = {}
+        self._owner_keys: Dict[int, int] = {}
+        # Поколения наборов items: по владельцу и общее
+        self._stamps = itertools.count(1)
+        self._generations: Dict[int, int] = {}
+        self._generation = 0
+        self.epoch = secrets.token_hex(4)
+        self._user_id_counter = 1
+        self._item_id_counter = 1
+        self._users_lock = threading.Lock()
+        self._id_lock = threading.Lock()
+        self._item_locks = [threading.Lock() for _ in range(LOCK_STRIPES)]
+        self._owner_locks = [threading.Lock() for _ in range(LOCK_STRIPES)]
+
+    def _item_lock(self, item_id: int) -> threading.Lock:
+        return self._item_locks[item_id % LOCK_STRIPES]
+
+    def _owner_lock(self, owner_id: int) -> threading.Lock:
+        return self._owner_locks[owner_id % LOCK_STRIPES]
+
+    def get_user_by_id(self, user_id: int) -> Optional[User]:
+        return self._users_db.get(user_id)
+
+    def get_user_by_username(self, username: str) -> Optional[User]:
+        return self._users_by_username.get(username)
+
+    def get_user_by_email(self, email: str) -> Optional[User]:
+        return self._users_by_email.get(normalize_email(email))
+
+    def create_user(
+        self, username: str, email: str, hashed_password: str, role: str = "user"
+    ) -> User:
+        email_key = normalize_email(email)
+        # Регистрация редка: проверка уникальности и вставка под одной блокировкой
+        with self._users_lock:
+            if username in self._users_by_username:
+                raise ValueError("Username already registered")
+            if email_key in self._users_by_email:
+                raise ValueError("Email already registered")
+            user = User(
+                id=self._user_id_counter,
+                username=username,
+                email=email,
+                hashed_password=hashed_password,
+                role=role,
+            )
+            self._add_user(user)
+        return user
+
+    def _add_user(self, user: User) -> None:
+        """Добавить пользователя с уже выданным id (вызывается под _users_lock)."""
+        self._users_db[user.id] = user
+        self._users_by_username[user.username] = user
+        self._users_by_email[normalize_email(user.email)] = user
+        self._user_id_counter = max(self._user_id_counter, user.id + 1)
+
+    def _grow_slots(self) -> None:
+        """Дорастить список items до счётчика id (вызывается под _id_lock)."""
+        self._items.extend(repeat(None, self._item_id_counter - len(self._items)))
+
+    def _touch(self, owner_id: int) -> None:
+        """Сменить поколение набора items владельца и общего набора."""
+        self._generations[owner_id] = next(self._stamps)
+        self._generation = next(self._stamps)
+
+    def get_items_generation(self, owner_id: Optional[int] = None) -> int:
+        if owner_id is None:
+            return self._generation
+        return self._generations.get(owner_id, 0)
+
+    def count_items(self, owner_id: Optional[int] = None) -> int:
+        if owner_id is None:
+            return len(self._item_ids)
+        return len(self._items_by_owner.get(owner_id, ()))
+
+    def count_item_owners(self) -> int:
+        # Пустой список владельца удаляется вместе с последним его item
+        return len(self._items_by_owner)
+
+    def get_item_by_id(self, item_id: int) -> Optional[Item]:
+        if 0 < item_id < len(self._items):
+            return self._items[item_id]
+        return None
+
+    def get_items(
+        self,
+        owner_id: Optional[int] = None,
+        limit: int = 10,
+        offset: int = 0,
+        after_id: Optional[int] = None,
+    ) -> List[Item]:
+        # Стоимость страницы O(limit) (+ O(log n) на поиск позиции курсора)
+        if owner_id is None:
+            ids = self._item_ids
+        else:
+            ids = self._items_by_owner.get(owner_id)
+            if ids is None:
+                return []
+        # id в индексе может опережать слот items (вставка в процессе) или
+        # отставать от него (удаление в процессе) — такие id пропускаются.
+        # Слот под id выделяется раньше, чем id попадает в индекс
+        items = self._items
+        page = [items[item_id] for item_id in ids.page(offset, limit, after_id)]
+        return [item for item in page if item is not None]
+
+    def create_item(self, name: str, owner_id: int, description: Optional[str] = None) -> Item:
+        with self._id_lock:
+            item_id = self._item_id_counter
+            self._item_id_counter += 1
+            self._grow_slots()
+            self._item_ids.add(item_id)
+        item = Item(id=item_id, name=name, owner_id=owner_id, description=description)
+        self._index_item(item)
+        return item
+
+    def create_items(self, entries: Sequence[Tuple[str, int, Optional[str]]]) -> List[Item]:
+        # Блок id выдаётся за один захват _id_lock
+        entries = list(entries)
+        with self._id_lock:
+            first_id = self._item_id_counter
+            self._item_id_counter += len(entries)
+            self._grow_slots()
+            items = [
+                Item(id=first_id + n, name=name, owner_id=owner_id, description=description)
+                for n, (name, owner_id, description) in enumerate(entries)
+            ]
+            # Индексы ссылаются на тот же объект int, что и item.id
+            self._item_ids.extend(item.id for item in items)
+        for item in items:
+            self._index_item(item)
+        return items
+
+    def _add_item(self, item: Item) -> None:
+        """Добавить item с уже выданным (максимальным) id в хранилище и индексы."""
+        with self._id_lock:
+            self._item_ids.add(item.id)
+            self._item_id_counter = max(self._item_id_counter, item.id + 1)
+            self._grow_slots()
+        self._index_item(item)
+
+    def _index_item(self, item: Item) -> None:
+        """Добавить item в индекс владельца и сделать видимым по id."""
+        # Один объект int на владельца вместо копии в каждом item
+        item.owner_id = self._owner_keys.setdefault(item.owner_id, item.owner_id)
+        with self._owner_lock(item.owner_id):
+            # Параллельные вставки одного владельца могут прийти не в порядке
+            # выдачи id: add вставляет на место
+            owner_ids = self._items_by_owner.get(item.owner_id)
+            if owner_ids is None:
+                owner_ids = self._items_by_owner[item.owner_id] = IdIndex()
+            owner_ids.add(item.id)
+        self._items[item.id] = item
+        self._touch(item.owner_id)
+
+    def update_item(
+        self,
+        item_id: int,
+        name: Optional[str] = None,
+        description: Optional[str] = None,
+        expected_version: Optional[int] = None,
+    ) -> Optional[Item]:
+        # Проверка версии и изменение атомарны под блокировкой полосы item
+        with self._item_lock(item_id):
+            item = self.get_item_by_id(item_id)
+            if not item:
+                return None
+            _check_version(item, expected_version)
+            if name is not None:
+                item.name = name
+            if description is not None:
+                item.description = description
+            item.version += 1
+        self._touch(item.owner_id)
+        return item
+
+    def delete_item(self, item_id: int, expected_version: Optional[int] = None) -> bool:
+        with self._item_lock(item_id):
+            item = self.get_item_by_id(item_id)
+            if item is None:
+                return False
+            _check_version(item, expected_version)
+            self._items[item_id] = None
+            with self._id_lock:
+                self._item_ids.remove(item_id)
+            with self._owner_lock(item.owner_id):
+                owner_ids = self._items_by_owner.get(item.owner_id)
+                if owner_ids is not None:
+                    owner_ids.remove(item_id)
+                    if not owner_ids:
+                        del self._items_by_owner[item.owner_id]
+        self._touch(item.owner_id)
+        return True
+
+
+def _check_version(item: Item, expected_version: Optional[int]) -> None:
+    """Проверить ожидаемую версию item (None — без проверки)."""
+    if expected_version is not None and item.version != expected_version:
+        raise VersionConflictError(
+            f"Item {item.id} has version {item.version}, expected {expected_version}"
+        )
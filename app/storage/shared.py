@@ -0,0 +1,51 @@
+"""Движок хранилища в разделяемой памяти для нескольких воркеров uvicorn.
+
+При запуске uvicorn --workers N каждый воркер — отдельный процесс, и
+in-memory словари у каждого свои. Этот движок держит пользователей и
+items в файле SQLite на tmpfs (/dev/shm), отображённом в память всех
+воркеров (PRAGMA mmap_size): чтения идут прямо из общих страниц памяти
+без read(2), а межпроцессные блокировки и индекс WAL (файл -shm,
+тоже mmap) обеспечивает SQLite. Любой воркер видит те же данные.
+
+Данные живут, пока жива ОС (tmpfs), поэтому fsync не нужен.
+"""
+
+import os
+import tempfile
+from pathlib import Path
+
+from app.storage.sqlite import DEFAULT_POOL_SIZE, SQLiteStorage
+
+SHM_DIR = Path("/dev/shm")
+SHARED_FILE = "secdev-app.db"
+DEFAULT_MMAP_SIZE = 256 * 1024 * 1024
+
+
+def default_shared_path() -> str:
+    """Путь к общему файлу: /dev/shm, если есть, иначе временный каталог."""
+    directory = SHM_DIR if SHM_DIR.is_dir() else Path(tempfile.gettempdir())
+    return str(directory / SHARED_FILE)
+
+
+class SharedMemoryStorage(SQLiteStorage):
+    """SQLite в разделяемой памяти с mmap, общий для всех процессов-воркеров."""
+
+    synchronous = "OFF"
+
+    def __init__(
+        self,
+        path: str = "",
+        pool_size: int = DEFAULT_POOL_SIZE,
+        mmap_size: int = DEFAULT_MMAP_SIZE,
+    ):
+        self.mmap_size = mmap_size
+        super().__init__(path or default_shared_path(), pool_size=pool_size)
+
+    def destroy(self) -> None:
+        """Закрыть движок и удалить общий файл вместе с -wal/-shm."""
+        self.close()
+        for suffix in ("", "-wal", "-shm"):
+            try:
+                os.unlink(self.path + suffix)
+            except FileNotFoundError:
+                pass
@@ -0,0 +1,498 @@
+"""Персистентный движок хранилища на SQLite."""
+
+import hmac
+import queue
+import sqlite3
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterator, List, Optional, Sequence, Tuple
+
+from app.models import Item, User
+from app.search import tokenize
+from app.storage.base import StorageEngine, VersionConflictError, normalize_email
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS users (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    username TEXT NOT NULL,
+    email TEXT NOT NULL,
+    email_key TEXT NOT NULL,
+    hashed_password TEXT NOT NULL,
+    role TEXT NOT NULL DEFAULT 'user'
+);
+CREATE UNIQUE INDEX IF NOT EXISTS ux_users_username ON users (username);
+CREATE UNIQUE INDEX IF NOT EXISTS ux_users_email_key ON users (email_key);
+
+CREATE TABLE IF NOT EXISTS items (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    name TEXT NOT NULL,
+    owner_id INTEGER NOT NULL,
+    description TEXT,
+    version INTEGER NOT NULL DEFAULT 1
+);
+CREATE INDEX IF NOT EXISTS ix_items_owner_id ON items (owner_id, id);
+
+-- Поколения наборов items (owner_id = 0 — все items), ведутся триггерами
+-- в той же транзакции, что и изменение
+CREATE TABLE IF NOT EXISTS item_generations (
+    owner_id INTEGER PRIMARY KEY,
+    value INTEGER NOT NULL
+);
+CREATE TRIGGER IF NOT EXISTS tr_items_insert AFTER INSERT ON items BEGIN
+    INSERT INTO item_generations (owner_id, value) VALUES (NEW.owner_id, 1), (0, 1)
+        ON CONFLICT (owner_id) DO UPDATE SET value = value + 1;
+END;
+CREATE TRIGGER IF NOT EXISTS tr_items_update AFTER UPDATE ON items BEGIN
+    INSERT INTO item_generations (owner_id, value) VALUES (NEW.owner_id, 1), (0, 1)
+        ON CONFLICT (owner_id) DO UPDATE SET value = value + 1;
+END;
+CREATE TRIGGER IF NOT EXISTS tr_items_delete AFTER DELETE ON items BEGIN
+    INSERT INTO item_generations (owner_id, value) VALUES (OLD.owner_id, 1), (0, 1)
+        ON CONFLICT (owner_id) DO UPDATE SET value = value + 1;
+END;
+
+-- Число items (owner_id = 0 — всех, -1 — число владельцев с items),
+-- ведётся триггерами; строка владельца удаляется вместе с его последним item
+CREATE TABLE IF NOT EXISTS item_counts (
+    owner_id INTEGER PRIMARY KEY,
+    value INTEGER NOT NULL
+);
+CREATE TRIGGER IF NOT EXISTS tr_items_count_insert AFTER INSERT ON items BEGIN
+    INSERT INTO item_counts (owner_id, value) VALUES (NEW.owner_id, 1), (0, 1)
+        ON CONFLICT (owner_id) DO UPDATE SET value = value + 1;
+    UPDATE item_counts SET value = value + 1 WHERE owner_id = -1
+        AND (SELECT value FROM item_counts WHERE owner_id = NEW.owner_id) = 1;
+END;
+CREATE TRIGGER IF NOT EXISTS tr_items_count_delete AFTER DELETE ON items BEGIN
+    UPDATE item_counts SET value = value - 1 WHERE owner_id IN (OLD.owner_id, 0);
+    UPDATE item_counts SET value = value - 1 WHERE owner_id = -1
+        AND (SELECT value FROM item_counts WHERE owner_id = OLD.owner_id) = 0;
+    DELETE FROM item_counts WHERE owner_id = OLD.owner_id AND value = 0;
+END;
+
+-- Полнотекстовый индекс name/description (внешнее содержимое — items),
+-- ведётся триггерами, поэтому видит записи всех процессов
+CREATE VIRTUAL TABLE IF NOT EXISTS items_fts USING fts5(
+    name, description, content='items', content_rowid='id',
+    tokenize="unicode61 remove_diacritics 0 tokenchars '_'"
+);
+CREATE TRIGGER IF NOT EXISTS tr_items_fts_insert AFTER INSERT ON items BEGIN
+    INSERT INTO items_fts (rowid, name, description)
+        VALUES (NEW.id, NEW.name, NEW.description);
+END;
+CREATE TRIGGER IF NOT EXISTS tr_items_fts_delete AFTER DELETE ON items BEGIN
+    INSERT INTO items_fts (items_fts, rowid, name, description)
+        VALUES ('delete', OLD.id, OLD.name, OLD.description);
+END;
+CREATE TRIGGER IF NOT EXISTS tr_items_fts_update AFTER UPDATE OF name, description ON items
+BEGIN
+    INSERT INTO items_fts (items_fts, rowid, name, description)
+        VALUES ('delete', OLD.id, OLD.name, OLD.description);
+    INSERT INTO items_fts (rowid, name, description)
+        VALUES (NEW.id, NEW.name, NEW.description);
+END;
+
+-- Отозванные access-токены (logout), общие для всех воркеров. seq задаёт
+-- порядок записи: процесс дочитывает отзывы после последнего виденного seq
+CREATE TABLE IF NOT EXISTS revoked_tokens (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    jti TEXT NOT NULL UNIQUE,
+    expires_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS ix_revoked_tokens_expires_at ON revoked_tokens (expires_at);
+
+-- Сессии refresh-токенов: дайджест текущего секрета и срок (app.security.sessions)
+CREATE TABLE IF NOT EXISTS refresh_sessions (
+    id TEXT PRIMARY KEY,
+    user_id INTEGER NOT NULL,
+    digest BLOB NOT NULL,
+    expires_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS ix_refresh_sessions_expires_at ON refresh_sessions (expires_at);
+
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+INSERT OR IGNORE INTO meta (key, value) VALUES ('epoch', lower(hex(randomblob(4))));
+"""
+
+# SQL-запросы — константы: sqlite3 кэширует подготовленные выражения
+# по тексту запроса на каждом соединении (cached_statements).
+_USER_COLUMNS = "id, username, email, hashed_password, role"
+_ITEM_COLUMNS = "id, name, owner_id, description, version"
+
+_SELECT_USER_BY_ID = f"SELECT {_USER_COLUMNS} FROM users WHERE id = ?"
+_SELECT_USER_BY_USERNAME = f"SELECT {_USER_COLUMNS} FROM users WHERE username = ?"
+_SELECT_USER_BY_EMAIL = f"SELECT {_USER_COLUMNS} FROM users WHERE email_key = ?"
+_INSERT_USER = (
+    "INSERT INTO users (username, email, email_key, hashed_password, role) "
+    "VALUES (?, ?, ?, ?, ?)"
+)
+
+_SELECT_ITEM_BY_ID = f"SELECT {_ITEM_COLUMNS} FROM items WHERE id = ?"
+_SELECT_ITEMS = f"SELECT {_ITEM_COLUMNS} FROM items WHERE id > ? ORDER BY id LIMIT ? OFFSET ?"
+_SELECT_ITEMS_BY_OWNER = (
+    f"SELECT {_ITEM_COLUMNS} FROM items WHERE owner_id = ? AND id > ? "
+    "ORDER BY id LIMIT ? OFFSET ?"
+)
+_INSERT_ITEM = "INSERT INTO items (name, owner_id, description) VALUES (?, ?, ?)"
+_UPDATE_ITEM = (
+    "UPDATE items SET name = COALESCE(?, name), description = COALESCE(?, description), "
+    f"version = version + 1 WHERE id = ? RETURNING {_ITEM_COLUMNS}"
+)
+_DELETE_ITEM = "DELETE FROM items WHERE id = ?"
+# Compare-and-set: изменение только при совпадении версии
+_UPDATE_ITEM_IF_VERSION = (
+    "UPDATE items SET name = COALESCE(?, name), description = COALESCE(?, description), "
+    f"version = version + 1 WHERE id = ? AND version = ? RETURNING {_ITEM_COLUMNS}"
+)
+_DELETE_ITEM_IF_VERSION = "DELETE FROM items WHERE id = ? AND version = ?"
+_SELECT_ITEM_VERSION = "SELECT version FROM items WHERE id = ?"
+_SELECT_GENERATION = "SELECT value FROM item_generations WHERE owner_id = ?"
+_SELECT_COUNT = "SELECT value FROM item_counts WHERE owner_id = ?"
+# Обход items_fts в порядке rowid: LIMIT останавливает его на первых совпадениях
+_SEARCH_FROM = (
+    "SELECT items.id, items.name, items.owner_id, items.description, items.version "
+    "FROM items_fts JOIN items ON items.id = items_fts.rowid WHERE items_fts MATCH ?"
+)
+_SEARCH_ITEMS = f"{_SEARCH_FROM} ORDER BY items_fts.rowid LIMIT ?"
+_SEARCH_ITEMS_BY_OWNER = f"{_SEARCH_FROM} AND items.owner_id = ? ORDER BY items_fts.rowid LIMIT ?"
+_INSERT_REVOKED_TOKEN = "INSERT OR IGNORE INTO revoked_tokens (jti, expires_at) VALUES (?, ?)"
+_DELETE_EXPIRED_TOKENS = "DELETE FROM revoked_tokens WHERE expires_at <= ?"
+_SELECT_REVOKED_TOKENS = (
+    "SELECT seq, jti, expires_at FROM revoked_tokens WHERE seq > ? ORDER BY seq"
+)
+_INSERT_SESSION = (
+    "INSERT INTO refresh_sessions (id, user_id, digest, expires_at) VALUES (?, ?, ?, ?)"
+)
+_DELETE_EXPIRED_SESSIONS = "DELETE FROM refresh_sessions WHERE expires_at <= ?"
+_SELECT_SESSION = "SELECT user_id, digest, expires_at FROM refresh_sessions WHERE id = ?"
+_UPDATE_SESSION = "UPDATE refresh_sessions SET digest = ?, expires_at = ? WHERE id = ?"
+_DELETE_SESSION = "DELETE FROM refresh_sessions WHERE id = ?"
+_HAS_FTS = "SELECT 1 FROM sqlite_master WHERE name = 'items_fts'"
+# Первичное заполнение полнотекстового индекса (база без items_fts)
+_FILL_FTS = "INSERT INTO items_fts (items_fts) VALUES ('rebuild')"
+# Первичное заполнение счётчиков (новая база или база без item_counts)
+_FILL_COUNTS = (
+    "INSERT OR REPLACE INTO item_counts (owner_id, value) "
+    "SELECT owner_id, COUNT(*) FROM items GROUP BY owner_id",
+    "INSERT OR REPLACE INTO item_counts (owner_id, value) VALUES "
+    "(0, (SELECT COUNT(*) FROM items)), (-1, (SELECT COUNT(DISTINCT owner_id) FROM items))",
+)
+
+DEFAULT_POOL_SIZE = 4
+STATEMENT_CACHE_SIZE = 64
+
+
+def _row_to_user(row) -> Optional[User]:
+    if row is None:
+        return None
+    return User(id=row[0], username=row[1], email=row[2], hashed_password=row[3], role=row[4])
+
+
+def _row_to_item(row) -> Optional[Item]:
+    if row is None:
+        return None
+    return Item(id=row[0], name=row[1], owner_id=row[2], description=row[3], version=row[4])
+
+
+def _match_expression(query: str) -> Optional[str]:
+    """Запрос FTS5: все слова, кроме последнего, точные, последнее — префикс."""
+    terms = tokenize(query)
+    if not terms:
+        return None
+    # Токены — только буквы, цифры и _, кавычки в них не встречаются
+    return " ".join(f'"{term}"' for term in terms) + "*"
+
+
+def _raise_if_other_version(conn: sqlite3.Connection, item_id: int, expected_version: int) -> None:
+    """После неудачного compare-and-set отличить конфликт версий от отсутствия item."""
+    row = conn.execute(_SELECT_ITEM_VERSION, (item_id,)).fetchone()
+    if row is not None:
+        raise VersionConflictError(
+            f"Item {item_id} has version {row[0]}, expected {expected_version}"
+        )
+
+
+class SQLiteStorage(StorageEngine):
+    """Хранилище в файле SQLite.
+
+    WAL-журнал позволяет читателям не блокировать писателя. Соединения
+    берутся из небольшого пула (по одному на одновременную операцию),
+    каждое выражение выполняется в режиме autocommit. Поиск items идёт
+    по индексу FTS5 в той же базе.
+    """
+
+    blocking = True
+    # Файл базы может быть открыт несколькими воркерами
+    multi_process = True
+    full_text_search = True
+    # Настройки соединения, переопределяются в подклассах
+    synchronous = "NORMAL"
+    mmap_size = 0
+
+    def __init__(self, path: str, pool_size: int = DEFAULT_POOL_SIZE, timeout: float = 5.0):
+        self.path = path
+        self._timeout = timeout
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self._pool: "queue.LifoQueue[sqlite3.Connection]" = queue.LifoQueue(maxsize=pool_size)
+        for _ in range(pool_size):
+            self._pool.put(self._connect())
+        with self._connection() as conn:
+            has_fts = conn.execute(_HAS_FTS).fetchone() is not None
+            conn.executescript(_SCHEMA)
+            if not has_fts:
+                # База, созданная до появления полнотекстового индекса
+                conn.execute(_FILL_FTS)
+            columns = {row[1] for row in conn.execute("PRAGMA table_info(items)")}
+            if "version" not in columns:
+                # База, созданная до появления версий items
+                conn.execute("ALTER TABLE items ADD COLUMN version INTEGER NOT NULL DEFAULT 1")
+            self.epoch = conn.execute("SELECT value FROM meta WHERE key = 'epoch'").fetchone()[0]
+        with self._transaction() as conn:
+            # Строку -1 создаёт только заполнение (триггеры её лишь обновляют)
+            if conn.execute(_SELECT_COUNT, (-1,)).fetchone() is None:
+                # Один обход при создании счётчиков, дальше их ведут триггеры
+                for statement in _FILL_COUNTS:
+                    conn.execute(statement)
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(
+            self.path,
+            timeout=self._timeout,
+            isolation_level=None,
+            check_same_thread=False,
+            cached_statements=STATEMENT_CACHE_SIZE,
+        )
+        conn.execute("PRAGMA journal_mode=WAL")
+        # В WAL-режиме NORMAL безопасен при сбое процесса
+        conn.execute(f"PRAGMA synchronous={self.synchronous}")
+        if self.mmap_size:
+            conn.execute(f"PRAGMA mmap_size={int(self.mmap_size)}")
+        return conn
+
+    @contextmanager
+    def _connection(self) -> Iterator[sqlite3.Connection]:
+        """Взять соединение из пула на время операции."""
+        conn = self._pool.get(timeout=self._timeout)
+        try:
+            yield conn
+        finally:
+            self._pool.put(conn)
+
+    @contextmanager
+    def _transaction(self) -> Iterator[sqlite3.Connection]:
+        """Соединение с открытой транзакцией записи (одна фиксация на пакет)."""
+        with self._connection() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield conn
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+            conn.execute("COMMIT")
+
+    def get_user_by_id(self, user_id: int) -> Optional[User]:
+        with self._connection() as conn:
+            return _row_to_user(conn.execute(_SELECT_USER_BY_ID, (user_id,)).fetchone())
+
+    def get_user_by_username(self, username: str) -> Optional[User]:
+        with self._connection() as conn:
+            return _row_to_user(conn.execute(_SELECT_USER_BY_USERNAME, (username,)).fetchone())
+
+    def get_user_by_email(self, email: str) -> Optional[User]:
+        with self._connection() as conn:
+            row = conn.execute(_SELECT_USER_BY_EMAIL, (normalize_email(email),)).fetchone()
+            return _row_to_user(row)
+
+    def create_user(
+        self, username: str, email: str, hashed_password: str, role: str = "user"
+    ) -> User:
+        params = (username, email, normalize_email(email), hashed_password, role)
+        with self._connection() as conn:
+            try:
+                cursor = conn.execute(_INSERT_USER, params)
+            except sqlite3.IntegrityError as e:
+                if "username" in str(e):
+                    raise ValueError("Username already registered") from e
+                raise ValueError("Email already registered") from e
+        return User(
+            id=cursor.lastrowid,
+            username=username,
+            email=email,
+            hashed_password=hashed_password,
+            role=role,
+        )
+
+    def get_item_by_id(self, item_id: int) -> Optional[Item]:
+        with self._connection() as conn:
+            return _row_to_item(conn.execute(_SELECT_ITEM_BY_ID, (item_id,)).fetchone())
+
+    def get_items(
+        self,
+        owner_id: Optional[int] = None,
+        limit: int = 10,
+        offset: int = 0,
+        after_id: Optional[int] = None,
+    ) -> List[Item]:
+        after = after_id if after_id is not None else 0
+        with self._connection() as conn:
+            if owner_id is None:
+                rows = conn.execute(_SELECT_ITEMS, (after, limit, offset)).fetchall()
+            else:
+                rows = conn.execute(
+                    _SELECT_ITEMS_BY_OWNER, (owner_id, after, limit, offset)
+                ).fetchall()
+        return [_row_to_item(row) for row in rows]
+
+    def create_item(self, name: str, owner_id: int, description: Optional[str] = None) -> Item:
+        with self._connection() as conn:
+            cursor = conn.execute(_INSERT_ITEM, (name, owner_id, description))
+        return Item(id=cursor.lastrowid, name=name, owner_id=owner_id, description=description)
+
+    def update_item(
+        self,
+        item_id: int,
+        name: Optional[str] = None,
+        description: Optional[str] = None,
+        expected_version: Optional[int] = None,
+    ) -> Optional[Item]:
+        with self._connection() as conn:
+            if expected_version is None:
+                rows = conn.execute(_UPDATE_ITEM, (name, description, item_id)).fetchall()
+            else:
+                params = (name, description, item_id, expected_version)
+                rows = conn.execute(_UPDATE_ITEM_IF_VERSION, params).fetchall()
+                if not rows:
+                    _raise_if_other_version(conn, item_id, expected_version)
+        return _row_to_item(rows[0]) if rows else None
+
+    def delete_item(self, item_id: int, expected_version: Optional[int] = None) -> bool:
+        with self._connection() as conn:
+            if expected_version is None:
+                return conn.execute(_DELETE_ITEM, (item_id,)).rowcount > 0
+            if conn.execute(_DELETE_ITEM_IF_VERSION, (item_id, expected_version)).rowcount:
+                return True
+            _raise_if_other_version(conn, item_id, expected_version)
+            return False
+
+    def get_items_generation(self, owner_id: Optional[int] = None) -> int:
+        with self._connection() as conn:
+            row = conn.execute(_SELECT_GENERATION, (owner_id or 0,)).fetchone()
+        return row[0] if row else 0
+
+    def count_items(self, owner_id: Optional[int] = None) -> int:
+        with self._connection() as conn:
+            row = conn.execute(_SELECT_COUNT, (owner_id or 0,)).fetchone()
+        return row[0] if row else 0
+
+    def count_item_owners(self) -> int:
+        with self._connection() as conn:
+            row = conn.execute(_SELECT_COUNT, (-1,)).fetchone()
+        return row[0] if row else 0
+
+    def get_items_by_ids(self, item_ids: Sequence[int]) -> List[Optional[Item]]:
+        if not item_ids:
+            return []
+        placeholders = ", ".join("?" * len(item_ids))
+        query = f"SELECT {_ITEM_COLUMNS} FROM items WHERE id IN ({placeholders})"
+        with self._connection() as conn:
+            found = {row[0]: _row_to_item(row) for row in conn.execute(query, tuple(item_ids))}
+        return [found.get(item_id) for item_id in item_ids]
+
+    def search_items(
+        self, query: str, owner_id: Optional[int] = None, limit: int = 10
+    ) -> List[Item]:
+        expression = _match_expression(query)
+        if expression is None:
+            return []
+        with self._connection() as conn:
+            if owner_id is None:
+                rows = conn.execute(_SEARCH_ITEMS, (expression, limit)).fetchall()
+            else:
+                rows = conn.execute(
+                    _SEARCH_ITEMS_BY_OWNER, (expression, owner_id, limit)
+                ).fetchall()
+        return [_row_to_item(row) for row in rows]
+
+    # ========== Состояние аутентификации, общее для воркеров ==========
+
+    def revoke_token(self, jti: str, expires_at: float) -> None:
+        """Записать отзыв jti до expires_at; заодно удалить истёкшие отзывы."""
+        with self._transaction() as conn:
+            conn.execute(_DELETE_EXPIRED_TOKENS, (time.time(),))
+            conn.execute(_INSERT_REVOKED_TOKEN, (jti, expires_at))
+
+    def get_revoked_tokens(self, after_seq: int = 0) -> List[Tuple[int, str, float]]:
+        """Отзывы, записанные после after_seq: (seq, jti, expires_at) по возрастанию seq."""
+        with self._connection() as conn:
+            return conn.execute(_SELECT_REVOKED_TOKENS, (after_seq,)).fetchall()
+
+    def create_session(
+        self, session_id: str, user_id: int, digest: bytes, expires_at: float
+    ) -> None:
+        """Открыть сессию refresh-токена; заодно удалить истёкшие сессии."""
+        with self._transaction() as conn:
+            conn.execute(_DELETE_EXPIRED_SESSIONS, (time.time(),))
+            conn.execute(_INSERT_SESSION, (session_id, user_id, digest, expires_at))
+
+    def rotate_session(
+        self, session_id: str, digest: bytes, new_digest: bytes, expires_at: float
+    ) -> Optional[int]:
+        """Заменить секрет сессии, если digest текущий: user_id или None.
+
+        Неверный digest живой сессии — повтор заменённого токена: сессия
+        удаляется целиком.
+        """
+        with self._transaction() as conn:
+            row = conn.execute(_SELECT_SESSION, (session_id,)).fetchone()
+            if row is None or row[2] <= time.time():
+                return None
+            if not hmac.compare_digest(row[1], digest):
+                conn.execute(_DELETE_SESSION, (session_id,))
+                return None
+            conn.execute(_UPDATE_SESSION, (new_digest, expires_at, session_id))
+            return row[0]
+
+    def delete_session(self, session_id: str, digest: bytes) -> bool:
+        """Закрыть сессию, если digest текущий (logout)."""
+        with self._transaction() as conn:
+            row = conn.execute(_SELECT_SESSION, (session_id,)).fetchone()
+            if row is None or not hmac.compare_digest(row[1], digest):
+                return False
+            conn.execute(_DELETE_SESSION, (session_id,))
+            return True
+
+    def create_items(self, entries: Sequence[Tuple[str, int, Optional[str]]]) -> List[Item]:
+        items = []
+        with self._transaction() as conn:
+            for name, owner_id, description in entries:
+                cursor = conn.execute(_INSERT_ITEM, (name, owner_id, description))
+                items.append(
+                    Item(id=cursor.lastrowid, name=name, owner_id=owner_id, description=description)
+                )
+        return items
+
+    def update_items(
+        self, updates: Sequence[Tuple[int, Optional[str], Optional[str]]]
+    ) -> List[Optional[Item]]:
+        results = []
+        with self._transaction() as conn:
+            for item_id, name, description in updates:
+                rows = conn.execute(_UPDATE_ITEM, (name, description, item_id)).fetchall()
+                results.append(_row_to_item(rows[0]) if rows else None)
+        return results
+
+    def delete_items(self, item_ids: Sequence[int]) -> List[bool]:
+        with self._transaction() as conn:
+            return [conn.execute(_DELETE_ITEM, (item_id,)).rowcount > 0 for item_id in item_ids]
+
+    def close(self) -> None:
+        while True:
+            try:
+                conn = self._pool.get_nowait()
+            except queue.Empty:
+                break
+            conn.close()
@@ -0,0 +1,103 @@
+"""Бенчмарк пакетных эндпойнтов items против поштучных запросов.
+
+Сравнивает items/sec при создании, обновлении и удалении через
+POST/PATCH/DELETE /api/v1/items и через /api/v1/items:batch
+(через TestClient) на движках memory и SQLite.
+
+Запуск:
+    python benchmarks/bench_batch_items.py
+"""
+
+import logging
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]  # корень репозитория
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from fastapi.testclient import TestClient  # noqa: E402
+
+from app import database  # noqa: E402
+from app.main import app  # noqa: E402
+from app.security.auth import create_access_token  # noqa: E402
+from app.storage.memory import MemoryStorage  # noqa: E402
+from app.storage.sqlite import SQLiteStorage  # noqa: E402
+
+ITEMS = 2_000
+BATCH_SIZE = 200
+
+
+def _rate(fn) -> float:
+    start = time.perf_counter()
+    fn()
+    return ITEMS / (time.perf_counter() - start)
+
+
+def _bench(client: TestClient, headers: dict) -> dict:
+    ids = []
+
+    def single_create():
+        for i in range(ITEMS):
+            r = client.post("/api/v1/items", json={"name": f"single {i}"}, headers=headers)
+            ids.append(r.json()["id"])
+
+    def single_update():
+        for item_id in ids:
+            client.patch(f"/api/v1/items/{item_id}", json={"name": "renamed"}, headers=headers)
+
+    def single_delete():
+        for item_id in ids:
+            client.delete(f"/api/v1/items/{item_id}", headers=headers)
+
+    batch_ids = []
+
+    def batch_create():
+        for start in range(0, ITEMS, BATCH_SIZE):
+            entries = [{"name": f"batch {i}"} for i in range(start, start + BATCH_SIZE)]
+            r = client.post("/api/v1/items:batch", json={"items": entries}, headers=headers)
+            batch_ids.extend(res["id"] for res in r.json()["results"])
+
+    def batch_update():
+        for start in range(0, ITEMS, BATCH_SIZE):
+            entries = [{"id": i, "name": "renamed"} for i in batch_ids[start : start + BATCH_SIZE]]
+            client.patch("/api/v1/items:batch", json={"items": entries}, headers=headers)
+
+    def batch_delete():
+        for start in range(0, ITEMS, BATCH_SIZE):
+            chunk = batch_ids[start : start + BATCH_SIZE]
+            client.request("DELETE", "/api/v1/items:batch", json={"ids": chunk}, headers=headers)
+
+    return {
+        "create": (_rate(single_create), _rate(batch_create)),
+        "update": (_rate(single_update), _rate(batch_update)),
+        "delete": (_rate(single_delete), _rate(batch_delete)),
+    }
+
+
+def main() -> None:
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+    client = TestClient(app)
+    with tempfile.TemporaryDirectory() as tmp:
+        engines = {
+            "memory": MemoryStorage(),
+            "sqlite": SQLiteStorage(str(Path(tmp) / "bench.db")),
+        }
+        print(f"{'engine':<8} {'op':<8} {'single, items/s':>16} {'batch, items/s':>16} {'x':>6}")
+        for name, engine in engines.items():
+            user = engine.create_user("bench", "bench@example.com", "x")
+            headers = {"Authorization": f"Bearer {create_access_token({'sub': str(user.id)})}"}
+            previous = database.set_engine(engine)
+            try:
+                results = _bench(client, headers)
+            finally:
+                database.set_engine(previous)
+                engine.close()
+            for op, (single, batch) in results.items():
+                print(f"{name:<8} {op:<8} {single:>16,.0f} {batch:>16,.0f} {batch / single:>6.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""Стоимость публикации в ленту изменений при тысячах подписчиков SSE.
+
+Подписчики (по одному на соединение, как в GET /api/v1/items/changes)
+ждут событий своих владельцев. События публикуются для одного
+«горячего» владельца; измеряется время публикации и доставки всех
+событий его подписчику при разном числе простаивающих подписчиков
+других владельцев.
+
+Запуск:
+    python benchmarks/bench_change_feed.py
+"""
+
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]  # корень репозитория
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from app.changes import ChangeFeed  # noqa: E402
+
+EVENTS = 20_000
+IDLE_COUNTS = (0, 1_000, 10_000)
+HOT_OWNER = 0
+
+
+async def _consume(feed: ChangeFeed, owner_id: int, expected: int) -> None:
+    received = 0
+    async for _ in feed.stream(owner_id, after_seq=0):
+        received += 1
+        if received == expected:
+            return
+
+
+async def _measure(idle: int) -> float:
+    """Событий в секунду (публикация + доставка горячему подписчику)."""
+    feed = ChangeFeed(capacity=EVENTS)
+    idle_tasks = [
+        asyncio.create_task(_consume(feed, owner_id, 1)) for owner_id in range(1, idle + 1)
+    ]
+    hot = asyncio.create_task(_consume(feed, HOT_OWNER, EVENTS))
+    await asyncio.sleep(0.1)  # все подписчики ждут событий
+
+    start = time.perf_counter()
+    for n in range(EVENTS):
+        feed.publish("update", HOT_OWNER, {"id": n, "name": "item"})
+        if n % 100 == 0:
+            await asyncio.sleep(0)  # дать подписчику забрать события
+    await hot
+    elapsed = time.perf_counter() - start
+
+    for task in idle_tasks:
+        task.cancel()
+    await asyncio.gather(*idle_tasks, return_exceptions=True)
+    return EVENTS / elapsed
+
+
+def main() -> None:
+    print(f"{'idle subscribers':>17} {'events/s':>12}")
+    for idle in IDLE_COUNTS:
+        print(f"{idle:>17,} {asyncio.run(_measure(idle)):>12,.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""Масштабирование записи в MemoryStorage по числу потоков.
+
+Каждый поток создаёт, обновляет и удаляет items своего владельца
+(разные полосы блокировок). Для сравнения тот же сценарий прогоняется
+с одной глобальной блокировкой вокруг каждой операции.
+
+Запуск:
+    python benchmarks/bench_concurrent_writes.py
+"""
+
+import sys
+import threading
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]  # корень репозитория
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from app.storage.memory import MemoryStorage  # noqa: E402
+
+OPS_PER_THREAD = 50_000
+THREAD_COUNTS = (1, 2, 4, 8)
+
+
+class GlobalLockStorage(MemoryStorage):
+    """MemoryStorage с одной блокировкой на все записи (базовая линия)."""
+
+    def __init__(self):
+        super().__init__()
+        self._global = threading.Lock()
+
+    def create_item(self, *args, **kwargs):
+        with self._global:
+            return super().create_item(*args, **kwargs)
+
+    def update_item(self, *args, **kwargs):
+        with self._global:
+            return super().update_item(*args, **kwargs)
+
+    def delete_item(self, *args, **kwargs):
+        with self._global:
+            return super().delete_item(*args, **kwargs)
+
+
+def _run(storage, threads: int) -> float:
+    """Выполнить сценарий, вернуть операций записи в секунду."""
+
+    def work(owner_id):
+        for i in range(OPS_PER_THREAD // 3):
+            item = storage.create_item(f"item{i}", owner_id=owner_id)
+            storage.update_item(item.id, name="renamed")
+            storage.delete_item(item.id)
+
+    workers = [threading.Thread(target=work, args=(n + 1,)) for n in range(threads)]
+    start = time.perf_counter()
+    for t in workers:
+        t.start()
+    for t in workers:
+        t.join()
+    return threads * (OPS_PER_THREAD // 3) * 3 / (time.perf_counter() - start)
+
+
+def main() -> None:
+    print(f"{'threads':>8} {'striped, ops/s':>16} {'global lock, ops/s':>20}")
+    for threads in THREAD_COUNTS:
+        striped = _run(MemoryStorage(), threads)
+        global_lock = _run(GlobalLockStorage(), threads)
+        print(f"{threads:>8} {striped:>16,.0f} {global_lock:>20,.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""Бенчмарк пагинации GET /api/v1/items: страница 1 против страницы 10 000.
+
+Сравнивает режимы limit/offset и keyset-курсор на уровне хранилища
+и через HTTP (TestClient) для пользователя со 100k items.
+
+Запуск:
+    python benchmarks/bench_cursor_pagination.py
+"""
+
+import logging
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]  # корень репозитория
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from fastapi.testclient import TestClient  # noqa: E402
+
+from app import database  # noqa: E402
+from app.api.v1.items import encode_cursor  # noqa: E402
+from app.main import app  # noqa: E402
+from app.security.auth import create_access_token  # noqa: E402
+
+LIMIT = 10
+DEEP_PAGE = 10_000
+STORE_REPEAT = 50_000
+HTTP_REPEAT = 500
+
+
+def _time(fn, repeat: int) -> float:
+    """Среднее время вызова fn в микросекундах."""
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - start) / repeat * 1e6
+
+
+def main() -> None:
+    user = database.create_user(
+        username="bench_cursor", email="bench_cursor@example.com", hashed_password="x"
+    )
+    ids = [
+        database.create_item(name=f"item{i}", owner_id=user.id).id for i in range(LIMIT * DEEP_PAGE)
+    ]
+    deep_offset = LIMIT * (DEEP_PAGE - 1)
+    deep_after = ids[deep_offset - 1]
+
+    print("store (us/page):")
+    cases = {
+        "offset, page 1": dict(offset=0),
+        f"offset, page {DEEP_PAGE}": dict(offset=deep_offset),
+        "cursor, page 1": dict(after_id=0),
+        f"cursor, page {DEEP_PAGE}": dict(after_id=deep_after),
+    }
+    for name, kwargs in cases.items():
+        cost = _time(
+            lambda: database.get_items(owner_id=user.id, limit=LIMIT, **kwargs), STORE_REPEAT
+        )
+        print(f"  {name:<20} {cost:>10.3f}")
+
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+    client = TestClient(app)
+    headers = {"Authorization": f"Bearer {create_access_token({'sub': str(user.id)})}"}
+    print("http (us/request):")
+    urls = {
+        "offset, page 1": f"/api/v1/items?limit={LIMIT}",
+        f"offset, page {DEEP_PAGE}": f"/api/v1/items?limit={LIMIT}&offset={deep_offset}",
+        f"cursor, page {DEEP_PAGE}": (
+            f"/api/v1/items?limit={LIMIT}&cursor={encode_cursor(deep_after)}"
+        ),
+    }
+    for name, url in urls.items():
+        cost = _time(lambda: client.get(url, headers=headers), HTTP_REPEAT)
+        print(f"  {name:<20} {cost:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""Условный GET (If-None-Match -> 304) против полного ответа.
+
+Сравнивает время запроса GET /api/v1/items/{id} и страницы
+GET /api/v1/items?limit=100 с совпадающим ETag (304 без тела) и без
+него (200 с сериализацией ItemResponse) через TestClient на движках
+memory и SQLite.
+
+Запуск:
+    python benchmarks/bench_etag.py
+"""
+
+import logging
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]  # корень репозитория
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from fastapi.testclient import TestClient  # noqa: E402
+
+from app import database  # noqa: E402
+from app.main import app  # noqa: E402
+from app.security.auth import create_access_token  # noqa: E402
+from app.storage.memory import MemoryStorage  # noqa: E402
+from app.storage.sqlite import SQLiteStorage  # noqa: E402
+
+ITEMS = 1_000
+REPEAT = 1_000
+
+
+def _time(client: TestClient, url: str, headers: dict) -> float:
+    """Среднее время запроса в микросекундах."""
+    start = time.perf_counter()
+    for _ in range(REPEAT):
+        client.get(url, headers=headers)
+    return (time.perf_counter() - start) / REPEAT * 1e6
+
+
+def main() -> None:
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+    client = TestClient(app)
+    with tempfile.TemporaryDirectory() as tmp:
+        engines = {
+            "memory": MemoryStorage(),
+            "sqlite": SQLiteStorage(str(Path(tmp) / "bench.db")),
+        }
+        print(f"{'engine':<8} {'request':<10} {'200, us':>10} {'304, us':>10} {'x':>6}")
+        for name, engine in engines.items():
+            user = engine.create_user("bench", "bench@example.com", "x")
+            items = engine.create_items(
+                [(f"item {i}", user.id, "description " * 10) for i in range(ITEMS)]
+            )
+            headers = {"Authorization": f"Bearer {create_access_token({'sub': str(user.id)})}"}
+            previous = database.set_engine(engine)
+            try:
+                for label, url in (
+                    ("item", f"/api/v1/items/{items[0].id}"),
+                    ("page 100", "/api/v1/items?limit=100"),
+                ):
+                    etag = client.get(url, headers=headers).headers["ETag"]
+                    full = _time(client, url, headers)
+                    cached = _time(client, url, {**headers, "If-None-Match": etag})
+                    print(
+                        f"{name:<8} {label:<10} {full:>10.0f} {cached:>10.0f} {full / cached:>6.1f}"
+                    )
+            finally:
+                database.set_engine(previous)
+                engine.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+"""Скорость выгрузки GET /api/v1/items/export (NDJSON) на 1M items.
+
+Читает поток ответа приложения ASGI без сети на движках memory и SQLite и
+печатает объём, время, МБ/с и прирост пикового RSS процесса за время
+выгрузки (память не должна зависеть от числа items).
+
+Запуск:
+    python benchmarks/bench_export.py [число items]
+"""
+
+import asyncio
+import resource
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]  # корень репозитория
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from app import database  # noqa: E402
+from app.main import app  # noqa: E402
+from app.security.auth import create_access_token  # noqa: E402
+from app.storage.memory import MemoryStorage  # noqa: E402
+from app.storage.sqlite import SQLiteStorage  # noqa: E402
+
+ITEMS = 1_000_000
+CHUNK = 100_000
+
+
+async def _export(token: str) -> int:
+    """Прочитать выгрузку целиком через ASGI, вернуть число байт тела.
+
+    Приложение вызывается напрямую: httpx.ASGITransport собирает тело
+    ответа в памяти целиком и исказил бы замер памяти.
+    """
+    size = 0
+    requested = False
+
+    async def receive():
+        nonlocal requested
+        if requested:
+            await asyncio.Event().wait()  # клиент не отключается
+        requested = True
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        nonlocal size
+        if message["type"] == "http.response.start":
+            assert message["status"] == 200, message
+        elif message["type"] == "http.response.body":
+            size += len(message.get("body", b""))
+
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": "/api/v1/items/export",
+        "raw_path": b"/api/v1/items/export",
+        "root_path": "",
+        "query_string": b"",
+        "headers": [(b"host", b"bench"), (b"authorization", f"Bearer {token}".encode())],
+        "client": ("bench", 50000),
+        "server": ("bench", 80),
+    }
+    await app(scope, receive, send)
+    return size
+
+
+def _max_rss_mb() -> float:
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def main() -> None:
+    items = int(sys.argv[1]) if len(sys.argv) > 1 else ITEMS
+    with tempfile.TemporaryDirectory() as tmp:
+        engines = {
+            "memory": MemoryStorage(),
+            "sqlite": SQLiteStorage(str(Path(tmp) / "bench.db")),
+        }
+        print(f"{'engine':<8} {'items':>10} {'MB':>8} {'s':>7} {'MB/s':>7} {'+RSS, MB':>9}")
+        for name, engine in engines.items():
+            admin = engine.create_user("bench", "bench@example.com", "x", "admin")
+            for start in range(0, items, CHUNK):
+                engine.create_items(
+                    [
+                        (f"item {n}", admin.id, "description of item " * 3)
+                        for n in range(start, min(start + CHUNK, items))
+                    ]
+                )
+            token = create_access_token({"sub": str(admin.id)})
+            previous = database.set_engine(engine)
+            try:
+                rss = _max_rss_mb()
+                started = time.perf_counter()
+                size = asyncio.run(_export(token))
+                elapsed = time.perf_counter() - started
+                megabytes = size / 1e6
+                print(
+                    f"{name:<8} {items:>10,} {megabytes:>8.1f} {elapsed:>7.2f} "
+                    f"{megabytes / elapsed:>7.1f} {_max_rss_mb() - rss:>9.1f}"
+                )
+            finally:
+                database.set_engine(previous)
+                engine.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,133 @@
+"""Скорость загрузки POST /api/v1/items/import (NDJSON) против POST на строку.
+
+Отправляет тело NDJSON блоками по 64 КБ прямо в приложение ASGI (без
+сети и без сборки тела в памяти) на движках memory и SQLite и печатает
+строк в секунду. Для сравнения — строк в секунду при создании items по
+одному запросом POST /api/v1/items.
+
+Запуск:
+    python benchmarks/bench_import.py [число строк]
+"""
+
+import asyncio
+import json
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]  # корень репозитория
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from app import database  # noqa: E402
+from app.main import app  # noqa: E402
+from app.security.auth import create_access_token  # noqa: E402
+from app.storage.memory import MemoryStorage  # noqa: E402
+from app.storage.sqlite import SQLiteStorage  # noqa: E402
+
+ROWS = 1_000_000
+SINGLE_ROWS = 2_000
+BODY_CHUNK = 64 * 1024
+
+
+def _body_chunks(rows: int):
+    """Тело NDJSON блоками по BODY_CHUNK, генерируется лениво."""
+    buffer = []
+    size = 0
+    for n in range(rows):
+        line = json.dumps({"name": f"item {n}", "description": "description of item " * 3})
+        buffer.append(line)
+        size += len(line) + 1
+        if size >= BODY_CHUNK:
+            yield ("\n".join(buffer) + "\n").encode()
+            buffer, size = [], 0
+    if buffer:
+        yield ("\n".join(buffer) + "\n").encode()
+
+
+async def _request(method: str, path: str, token: str, chunks) -> tuple:
+    """Выполнить запрос к приложению ASGI, вернуть (статус, тело)."""
+    chunks = iter(chunks)
+    pending = next(chunks, b"")
+    done = False
+    status = 0
+    body = bytearray()
+
+    async def receive():
+        nonlocal pending, done
+        if done:
+            await asyncio.Event().wait()  # клиент не отключается
+        following = next(chunks, None)
+        message = {"type": "http.request", "body": pending, "more_body": following is not None}
+        pending, done = following, following is None
+        return message
+
+    async def send(message):
+        nonlocal status
+        if message["type"] == "http.response.start":
+            status = message["status"]
+        elif message["type"] == "http.response.body":
+            body.extend(message.get("body", b""))
+
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": method,
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "root_path": "",
+        "query_string": b"",
+        "headers": [
+            (b"host", b"bench"),
+            (b"authorization", f"Bearer {token}".encode()),
+            (b"content-type", b"application/json"),
+        ],
+        "client": ("bench", 50000),
+        "server": ("bench", 80),
+    }
+    await app(scope, receive, send)
+    return status, bytes(body)
+
+
+async def _single_posts(token: str) -> None:
+    for n in range(SINGLE_ROWS):
+        body = json.dumps({"name": f"single {n}", "description": "description"}).encode()
+        status, _ = await _request("POST", "/api/v1/items", token, [body])
+        assert status == 201
+
+
+def main() -> None:
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else ROWS
+    with tempfile.TemporaryDirectory() as tmp:
+        engines = {
+            "memory": MemoryStorage(),
+            "sqlite": SQLiteStorage(str(Path(tmp) / "bench.db")),
+        }
+        print(f"{'engine':<8} {'rows':>10} {'import rows/s':>14} {'POST rows/s':>12}")
+        for name, engine in engines.items():
+            admin = engine.create_user("bench", "bench@example.com", "x", "admin")
+            token = create_access_token({"sub": str(admin.id)})
+            previous = database.set_engine(engine)
+            try:
+                started = time.perf_counter()
+                asyncio.run(_single_posts(token))
+                single = SINGLE_ROWS / (time.perf_counter() - started)
+
+                started = time.perf_counter()
+                status, body = asyncio.run(
+                    _request("POST", "/api/v1/items/import", token, _body_chunks(rows))
+                )
+                elapsed = time.perf_counter() - started
+                result = json.loads(body)
+                assert status == 200 and result["created"] == rows, result
+                print(f"{name:<8} {rows:>10,} {rows / elapsed:>14,.0f} {single:>12,.0f}")
+            finally:
+                database.set_engine(previous)
+                engine.close()
+
+
+if __name__ == "__main__":
+    main()
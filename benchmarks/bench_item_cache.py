@@ -0,0 +1,107 @@
+"""Кэш ответов GET /api/v1/items/{id}: попадание в кэш против чтения из хранилища.
+
+Читает случайные items (ITEMS штук одного владельца) с включённым и
+выключенным кэшем на движках memory и SQLite: целиком через ASGI без
+сети (вместе с аутентификацией и middleware) и вызовом обработчика
+маршрута напрямую. Печатает среднее время запроса и долю попаданий.
+
+Запуск:
+    python benchmarks/bench_item_cache.py
+"""
+
+import asyncio
+import logging
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]  # корень репозитория
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+import httpx  # noqa: E402
+from starlette.requests import Request  # noqa: E402
+
+from app import database  # noqa: E402
+from app.api.v1.items import get_item_endpoint  # noqa: E402
+from app.main import app  # noqa: E402
+from app.security.auth import create_access_token  # noqa: E402
+from app.storage.memory import MemoryStorage  # noqa: E402
+from app.storage.sqlite import SQLiteStorage  # noqa: E402
+
+ITEMS = 1_000
+REQUESTS = 5_000
+
+
+async def _time_handler(ids: list, user) -> float:
+    """Среднее время вызова обработчика маршрута в микросекундах."""
+    request = Request({"type": "http", "headers": []})
+    for item_id in set(ids):  # прогрев
+        await get_item_endpoint(request, item_id, None, user)
+    start = time.perf_counter()
+    for item_id in ids:
+        await get_item_endpoint(request, item_id, None, user)
+    return (time.perf_counter() - start) / len(ids) * 1e6
+
+
+async def _time(ids: list, headers: dict) -> tuple:
+    """Среднее время запроса в микросекундах и доля попаданий в кэш."""
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        for item_id in set(ids):  # прогрев
+            await client.get(f"/api/v1/items/{item_id}", headers=headers)
+        before = database.item_cache.stats()
+        start = time.perf_counter()
+        for item_id in ids:
+            await client.get(f"/api/v1/items/{item_id}", headers=headers)
+        elapsed = (time.perf_counter() - start) / len(ids) * 1e6
+        after = database.item_cache.stats()
+        return elapsed, (after["hits"] - before["hits"]) / len(ids)
+
+
+def main() -> None:
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+    cache = database.item_cache
+    size = cache.max_entries
+    with tempfile.TemporaryDirectory() as tmp:
+        engines = {
+            "memory": MemoryStorage(),
+            "sqlite": SQLiteStorage(str(Path(tmp) / "bench.db")),
+        }
+        print(
+            f"{'engine':<8} {'path':<8} {'no cache, us':>13} {'cache, us':>10} {'x':>6} "
+            f"{'hit rate':>9}"
+        )
+        for name, engine in engines.items():
+            user = engine.create_user("bench", "bench@example.com", "x")
+            items = engine.create_items(
+                [(f"item {i}", user.id, "description " * 10) for i in range(ITEMS)]
+            )
+            ids = [random.choice(items).id for _ in range(REQUESTS)]
+            headers = {"Authorization": f"Bearer {create_access_token({'sub': str(user.id)})}"}
+            previous = database.set_engine(engine)
+            try:
+                cache.max_entries = 0
+                uncached, _ = asyncio.run(_time(ids, headers))
+                handler_uncached = asyncio.run(_time_handler(ids, user))
+                cache.max_entries = ITEMS
+                cached, rate = asyncio.run(_time(ids, headers))
+                handler_cached = asyncio.run(_time_handler(ids, user))
+                for path, slow, fast in (
+                    ("asgi", uncached, cached),
+                    ("handler", handler_uncached, handler_cached),
+                ):
+                    print(
+                        f"{name:<8} {path:<8} {slow:>13.1f} {fast:>10.1f} "
+                        f"{slow / fast:>6.2f} {rate:>9.1%}"
+                    )
+            finally:
+                cache.max_entries = size
+                database.set_engine(previous)
+                engine.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""Подсчёт items владельца: счётчик хранилища против обхода страницами.
+
+Раньше клиент узнавал число своих items, запрашивая страницы по 100,
+пока не придёт неполная. Сравнивает это с count_items (счётчик,
+который хранилище ведёт при вставке и удалении) на движках memory и
+SQLite для владельцев с разным числом items.
+
+Запуск:
+    python benchmarks/bench_item_counts.py
+"""
+
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]  # корень репозитория
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from app.storage.memory import MemoryStorage  # noqa: E402
+from app.storage.sqlite import SQLiteStorage  # noqa: E402
+
+OWNER_SIZES = (100, 10_000, 100_000)
+PAGE = 100
+REPEAT = 20
+
+
+def _count_by_pages(engine, owner_id: int) -> int:
+    total, after_id = 0, None
+    while True:
+        page = engine.get_items(owner_id=owner_id, limit=PAGE, after_id=after_id)
+        total += len(page)
+        if len(page) < PAGE:
+            return total
+        after_id = page[-1].id
+
+
+def _time(func, *args) -> float:
+    """Среднее время вызова в микросекундах."""
+    start = time.perf_counter()
+    for _ in range(REPEAT):
+        func(*args)
+    return (time.perf_counter() - start) / REPEAT * 1e6
+
+
+def main() -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        engines = {
+            "memory": MemoryStorage(),
+            "sqlite": SQLiteStorage(str(Path(tmp) / "bench.db")),
+        }
+        print(f"{'engine':<8} {'items':>8} {'pages, us':>12} {'counter, us':>12}")
+        for name, engine in engines.items():
+            for owner_id, size in enumerate(OWNER_SIZES, start=1):
+                engine.create_items([(f"item {n}", owner_id, None) for n in range(size)])
+                assert _count_by_pages(engine, owner_id) == engine.count_items(owner_id) == size
+                pages = _time(_count_by_pages, engine, owner_id)
+                counter = _time(engine.count_items, owner_id)
+                print(f"{name:<8} {size:>8,} {pages:>12,.0f} {counter:>12.1f}")
+            engine.close()
+
+
+if __name__ == "__main__":
+    main()
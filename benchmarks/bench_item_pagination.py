@@ -0,0 +1,84 @@
+"""Масштабирование get_items и delete_item: до 5M items у 10k владельцев.
+
+Проверяет, что стоимость страницы зависит от limit, а не от общего
+числа items в системе — как для обычного пользователя (индекс владельца),
+так и для admin (общий индекс, в том числе по offset), и что удаление
+item из середины не дорожает с ростом числа items.
+
+Запуск:
+    python benchmarks/bench_item_pagination.py
+"""
+
+import random
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]  # корень репозитория
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from app import database  # noqa: E402
+
+OWNERS = 10_000
+SIZES = (10_000, 100_000, 1_000_000, 5_000_000)
+PAGES = 20_000
+LIMIT = 10
+DELETES = 2_000
+
+
+def _fill(start: int, target: int) -> None:
+    """Дополнить хранилище items [start, target), распределёнными по OWNERS владельцам."""
+    for i in range(start, target):
+        database.create_item(name=f"item{i}", owner_id=i % OWNERS + 1)
+
+
+def _measure(owner_ids) -> float:
+    """Среднее время получения страницы в микросекундах."""
+    start = time.perf_counter()
+    for owner_id in owner_ids:
+        database.get_items(owner_id=owner_id, limit=LIMIT, offset=0)
+    return (time.perf_counter() - start) / len(owner_ids) * 1e6
+
+
+def _measure_offset(size: int) -> float:
+    """Среднее время страницы admin по случайному offset в микросекундах."""
+    offsets = [random.randrange(size // 2) for _ in range(PAGES)]
+    start = time.perf_counter()
+    for offset in offsets:
+        database.get_items(limit=LIMIT, offset=offset)
+    return (time.perf_counter() - start) / PAGES * 1e6
+
+
+def _measure_deletes(size: int) -> float:
+    """Среднее время удаления случайного item движком в микросекундах."""
+    engine = database.get_engine()
+    item_ids = random.sample(range(1, size + 1), DELETES)
+    start = time.perf_counter()
+    for item_id in item_ids:
+        engine.delete_item(item_id)
+    return (time.perf_counter() - start) / DELETES * 1e6
+
+
+def main() -> None:
+    print(
+        f"{'items':>10} {'owner page, us':>15} {'admin page, us':>15} "
+        f"{'offset page, us':>16} {'delete, us':>11}"
+    )
+    filled = 0
+    for size in SIZES:
+        _fill(filled, size)
+        filled = size
+        owners = [random.randint(1, OWNERS) for _ in range(PAGES)]
+        owner_page = _measure(owners)
+        admin_page = _measure([None] * PAGES)
+        delete = _measure_deletes(size)
+        offset_page = _measure_offset(size)
+        print(
+            f"{size:>10} {owner_page:>15.3f} {admin_page:>15.3f} "
+            f"{offset_page:>16.3f} {delete:>11.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
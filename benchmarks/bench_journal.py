@@ -0,0 +1,74 @@
+"""Бенчмарк журналируемого in-memory хранилища на 1M записей.
+
+Измеряет пропускную способность записи (MemoryStorage без журнала и
+JournaledMemoryStorage с разными fsync_interval) и время восстановления
+при старте: только из журнала и из снапшота с хвостом журнала.
+
+Запуск:
+    python benchmarks/bench_journal.py
+"""
+
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]  # корень репозитория
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from app.storage.journal import JournaledMemoryStorage  # noqa: E402
+from app.storage.memory import MemoryStorage  # noqa: E402
+
+RECORDS = 1_000_000
+OWNERS = 10_000
+TAIL = 10_000
+
+
+def _write(storage, count: int, start: int = 0) -> float:
+    """Создать count items, вернуть записей в секунду (включая финальный fsync)."""
+    begin = time.perf_counter()
+    for i in range(start, start + count):
+        storage.create_item(f"item{i}", owner_id=i % OWNERS + 1, description="benchmark")
+    if isinstance(storage, JournaledMemoryStorage):
+        storage.flush()
+    return count / (time.perf_counter() - begin)
+
+
+def _recover(directory: str) -> float:
+    begin = time.perf_counter()
+    storage = JournaledMemoryStorage(directory, snapshot_every=RECORDS * 10)
+    elapsed = time.perf_counter() - begin
+    storage.close()
+    return elapsed
+
+
+def main() -> None:
+    print(f"write throughput, {RECORDS:,} creates (records/sec):")
+    print(f"  {'memory (no WAL)':<32} {_write(MemoryStorage(), RECORDS):>12,.0f}")
+    for interval in (0.001, 0.01, 0.1):
+        with tempfile.TemporaryDirectory() as tmp:
+            storage = JournaledMemoryStorage(tmp, fsync_interval=interval, snapshot_every=RECORDS)
+            rate = _write(storage, RECORDS)
+            storage.close()
+        print(f"  {f'journal, fsync_interval={interval}s':<32} {rate:>12,.0f}")
+
+    print("recovery time (seconds):")
+    with tempfile.TemporaryDirectory() as tmp:
+        storage = JournaledMemoryStorage(tmp, snapshot_every=RECORDS * 10)
+        _write(storage, RECORDS)
+        storage.close()
+        print(f"  {'WAL replay, 1M records':<32} {_recover(tmp):>12.2f}")
+
+        storage = JournaledMemoryStorage(tmp, snapshot_every=RECORDS * 10)
+        begin = time.perf_counter()
+        storage.snapshot()
+        snapshot_time = time.perf_counter() - begin
+        _write(storage, TAIL, start=RECORDS)
+        storage.close()
+        print(f"  {'snapshot, 1M records':<32} {snapshot_time:>12.2f}")
+        print(f"  {f'snapshot + {TAIL:,} WAL tail':<32} {_recover(tmp):>12.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""Кодирование и проверка JWT HS256: собственный кодек против python-jose.
+
+Токены как у create_access_token (sub, role, jti, exp). Измеряется число
+операций в секунду для encode и decode и проверяется, что оба кодека
+выдают одинаковые токены.
+
+Запуск:
+    python benchmarks/bench_jwt_codec.py
+"""
+
+import secrets
+import sys
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]  # корень репозитория
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from jose import jwt  # noqa: E402
+
+from app.security.auth import ALGORITHM, SECRET_KEY  # noqa: E402
+from app.security.jwt_hs256 import HS256Codec  # noqa: E402
+
+OPS = 20_000
+
+
+def _claims() -> dict:
+    return {
+        "sub": "12345",
+        "role": "user",
+        "jti": secrets.token_urlsafe(16),
+        "exp": datetime.utcnow() + timedelta(minutes=60),
+    }
+
+
+def _rate(fn, args: list) -> float:
+    """Операций в секунду."""
+    start = time.perf_counter()
+    for arg in args:
+        fn(arg)
+    return len(args) / (time.perf_counter() - start)
+
+
+def main() -> None:
+    codec = HS256Codec(SECRET_KEY)
+    claims = [_claims() for _ in range(OPS)]
+    tokens = [jwt.encode(dict(c), SECRET_KEY, algorithm=ALGORITHM) for c in claims]
+    assert [codec.encode(dict(c)) for c in claims] == tokens
+
+    rows = {
+        "encode": (
+            _rate(lambda c: jwt.encode(dict(c), SECRET_KEY, algorithm=ALGORITHM), claims),
+            _rate(lambda c: codec.encode(dict(c)), claims),
+        ),
+        "decode": (
+            _rate(lambda t: jwt.decode(t, SECRET_KEY, algorithms=[ALGORITHM]), tokens),
+            _rate(codec.decode, tokens),
+        ),
+    }
+    print(f"{'op':<7} {'jose, ops/s':>12} {'codec, ops/s':>13} {'x':>6}")
+    for op, (jose_rate, codec_rate) in rows.items():
+        print(f"{op:<7} {jose_rate:>12,.0f} {codec_rate:>13,.0f} {codec_rate / jose_rate:>6.1f}")
+
+
+if __name__ == "__main__":
+    main()
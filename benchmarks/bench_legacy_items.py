@@ -0,0 +1,56 @@
+"""Поиск по id в legacy GET /items/{id}: прежний линейный обход против индексации.
+
+Заполняет _DB из app.main разным числом items и сравнивает время
+поиска последнего item прежним обходом списка и текущим обработчиком
+get_item (индексация плотного списка) — оно не должно расти с числом
+items.
+
+Запуск:
+    python benchmarks/bench_legacy_items.py
+"""
+
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]  # корень репозитория
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from app import main as legacy  # noqa: E402
+
+SIZES = (1_000, 10_000, 100_000, 1_000_000)
+REPEAT = 200
+
+
+def _linear_lookup(item_id: int) -> dict:
+    """Прежняя реализация: обход всего списка."""
+    for it in legacy._DB["items"]:
+        if it["id"] == item_id:
+            return it
+    raise KeyError(item_id)
+
+
+def _time(func, item_id: int) -> float:
+    """Среднее время вызова в микросекундах."""
+    start = time.perf_counter()
+    for _ in range(REPEAT):
+        func(item_id)
+    return (time.perf_counter() - start) / REPEAT * 1e6
+
+
+def main() -> None:
+    saved = legacy._DB["items"]
+    print(f"{'items':>10} {'scan, us':>10} {'indexed, us':>12}")
+    try:
+        for size in SIZES:
+            legacy._DB["items"] = [{"id": n, "name": f"item {n}"} for n in range(1, size + 1)]
+            scan = _time(_linear_lookup, size)
+            indexed = _time(legacy.get_item, size)
+            print(f"{size:>10,} {scan:>10,.1f} {indexed:>12.2f}")
+    finally:
+        legacy._DB["items"] = saved
+
+
+if __name__ == "__main__":
+    main()
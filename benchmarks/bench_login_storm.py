@@ -0,0 +1,109 @@
+"""Задержка /health и чтения item во время шквала входов (Argon2).
+
+Пока LOGINS (по умолчанию) параллельных клиентов непрерывно выполняют
+POST /api/v1/auth/login, отдельный клиент по очереди запрашивает
+/health и GET /api/v1/items/{id}; печатаются медиана, p99 и максимум
+их задержки, а также число входов и ответов 503. Сравниваются проверка
+пароля прямо в event loop (как раньше) и пул хеширования.
+
+Запуск:
+    python benchmarks/bench_login_storm.py [число клиентов входа]
+"""
+
+import asyncio
+import logging
+import statistics
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]  # корень репозитория
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+import httpx  # noqa: E402
+
+from app import database  # noqa: E402
+from app.main import app  # noqa: E402
+from app.security import auth  # noqa: E402
+from app.security.auth import create_access_token, get_password_hash  # noqa: E402
+from app.storage.memory import MemoryStorage  # noqa: E402
+
+LOGINS = 32
+DURATION = 5.0
+PASSWORD = "storm-password-123"
+
+
+class InlinePool:
+    """Прежнее поведение: хеширование прямо в event loop."""
+
+    async def run(self, fn, *args):
+        return fn(*args)
+
+
+async def _storm(client: httpx.AsyncClient, stop: float, counts: dict) -> None:
+    while time.perf_counter() < stop:
+        r = await client.post(
+            "/api/v1/auth/login", json={"username": "storm", "password": PASSWORD}
+        )
+        counts[r.status_code] = counts.get(r.status_code, 0) + 1
+        if r.status_code == 503:
+            await asyncio.sleep(0.05)
+
+
+async def _probe(client: httpx.AsyncClient, stop: float, url: str, headers: dict) -> list:
+    latencies = []
+    while time.perf_counter() < stop:
+        start = time.perf_counter()
+        r = await client.get(url, headers=headers)
+        latencies.append((time.perf_counter() - start) * 1e3)
+        assert r.status_code == 200
+        await asyncio.sleep(0.01)
+    return latencies
+
+
+async def _measure(item_id: int, headers: dict, logins: int) -> tuple:
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        stop = time.perf_counter() + DURATION
+        counts: dict = {}
+        storm = [asyncio.create_task(_storm(client, stop, counts)) for _ in range(logins)]
+        health, item = await asyncio.gather(
+            _probe(client, stop, "/health", {}),
+            _probe(client, stop, f"/api/v1/items/{item_id}", headers),
+        )
+        await asyncio.gather(*storm)
+    return health, item, counts
+
+
+def _summary(latencies: list) -> str:
+    latencies = sorted(latencies)
+    p99 = latencies[int(len(latencies) * 0.99) - 1]
+    return f"{statistics.median(latencies):>7.1f} {p99:>7.1f} {latencies[-1]:>7.1f}"
+
+
+def main() -> None:
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+    logins = int(sys.argv[1]) if len(sys.argv) > 1 else LOGINS
+    logging.getLogger("app.main").setLevel(logging.CRITICAL)
+    engine = MemoryStorage()
+    user = engine.create_user("storm", "storm@example.com", get_password_hash(PASSWORD))
+    item = engine.create_item("probe", owner_id=user.id)
+    headers = {"Authorization": f"Bearer {create_access_token({'sub': str(user.id)})}"}
+    previous = database.set_engine(engine)
+    pool = auth.password_hash_pool
+    print(f"{'hashing':<8} {'probe':<7} {'p50 ms':>7} {'p99 ms':>7} {'max ms':>7}  logins")
+    try:
+        for label, hasher in (("inline", InlinePool()), ("pool", pool)):
+            auth.password_hash_pool = hasher
+            health, item_reads, counts = asyncio.run(_measure(item.id, headers, logins))
+            results = f"200: {counts.get(200, 0)}, 503: {counts.get(503, 0)}"
+            print(f"{label:<8} {'health':<7} {_summary(health)}  {results}")
+            print(f"{label:<8} {'item':<7} {_summary(item_reads)}")
+    finally:
+        auth.password_hash_pool = pool
+        database.set_engine(previous)
+
+
+if __name__ == "__main__":
+    main()
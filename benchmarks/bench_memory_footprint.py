@@ -0,0 +1,80 @@
+"""Память на item в MemoryStorage: до и после компактного представления.
+
+Измеряется через tracemalloc весь прирост памяти хранилища, включая
+индексы. «До» — прежняя раскладка: Item с __dict__ в словаре id -> Item
+и отдельный объект int owner_id в каждом item. «После» — MemoryStorage:
+Item со __slots__ в плотном списке по id.
+
+Запуск (размеры по умолчанию 1M и 10M; 10M «до» требует ~4 ГБ RAM):
+    python benchmarks/bench_memory_footprint.py [N ...]
+"""
+
+import gc
+import sys
+import tracemalloc
+from pathlib import Path
+from typing import Optional
+
+ROOT = Path(__file__).resolve().parents[1]  # корень репозитория
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from app.storage.memory import MemoryStorage  # noqa: E402
+
+DEFAULT_SIZES = (1_000_000, 10_000_000)
+OWNERS = 10_000
+CHUNK = 10_000
+
+
+class DictItem:
+    """Прежняя модель Item: атрибуты в __dict__ экземпляра."""
+
+    def __init__(self, id: int, name: str, owner_id: int, description: Optional[str] = None):
+        self.id = id
+        self.name = name
+        self.owner_id = owner_id
+        self.description = description
+
+
+class DictStorage:
+    """Прежняя раскладка MemoryStorage: словарь id -> DictItem и индексы id."""
+
+    def __init__(self):
+        self.items_db = {}
+        self.item_ids = []
+        self.items_by_owner = {}
+
+    def create_items(self, entries) -> None:
+        for name, owner_id, description in entries:
+            item = DictItem(len(self.item_ids) + 1, name, owner_id, description)
+            self.items_db[item.id] = item
+            self.item_ids.append(item.id)
+            self.items_by_owner.setdefault(owner_id, []).append(item.id)
+
+
+def _bytes_per_item(storage_class, size: int) -> float:
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    storage = storage_class()
+    for start in range(0, size, CHUNK):
+        storage.create_items(
+            [(f"item{i}", i % OWNERS + 1, None) for i in range(start, start + CHUNK)]
+        )
+    used = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    del storage
+    return used / size
+
+
+def main() -> None:
+    sizes = [int(arg) for arg in sys.argv[1:]] or DEFAULT_SIZES
+    print(f"{'items':>12} {'before, B/item':>15} {'after, B/item':>14} {'saved':>7}")
+    for size in sizes:
+        before = _bytes_per_item(DictStorage, size)
+        after = _bytes_per_item(MemoryStorage, size)
+        print(f"{size:>12,} {before:>15.1f} {after:>14.1f} {1 - after / before:>7.0%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+"""Масштабирование RPS GET /api/v1/items/{id} от 1 до 8 воркеров uvicorn.
+
+Запускает uvicorn --workers N с STORAGE_ENGINE=shared, заполняет общее
+хранилище из процесса бенчмарка (воркеры видят те же данные) и нагружает
+сервер клиентами в отдельных процессах (keep-alive соединения).
+Каждый ответ проверяется на 200: воркер, не видящий данных, дал бы 404.
+
+Запуск:
+    python benchmarks/bench_multiworker.py
+"""
+
+import http.client
+import multiprocessing
+import os
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]  # корень репозитория
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from app.security.auth import create_access_token  # noqa: E402
+from app.storage.shared import SharedMemoryStorage  # noqa: E402
+
+WORKER_COUNTS = (1, 2, 4, 8)
+CLIENTS = 16
+DURATION = 5.0
+ITEMS = 1_000
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _wait_ready(port: int, timeout: float = 30.0) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            conn = http.client.HTTPConnection("127.0.0.1", port, timeout=1)
+            conn.request("GET", "/health")
+            if conn.getresponse().status == 200:
+                return
+        except OSError:
+            time.sleep(0.1)
+    raise RuntimeError("uvicorn did not start")
+
+
+def _client(port: int, token: str, item_ids: list, deadline: float, counter) -> None:
+    conn = http.client.HTTPConnection("127.0.0.1", port)
+    headers = {"Authorization": f"Bearer {token}"}
+    done = 0
+    while time.time() < deadline:
+        conn.request("GET", f"/api/v1/items/{random.choice(item_ids)}", headers=headers)
+        response = conn.getresponse()
+        response.read()
+        if response.status != 200:
+            raise RuntimeError(f"unexpected status {response.status}")
+        done += 1
+    with counter.get_lock():
+        counter.value += done
+
+
+def _measure(workers: int, path: str, token: str, item_ids: list) -> float:
+    port = _free_port()
+    env = dict(os.environ, STORAGE_ENGINE="shared", SHARED_STORE_PATH=path)
+    server = subprocess.Popen(
+        [
+            sys.executable,
+            "-m",
+            "uvicorn",
+            "app.main:app",
+            "--port",
+            str(port),
+            "--workers",
+            str(workers),
+            "--no-access-log",
+            "--log-level",
+            "warning",
+        ],
+        cwd=ROOT,
+        env=env,
+    )
+    try:
+        _wait_ready(port)
+        counter = multiprocessing.Value("q", 0)
+        deadline = time.time() + DURATION
+        clients = [
+            multiprocessing.Process(target=_client, args=(port, token, item_ids, deadline, counter))
+            for _ in range(CLIENTS)
+        ]
+        for c in clients:
+            c.start()
+        for c in clients:
+            c.join()
+        return counter.value / DURATION
+    finally:
+        server.terminate()
+        server.wait()
+
+
+def main() -> None:
+    with tempfile.TemporaryDirectory(dir="/dev/shm" if os.path.isdir("/dev/shm") else None) as tmp:
+        path = str(Path(tmp) / "bench.db")
+        storage = SharedMemoryStorage(path)
+        user = storage.create_user("bench", "bench@example.com", "x")
+        items = storage.create_items([(f"item{i}", user.id, None) for i in range(ITEMS)])
+        token = create_access_token({"sub": str(user.id)})
+        item_ids = [item.id for item in items]
+
+        print(f"CPUs: {os.cpu_count()}, clients: {CLIENTS}")
+        print(f"{'workers':>8} {'RPS':>10}")
+        for workers in WORKER_COUNTS:
+            print(f"{workers:>8} {_measure(workers, path, token, item_ids):>10,.0f}")
+        storage.destroy()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+"""Конкурентные записи в «горячие» items: compare-and-set против глобальной блокировки.
+
+Потоки-писатели обновляют несколько общих items. Оптимистичный режим:
+прочитать версию, обновить с expected_version, при конфликте повторить
+(как клиент с If-Match при ответе 412). Базовая линия: чтение и
+обновление под одной глобальной блокировкой. Выводятся успешные
+обновления в секунду и доля конфликтов.
+
+Запуск:
+    python benchmarks/bench_optimistic_writes.py
+"""
+
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]  # корень репозитория
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from app.storage.base import VersionConflictError  # noqa: E402
+from app.storage.memory import MemoryStorage  # noqa: E402
+from app.storage.sqlite import SQLiteStorage  # noqa: E402
+
+HOT_ITEMS = 4
+UPDATES_PER_THREAD = 2_000
+THREAD_COUNTS = (1, 4, 16, 64)
+# Больше потоков, чем соединений в пуле SQLite, приложение не создаёт
+# (пул исполнителя STORAGE_EXECUTOR_WORKERS), поэтому здесь до 16
+SQLITE_THREAD_COUNTS = (1, 4, 16)
+
+
+def _optimistic(storage, item_ids, n, conflicts):
+    for i in range(UPDATES_PER_THREAD):
+        item_id = item_ids[(n + i) % len(item_ids)]
+        while True:
+            version = storage.get_item_by_id(item_id).version
+            try:
+                storage.update_item(item_id, name=f"t{n}", expected_version=version)
+                break
+            except VersionConflictError:
+                conflicts[n] += 1
+
+
+def _global_lock(storage, item_ids, n, conflicts, lock=threading.Lock()):
+    for i in range(UPDATES_PER_THREAD):
+        item_id = item_ids[(n + i) % len(item_ids)]
+        with lock:
+            storage.get_item_by_id(item_id)
+            storage.update_item(item_id, name=f"t{n}")
+
+
+def _run(storage, mode, threads: int):
+    """Выполнить сценарий, вернуть (обновлений в секунду, доля конфликтов)."""
+    item_ids = [item.id for item in storage.create_items([("hot", 1, None)] * HOT_ITEMS)]
+    conflicts = [0] * threads
+    workers = [
+        threading.Thread(target=mode, args=(storage, item_ids, n, conflicts))
+        for n in range(threads)
+    ]
+    start = time.perf_counter()
+    for t in workers:
+        t.start()
+    for t in workers:
+        t.join()
+    updates = threads * UPDATES_PER_THREAD
+    return updates / (time.perf_counter() - start), sum(conflicts) / updates
+
+
+def main() -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        engines = {
+            "memory": (MemoryStorage, THREAD_COUNTS),
+            "sqlite": (
+                lambda: SQLiteStorage(str(Path(tmp) / f"bench-{time.time_ns()}.db")),
+                SQLITE_THREAD_COUNTS,
+            ),
+        }
+        print(
+            f"{'engine':<8} {'threads':>8} {'CAS, upd/s':>12} {'conflicts':>10} "
+            f"{'global lock, upd/s':>19}"
+        )
+        for name, (factory, thread_counts) in engines.items():
+            for threads in thread_counts:
+                cas_storage, lock_storage = factory(), factory()
+                cas_rate, conflict_share = _run(cas_storage, _optimistic, threads)
+                lock_rate, _ = _run(lock_storage, _global_lock, threads)
+                cas_storage.close()
+                lock_storage.close()
+                print(
+                    f"{name:<8} {threads:>8} {cas_rate:>12,.0f} {conflict_share:>10.1%} "
+                    f"{lock_rate:>19,.0f}"
+                )
+
+
+if __name__ == "__main__":
+    main()
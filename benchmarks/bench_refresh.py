@@ -0,0 +1,98 @@
+"""Обновление access-токена: полный логин против refresh-токена.
+
+Измеряется среднее время POST /api/v1/auth/login (проверка Argon2) и
+POST /api/v1/auth/refresh (ротация сессии и чтение пользователя) через
+ASGI без сети, а также стоимость операций SessionStore при SESSIONS
+открытых сессиях: ротация и очистка истёкших корзин.
+
+Запуск:
+    python benchmarks/bench_refresh.py
+"""
+
+import asyncio
+import logging
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]  # корень репозитория
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+import httpx  # noqa: E402
+
+from app import database  # noqa: E402
+from app.main import app  # noqa: E402
+from app.security.auth import get_password_hash  # noqa: E402
+from app.security.sessions import SessionStore, session_store  # noqa: E402
+from app.storage.memory import MemoryStorage  # noqa: E402
+
+LOGINS = 20
+REFRESHES = 2_000
+SESSIONS = 100_000
+PASSWORD = "bench-password-123"
+
+
+async def _time_http() -> tuple:
+    """Среднее время login и refresh в миллисекундах."""
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        credentials = {"username": "bench", "password": PASSWORD}
+        start = time.perf_counter()
+        for _ in range(LOGINS):
+            r = await client.post("/api/v1/auth/login", json=credentials)
+        login = (time.perf_counter() - start) / LOGINS * 1e3
+
+        refresh_token = r.json()["refresh_token"]
+        start = time.perf_counter()
+        for _ in range(REFRESHES):
+            r = await client.post("/api/v1/auth/refresh", json={"refresh_token": refresh_token})
+            refresh_token = r.json()["refresh_token"]
+        refresh = (time.perf_counter() - start) / REFRESHES * 1e3
+        return login, refresh
+
+
+def _time_store() -> tuple:
+    """Ротация (мкс) при SESSIONS сессиях и очистка истёкшей половины (мс)."""
+    sessions = SessionStore(bucket_seconds=0.1)
+    tokens = [sessions.create(n) for n in range(SESSIONS // 2)]
+    sessions.ttl = 1.0
+    expiring = [sessions.create(n) for n in range(SESSIONS // 2)]
+    sessions.ttl = 3600
+    start = time.perf_counter()
+    tokens = [sessions.rotate(token)[1] for token in tokens]
+    rotate = (time.perf_counter() - start) / len(tokens) * 1e6
+
+    time.sleep(1.2)
+    expired = sessions.expired
+    start = time.perf_counter()
+    for shard in sessions._shards:
+        with shard.lock:
+            sessions._sweep(shard, time.time())
+    sweep = (time.perf_counter() - start) * 1e3
+    assert sessions.expired - expired == len(expiring) and len(sessions) == len(tokens)
+    return rotate, sweep
+
+
+def main() -> None:
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+    engine = MemoryStorage()
+    engine.create_user("bench", "bench@example.com", get_password_hash(PASSWORD))
+    previous = database.set_engine(engine)
+    try:
+        login, refresh = asyncio.run(_time_http())
+    finally:
+        database.set_engine(previous)
+        session_store.clear()
+    print(f"{'endpoint':<9} {'ms':>8}")
+    print(f"{'login':<9} {login:>8.2f}")
+    print(f"{'refresh':<9} {refresh:>8.2f}   x{login / refresh:.0f}")
+
+    rotate, sweep = _time_store()
+    print(f"\nSessionStore, {SESSIONS:,} sessions")
+    print(f"rotate              {rotate:>8.1f} us")
+    print(f"sweep {SESSIONS // 2:,} expired {sweep:>8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""Стоимость проверки отзыва токена на запрос.
+
+Измеряет is_revoked для неотозванного jti (частый случай) при разном
+числе отозванных токенов и прирост времени get_current_user (с кэшем
+проверенных токенов) от проверки отзыва.
+
+Запуск:
+    python benchmarks/bench_revocation.py
+"""
+
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]  # корень репозитория
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from fastapi.security import HTTPAuthorizationCredentials  # noqa: E402
+
+from app import database, dependencies  # noqa: E402
+from app.dependencies import get_current_user  # noqa: E402
+from app.security.auth import create_access_token  # noqa: E402
+from app.security.revocation import RevocationStore  # noqa: E402
+from app.storage.memory import MemoryStorage  # noqa: E402
+
+REVOKED = (0, 10_000, 100_000, 1_000_000)
+LOOKUPS = 1_000_000
+REQUESTS = 100_000
+
+
+class NoRevocation:
+    """Без проверки отзыва."""
+
+    def is_revoked(self, jti: str) -> bool:
+        return False
+
+
+def _time_lookup(store: RevocationStore, jti: str) -> float:
+    """Среднее время is_revoked в наносекундах."""
+    is_revoked = store.is_revoked
+    start = time.perf_counter()
+    for _ in range(LOOKUPS):
+        is_revoked(jti)
+    return (time.perf_counter() - start) / LOOKUPS * 1e9
+
+
+async def _time_dependency(credentials: HTTPAuthorizationCredentials) -> float:
+    """Среднее время get_current_user в микросекундах."""
+    start = time.perf_counter()
+    for _ in range(REQUESTS):
+        await get_current_user(None, credentials)
+    return (time.perf_counter() - start) / REQUESTS * 1e6
+
+
+def main() -> None:
+    expires = time.time() + 3600
+    print(f"{'revoked':>10} {'is_revoked, ns':>15} {'false positives':>16}")
+    for count in REVOKED:
+        store = RevocationStore()
+        for n in range(count):
+            store.revoke(f"revoked-{n}", expires)
+        probes = [f"live-{n}" for n in range(100_000)]
+        false_positives = sum(jti in store._filter for jti in probes) / len(probes)
+        print(f"{count:>10,} {_time_lookup(store, 'live-jti'):>15.0f} {false_positives:>16.3%}")
+
+    engine = MemoryStorage()
+    user = engine.create_user("bench", "bench@example.com", "x")
+    token = create_access_token({"sub": str(user.id)})
+    credentials = HTTPAuthorizationCredentials(scheme="Bearer", credentials=token)
+    previous = database.set_engine(engine)
+    saved = dependencies.revocation_store
+    try:
+        store = RevocationStore()
+        for n in range(100_000):
+            store.revoke(f"revoked-{n}", expires)
+        timings = {}
+        for label, revocation in (("off", NoRevocation()), ("on", store)):
+            dependencies.revocation_store = revocation
+            timings[label] = asyncio.run(_time_dependency(credentials))
+        print(
+            f"get_current_user: {timings['off']:.2f} us без проверки, "
+            f"{timings['on']:.2f} us с проверкой (100k отозванных)"
+        )
+    finally:
+        dependencies.revocation_store = saved
+        database.set_engine(previous)
+
+
+if __name__ == "__main__":
+    main()
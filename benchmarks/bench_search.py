@@ -0,0 +1,90 @@
+"""Задержка поиска items (app.search) на 1M items.
+
+Items получают имена и описания из случайных слов словаря; измеряются
+точные, составные и префиксные запросы для admin (по всем items) и для
+владельца (по его items). Поиск вызывается через фасад app.database,
+то есть включает чтение найденных items из движка.
+
+Запуск:
+    python benchmarks/bench_search.py [N]
+"""
+
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]  # корень репозитория
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from app import database  # noqa: E402
+from app.storage.memory import MemoryStorage  # noqa: E402
+
+DEFAULT_ITEMS = 1_000_000
+VOCABULARY = 20_000
+OWNERS = 10_000
+CHUNK = 10_000
+REPEAT = 200
+LIMIT = 20
+
+QUERIES = [
+    ("common word", "w1"),
+    ("rare word", "w19999"),
+    ("two words", "w1 w2"),
+    ("prefix 3 chars", "w12"),
+    ("prefix 2 chars", "w9"),
+    ("no match", "zzz"),
+]
+
+
+def _word(rng: random.Random) -> str:
+    # Распределение слов неравномерное: малые номера встречаются чаще
+    return f"w{int(rng.paretovariate(1.0)) % VOCABULARY}"
+
+
+def _fill(storage: MemoryStorage, size: int) -> None:
+    rng = random.Random(42)
+    for start in range(0, size, CHUNK):
+        storage.create_items(
+            [
+                (
+                    " ".join(_word(rng) for _ in range(3)),
+                    i % OWNERS + 1,
+                    " ".join(_word(rng) for _ in range(8)),
+                )
+                for i in range(start, start + CHUNK)
+            ]
+        )
+
+
+def _latency_ms(query: str, owner_id) -> float:
+    timings = []
+    for _ in range(REPEAT):
+        start = time.perf_counter()
+        database.search_items(query, owner_id=owner_id, limit=LIMIT)
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings) * 1000
+
+
+def main() -> None:
+    size = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_ITEMS
+    storage = MemoryStorage()
+    _fill(storage, size)
+    start = time.perf_counter()
+    previous = database.set_engine(storage)
+    print(f"items: {size:,}, index build: {time.perf_counter() - start:.1f} s")
+
+    try:
+        print(f"{'query':<16} {'q':<8} {'admin, ms':>10} {'owner, ms':>10}")
+        for label, query in QUERIES:
+            admin = _latency_ms(query, None)
+            owner = _latency_ms(query, 1)
+            print(f"{label:<16} {query:<8} {admin:>10.3f} {owner:>10.3f}")
+    finally:
+        database.set_engine(previous)
+
+
+if __name__ == "__main__":
+    main()
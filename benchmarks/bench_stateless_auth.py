@@ -0,0 +1,87 @@
+"""Чтение item с медленным хранилищем: stateful против stateless аутентификации.
+
+Хранилище имитирует удалённое: каждое чтение пользователя и item
+ждёт LATENCY (сетевой round trip) и выполняется в пуле потоков, как
+блокирующий движок. Измеряется среднее время GET /api/v1/items/{id}
+через ASGI без сети, когда get_current_user читает пользователя
+(по умолчанию) и когда субъект строится из claims (AUTH_STATELESS).
+Кэш ответов item выключен, чтобы каждый запрос читал item.
+
+Запуск:
+    python benchmarks/bench_stateless_auth.py
+"""
+
+import asyncio
+import logging
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]  # корень репозитория
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+import httpx  # noqa: E402
+
+from app import database, dependencies  # noqa: E402
+from app.main import app  # noqa: E402
+from app.security.auth import create_access_token  # noqa: E402
+from app.storage.memory import MemoryStorage  # noqa: E402
+
+LATENCY = 0.001
+REQUESTS = 500
+
+
+class SlowStorage(MemoryStorage):
+    """MemoryStorage с задержкой удалённого хранилища на чтениях по id."""
+
+    blocking = True
+
+    def get_user_by_id(self, user_id):
+        time.sleep(LATENCY)
+        return super().get_user_by_id(user_id)
+
+    def get_item_by_id(self, item_id):
+        time.sleep(LATENCY)
+        return super().get_item_by_id(item_id)
+
+
+async def _time(url: str, headers: dict) -> float:
+    """Среднее время запроса в миллисекундах."""
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        start = time.perf_counter()
+        for _ in range(REQUESTS):
+            r = await client.get(url, headers=headers)
+            assert r.status_code == 200
+        return (time.perf_counter() - start) / REQUESTS * 1e3
+
+
+def main() -> None:
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+    engine = SlowStorage()
+    user = engine.create_user("bench", "bench@example.com", "x")
+    item = engine.create_item("item", owner_id=user.id)
+    token = create_access_token({"sub": str(user.id), "role": user.role})
+    headers = {"Authorization": f"Bearer {token}"}
+    url = f"/api/v1/items/{item.id}"
+
+    previous = database.set_engine(engine)
+    cache_size = database.item_cache.max_entries
+    database.item_cache.max_entries = 0
+    stateless = dependencies.STATELESS_AUTH
+    print(f"store latency {LATENCY * 1e3:.1f} ms per read")
+    print(f"{'mode':<10} {'GET item, ms':>13}")
+    try:
+        for mode in (False, True):
+            dependencies.STATELESS_AUTH = mode
+            label = "stateless" if mode else "stateful"
+            print(f"{label:<10} {asyncio.run(_time(url, headers)):>13.2f}")
+    finally:
+        dependencies.STATELESS_AUTH = stateless
+        database.item_cache.max_entries = cache_size
+        database.set_engine(previous)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""Сравнение пропускной способности движков хранилища: memory и SQLite.
+
+Для каждого движка измеряются ops/sec основных операций на уровне
+хранилища и запросов GET /api/v1/items/{id} через HTTP (TestClient).
+
+Запуск:
+    python benchmarks/bench_storage_engines.py
+"""
+
+import logging
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]  # корень репозитория
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from fastapi.testclient import TestClient  # noqa: E402
+
+from app import database  # noqa: E402
+from app.main import app  # noqa: E402
+from app.security.auth import create_access_token  # noqa: E402
+from app.storage.memory import MemoryStorage  # noqa: E402
+from app.storage.sqlite import SQLiteStorage  # noqa: E402
+
+ITEMS = 50_000
+OWNERS = 100
+READS = 50_000
+HTTP_READS = 2_000
+
+
+def _ops_per_sec(fn, args_list) -> float:
+    start = time.perf_counter()
+    for args in args_list:
+        fn(*args)
+    return len(args_list) / (time.perf_counter() - start)
+
+
+def _bench(engine) -> dict:
+    user = engine.create_user("bench", "bench@example.com", "x")
+    results = {
+        "create_item": _ops_per_sec(
+            engine.create_item, [(f"item{i}", i % OWNERS + 1) for i in range(ITEMS)]
+        )
+    }
+    ids = [random.randint(1, ITEMS) for _ in range(READS)]
+    results["get_item_by_id"] = _ops_per_sec(engine.get_item_by_id, [(i,) for i in ids])
+    results["get_items(owner)"] = _ops_per_sec(
+        lambda owner_id: engine.get_items(owner_id=owner_id, limit=10),
+        [(i % OWNERS + 1,) for i in ids],
+    )
+    results["update_item"] = _ops_per_sec(
+        lambda item_id: engine.update_item(item_id, name="renamed"), [(i,) for i in ids]
+    )
+
+    own_ids = [engine.create_item(f"own{i}", user.id).id for i in range(100)]
+    previous = database.set_engine(engine)
+    try:
+        client = TestClient(app)
+        headers = {"Authorization": f"Bearer {create_access_token({'sub': str(user.id)})}"}
+        results["HTTP GET item"] = _ops_per_sec(
+            lambda item_id: client.get(f"/api/v1/items/{item_id}", headers=headers),
+            [(random.choice(own_ids),) for _ in range(HTTP_READS)],
+        )
+    finally:
+        database.set_engine(previous)
+    return results
+
+
+def main() -> None:
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+    with tempfile.TemporaryDirectory() as tmp:
+        engines = {
+            "memory": MemoryStorage(),
+            "sqlite": SQLiteStorage(str(Path(tmp) / "bench.db")),
+        }
+        results = {name: _bench(engine) for name, engine in engines.items()}
+        for engine in engines.values():
+            engine.close()
+
+    print(f"{'operation, ops/sec':<20} {'memory':>12} {'sqlite':>12}")
+    for op in results["memory"]:
+        print(f"{op:<20} {results['memory'][op]:>12,.0f} {results['sqlite'][op]:>12,.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""Стоимость аутентификации запроса с кэшем проверенных токенов и без него.
+
+CLIENTS клиентов (у каждого свой токен) делают запросы вперемешку.
+Измеряется среднее время зависимости get_current_user (проверка JWT и
+поиск пользователя) и полного запроса GET /api/v1/items?limit=1 через
+ASGI без сети, а также доля попаданий в кэш.
+
+Запуск:
+    python benchmarks/bench_token_cache.py
+"""
+
+import asyncio
+import logging
+import random
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]  # корень репозитория
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+import httpx  # noqa: E402
+from fastapi.security import HTTPAuthorizationCredentials  # noqa: E402
+
+from app import database  # noqa: E402
+from app.dependencies import get_current_user  # noqa: E402
+from app.main import app  # noqa: E402
+from app.security.auth import create_access_token, token_cache  # noqa: E402
+from app.storage.memory import MemoryStorage  # noqa: E402
+
+CLIENTS = 1_000
+REQUESTS = 20_000
+HTTP_REQUESTS = 3_000
+
+
+async def _time_dependency(tokens: list) -> float:
+    """Среднее время get_current_user в микросекундах."""
+    credentials = [HTTPAuthorizationCredentials(scheme="Bearer", credentials=t) for t in tokens]
+    start = time.perf_counter()
+    for creds in credentials:
+        await get_current_user(None, creds)
+    return (time.perf_counter() - start) / len(tokens) * 1e6
+
+
+async def _time_http(tokens: list) -> float:
+    """Среднее время запроса в микросекундах."""
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        start = time.perf_counter()
+        for token in tokens:
+            await client.get("/api/v1/items?limit=1", headers={"Authorization": f"Bearer {token}"})
+        return (time.perf_counter() - start) / len(tokens) * 1e6
+
+
+def main() -> None:
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+    engine = MemoryStorage()
+    users = [engine.create_user(f"u{n}", f"u{n}@example.com", "x") for n in range(CLIENTS)]
+    tokens = [create_access_token({"sub": str(user.id)}) for user in users]
+    stream = [random.choice(tokens) for _ in range(REQUESTS)]
+    previous = database.set_engine(engine)
+    size = token_cache.max_entries
+    print(f"{'path':<11} {'no cache, us':>13} {'cache, us':>10} {'x':>6} {'hit rate':>9}")
+    try:
+        results = {}
+        for max_entries in (0, size):
+            token_cache.max_entries = max_entries
+            token_cache.clear()
+            before = token_cache.stats()
+            dependency = asyncio.run(_time_dependency(stream))
+            after = token_cache.stats()
+            http = asyncio.run(_time_http(stream[:HTTP_REQUESTS]))
+            lookups = after["hits"] + after["misses"] - before["hits"] - before["misses"]
+            rate = (after["hits"] - before["hits"]) / lookups if lookups else 0.0
+            results[max_entries] = (dependency, http, rate)
+        (dep_off, http_off, _), (dep_on, http_on, rate) = results[0], results[size]
+        print(
+            f"{'dependency':<11} {dep_off:>13.1f} {dep_on:>10.1f} "
+            f"{dep_off / dep_on:>6.1f} {rate:>9.1%}"
+        )
+        print(f"{'asgi':<11} {http_off:>13.0f} {http_on:>10.0f} {http_off / http_on:>6.2f}")
+    finally:
+        token_cache.max_entries = size
+        token_cache.clear()
+        database.set_engine(previous)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+"""Бенчмарк поиска пользователей по username/email (NFR-001).
+
+Показывает, что латентность get_user_by_username/get_user_by_email
+не растёт с ростом числа пользователей (от 1k до 1M).
+
+Запуск:
+    python benchmarks/bench_user_lookup.py
+"""
+
+import random
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]  # корень репозитория
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from app import database  # noqa: E402
+
+SIZES = (1_000, 10_000, 100_000, 1_000_000)
+LOOKUPS = 100_000
+
+
+def _fill(start: int, target: int) -> None:
+    """Дополнить хранилище пользователями с номерами [start, target)."""
+    for i in range(start, target):
+        database.create_user(
+            username=f"user{i}",
+            email=f"User{i}@Example.com",
+            hashed_password="x",
+        )
+
+
+def _measure(lookup, keys) -> float:
+    """Среднее время одного поиска в микросекундах."""
+    start = time.perf_counter()
+    for key in keys:
+        if lookup(key) is None:
+            raise RuntimeError(f"lookup miss: {key}")
+    return (time.perf_counter() - start) / len(keys) * 1e6
+
+
+def main() -> None:
+    print(f"{'users':>10} {'by_username, us':>16} {'by_email, us':>14}")
+    filled = 0
+    for size in SIZES:
+        _fill(filled, size)
+        filled = size
+        ids = [random.randrange(size) for _ in range(LOOKUPS)]
+        by_username = _measure(database.get_user_by_username, [f"user{i}" for i in ids])
+        by_email = _measure(database.get_user_by_email, [f"user{i}@example.com" for i in ids])
+        print(f"{size:>10} {by_username:>16.3f} {by_email:>14.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -2,6 +2,38 @@
 import sys
 from pathlib import Path
 
+import pytest
+
 ROOT = Path(__file__).resolve().parents[1]  # корень репозитория
 if str(ROOT) not in sys.path:
     sys.path.insert(0, str(ROOT))
+
+from app import database  # noqa: E402
+from app.security.auth import create_access_token  # noqa: E402
+from app.storage.memory import MemoryStorage  # noqa: E402
+
+
+@pytest.fixture
+def store():
+    """Свежий in-memory движок приложения на время теста."""
+    storage = MemoryStorage()
+    previous = database.set_engine(storage)
+    yield storage
+    database.set_engine(previous)
+
+
+@pytest.fixture
+def auth_headers():
+    """Заголовки запроса с access-токеном пользователя.
+
+    auth_headers(user, role=None, **extra): role добавляется в claims
+    токена, extra — дополнительные заголовки.
+    """
+
+    def make(user, role=None, **extra) -> dict:
+        claims = {"sub": str(user.id)}
+        if role is not None:
+            claims["role"] = role
+        return {"Authorization": f"Bearer {create_access_token(claims)}", **extra}
+
+    return make
@@ -0,0 +1,73 @@
+"""Тесты async API хранилища: медленный движок не блокирует event loop."""
+
+import asyncio
+import threading
+import time
+
+import httpx
+import pytest
+
+from app import database
+from app.main import app
+from app.storage.memory import MemoryStorage
+
+SLOW_DELAY = 0.5
+
+
+class SlowStorage(MemoryStorage):
+    """Блокирующий движок, у которого чтение item по ID занимает SLOW_DELAY."""
+
+    blocking = True
+
+    def get_item_by_id(self, item_id):
+        time.sleep(SLOW_DELAY)
+        return super().get_item_by_id(item_id)
+
+
+@pytest.fixture
+def slow_backend():
+    storage = SlowStorage()
+    previous = database.set_engine(storage)
+    yield storage
+    database.set_engine(previous)
+
+
+def test_blocking_engine_runs_in_executor(slow_backend):
+    """Тест: вызовы блокирующего движка выполняются не в потоке event loop."""
+    calls = []
+
+    def record(item_id):
+        calls.append(threading.current_thread().name)
+        return None
+
+    slow_backend.get_item_by_id = record
+    assert asyncio.run(database.aget_item_by_id(1)) is None
+    assert calls[0].startswith("storage")
+
+
+def test_slow_storage_does_not_stall_other_requests(slow_backend, auth_headers):
+    """Тест: медленный запрос к хранилищу не задерживает остальные запросы."""
+    user = slow_backend.create_user("slowuser", "slow@example.com", "x")
+    item = slow_backend.create_item("Slow", owner_id=user.id)
+    headers = auth_headers(user)
+
+    async def scenario():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as ac:
+            start = time.perf_counter()
+
+            async def timed(coro):
+                response = await coro
+                return response, time.perf_counter() - start
+
+            slow = asyncio.create_task(timed(ac.get(f"/api/v1/items/{item.id}", headers=headers)))
+            await asyncio.sleep(0.05)
+            fast, fast_elapsed = await timed(ac.get("/api/v1/items", headers=headers))
+            slow_response, slow_elapsed = await slow
+            return fast, fast_elapsed, slow_response, slow_elapsed
+
+    fast, fast_elapsed, slow_response, slow_elapsed = asyncio.run(scenario())
+    assert fast.status_code == 200
+    assert slow_response.status_code == 200
+    assert slow_elapsed >= SLOW_DELAY
+    assert fast_elapsed < SLOW_DELAY
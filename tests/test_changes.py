@@ -0,0 +1,207 @@
+"""Тесты ленты изменений items (app.changes и GET /api/v1/items/changes)."""
+
+import asyncio
+import contextlib
+import json
+import threading
+
+from fastapi.testclient import TestClient
+
+from app import database
+from app.changes import ChangeFeed
+from app.main import app
+from app.storage.sqlite import SQLiteStorage
+
+client = TestClient(app)
+
+
+def _events(body: bytes) -> list:
+    """Разобрать кадры SSE в список (id, event, data)."""
+    events = []
+    for frame in body.decode().split("\n\n"):
+        fields = dict(line.split(": ", 1) for line in frame.splitlines() if ": " in line)
+        if "event" in fields:
+            events.append((int(fields["id"]), fields["event"], json.loads(fields["data"])))
+    return events
+
+
+async def _stream(authorization: str, after_seq: int, count: int, action) -> list:
+    """Открыть поток SSE через ASGI, выполнить action и прочитать count событий."""
+    body = bytearray()
+    enough = asyncio.Event()
+    requested = False
+
+    async def receive():
+        nonlocal requested
+        if not requested:
+            requested = True
+            return {"type": "http.request", "body": b"", "more_body": False}
+        await enough.wait()
+        return {"type": "http.disconnect"}
+
+    async def send(message):
+        if message["type"] == "http.response.start":
+            assert message["status"] == 200
+        elif message["type"] == "http.response.body":
+            body.extend(message.get("body", b""))
+            if len(_events(bytes(body))) >= count:
+                enough.set()
+
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": "/api/v1/items/changes",
+        "raw_path": b"/api/v1/items/changes",
+        "root_path": "",
+        "query_string": b"",
+        "headers": [
+            (b"host", b"testserver"),
+            (b"authorization", authorization.encode()),
+            (b"last-event-id", str(after_seq).encode()),
+        ],
+        "client": ("testclient", 50000),
+        "server": ("testserver", 80),
+    }
+    task = asyncio.create_task(app(scope, receive, send))
+    await action()
+    await asyncio.wait_for(task, timeout=5)
+    return _events(bytes(body))
+
+
+def test_feed_read_filters_by_owner():
+    """Тест: read возвращает события владельца после seq, admin — все."""
+    feed = ChangeFeed(capacity=8)
+    feed.publish("create", 1, {"id": 1})
+    feed.publish("create", 2, {"id": 2})
+    feed.publish("delete", 1, {"id": 1})
+
+    frames, last, lost = feed.read(1, 0)
+    assert last == 3 and not lost
+    assert [_events(f.encode())[0][:2] for f in frames] == [(1, "create"), (3, "delete")]
+    assert len(feed.read(None, 1)[0]) == 2
+    assert feed.read(2, 3) == ([], 3, False)
+
+
+def test_feed_reports_lost_events():
+    """Тест: вытесненный из буфера или чужой seq — потеря (reset)."""
+    feed = ChangeFeed(capacity=4)
+    for n in range(10):
+        feed.publish("create", 1, {"id": n})
+
+    assert feed.read(1, 5) == ([], 10, True)
+    assert len(feed.read(1, 6)[0]) == 4
+    assert feed.read(1, 99) == ([], 10, True)
+
+
+def test_feed_loss_is_per_owner():
+    """Тест: события других владельцев, вытеснившие буфер, не сбрасывают владельца."""
+    feed = ChangeFeed(capacity=10)
+    feed.publish("create", 1, {"id": 1})
+    for n in range(20):
+        feed.publish("create", 2, {"id": 100 + n})
+
+    # Событие владельца 1 вытеснено: его подписчик до seq 1 получает reset
+    assert feed.read(1, 0) == ([], 21, True)
+    # Подписчик, уже видевший seq 1, ничего не потерял
+    assert feed.read(1, 1) == ([], 21, False)
+    assert feed.read(3, 0) == ([], 21, False)
+
+    seq = feed.publish("create", 1, {"id": 2})
+    frames, last, lost = feed.read(1, 1)
+    assert not lost and last == seq
+    assert [_events(f.encode())[0][:2] for f in frames] == [(seq, "create")]
+    # Admin видит все события — потеря по общему буферу
+    assert feed.read(None, 1)[2]
+
+
+def test_feed_wakes_only_matching_subscribers():
+    """Тест: публикация из потока будит подписчиков владельца и admin, не других."""
+    feed = ChangeFeed()
+
+    async def scenario():
+        owner = feed.stream(1)
+        other = feed.stream(2)
+        admin = feed.stream(None)
+        first = asyncio.ensure_future(owner.__anext__())
+        pending_other = asyncio.ensure_future(other.__anext__())
+        pending_admin = asyncio.ensure_future(admin.__anext__())
+        await asyncio.sleep(0)
+
+        thread = threading.Thread(target=feed.publish, args=("create", 1, {"id": 7}))
+        thread.start()
+        thread.join()
+        frames = await asyncio.wait_for(asyncio.gather(first, pending_admin), timeout=1)
+        assert all('"id":7' in frame for frame in frames)
+        assert not pending_other.done()
+        pending_other.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await pending_other
+        for stream in (owner, other, admin):
+            await stream.aclose()
+
+    asyncio.run(scenario())
+
+
+def test_changes_endpoint_streams_own_events(store, auth_headers):
+    """Тест: поток SSE отдаёт только свои события с seq, reset при потере."""
+    alice = store.create_user("alice", "alice@example.com", "x")
+    bob = store.create_user("bob", "bob@example.com", "x")
+    start = database.change_feed.last_seq
+    authorization = auth_headers(alice)["Authorization"]
+
+    async def mutate():
+        await database.acreate_item("Bob item", owner_id=bob.id)
+        item = await database.acreate_item("Alice item", owner_id=alice.id)
+        await database.aupdate_item(item.id, name="Renamed")
+        await database.adelete_item(item.id)
+
+    events = asyncio.run(_stream(authorization, start, 3, mutate))
+    assert [event for _, event, _ in events] == ["create", "update", "delete"]
+    assert events[0][2]["name"] == "Alice item" and events[1][2]["name"] == "Renamed"
+    assert events[2][2] == {"id": events[0][2]["id"], "owner_id": alice.id}
+    assert [seq for seq, _, _ in events] == [start + 2, start + 3, start + 4]
+
+    async def create_more():
+        await database.acreate_item("More", owner_id=alice.id)
+
+    # Продолжение с последнего полученного события: приходят только новые
+    resumed = asyncio.run(_stream(authorization, start + 4, 1, create_more))
+    assert [(seq, event) for seq, event, _ in resumed] == [(start + 5, "create")]
+
+    async def nothing():
+        pass
+
+    # Last-Event-ID из будущего (другой запуск процесса) — reset
+    reset = asyncio.run(_stream(authorization, start + 1000, 1, nothing))
+    assert reset == [(start + 5, "reset", {})]
+
+
+def test_changes_endpoint_rejects_invalid_last_event_id(store, auth_headers):
+    """Тест: нечисловой Last-Event-ID — 422."""
+    user = store.create_user("carol", "carol@example.com", "x")
+    r = client.get(
+        "/api/v1/items/changes",
+        headers=auth_headers(user, **{"Last-Event-ID": "abc"}),
+    )
+    assert r.status_code == 422
+
+
+def test_changes_are_off_for_multi_process_engines(tmp_path, auth_headers):
+    """Тест: с движком, общим для воркеров, лента не ведётся и эндпойнт отвечает 501."""
+    storage = SQLiteStorage(str(tmp_path / "app.db"))
+    previous = database.set_engine(storage)
+    try:
+        user = storage.create_user("dave", "dave@example.com", "x")
+        start = database.change_feed.last_seq
+        item = database.create_item("Item", owner_id=user.id)
+        database.delete_item(item.id)
+        assert database.change_feed.last_seq == start
+
+        r = client.get("/api/v1/items/changes", headers=auth_headers(user))
+        assert r.status_code == 501
+    finally:
+        database.set_engine(previous)
+        storage.close()
@@ -0,0 +1,114 @@
+"""Многопоточные стресс-тесты хранилища: уникальность id и целостность индексов."""
+
+import sys
+import threading
+
+import pytest
+
+from app import main
+from app.storage.base import VersionConflictError
+from app.storage.memory import MemoryStorage
+
+THREADS = 8
+PER_THREAD = 2000
+
+
+@pytest.fixture(autouse=True)
+def frequent_thread_switches():
+    """Переключать потоки как можно чаще, чтобы проявить гонки."""
+    previous = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    yield
+    sys.setswitchinterval(previous)
+
+
+def _run_threads(target) -> None:
+    barrier = threading.Barrier(THREADS)
+
+    def worker(n):
+        barrier.wait()
+        target(n)
+
+    threads = [threading.Thread(target=worker, args=(n,)) for n in range(THREADS)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+
+def test_concurrent_item_creates_unique_ids():
+    """Стресс-тест: параллельные create/delete не дублируют id и не ломают индексы."""
+    storage = MemoryStorage()
+    created = [[] for _ in range(THREADS)]
+
+    def work(n):
+        for i in range(PER_THREAD):
+            # Половина потоков пишет в общего владельца, половина — в своего
+            owner_id = 1 if n % 2 else n + 2
+            item = storage.create_item(f"t{n}-{i}", owner_id=owner_id)
+            created[n].append(item.id)
+            if i % 4 == 0:
+                storage.delete_item(item.id)
+
+    _run_threads(work)
+
+    all_ids = [item_id for ids in created for item_id in ids]
+    assert len(all_ids) == len(set(all_ids)) == THREADS * PER_THREAD
+    alive = {item_id for item_id in all_ids if storage.get_item_by_id(item_id)}
+    listed = [item.id for item in storage.get_items(limit=len(all_ids))]
+    assert listed == sorted(alive)
+    for owner_id in {1, *range(2, THREADS + 2)}:
+        owned = [item.id for item in storage.get_items(owner_id=owner_id, limit=len(all_ids))]
+        assert owned == sorted(i for i in alive if storage.get_item_by_id(i).owner_id == owner_id)
+
+
+def test_concurrent_compare_and_set_loses_no_updates():
+    """Стресс-тест: конкурентные CAS-обновления одного item не теряются."""
+    storage = MemoryStorage()
+    item = storage.create_item("hot", owner_id=1)
+    applied = []
+
+    def work(n):
+        for _ in range(200):
+            while True:
+                version = storage.get_item_by_id(item.id).version
+                try:
+                    storage.update_item(item.id, name=f"t{n}", expected_version=version)
+                except VersionConflictError:
+                    continue
+                applied.append(n)
+                break
+
+    _run_threads(work)
+    assert len(applied) == THREADS * 200
+    assert storage.get_item_by_id(item.id).version == 1 + THREADS * 200
+
+
+def test_concurrent_user_creates_unique():
+    """Стресс-тест: параллельная регистрация одного username проходит один раз."""
+    storage = MemoryStorage()
+    results = []
+
+    def work(n):
+        try:
+            results.append(storage.create_user("race", f"race{n}@example.com", "x").id)
+        except ValueError:
+            pass
+
+    _run_threads(work)
+    assert len(results) == 1
+
+
+def test_legacy_create_item_unique_ids(monkeypatch):
+    """Стресс-тест: legacy POST /items выдаёт уникальные id из пула потоков."""
+    monkeypatch.setitem(main._DB, "items", [])
+    created = []
+
+    def work(n):
+        for i in range(200):
+            created.append(main.create_item(name=f"legacy {n} {i}")["id"])
+
+    _run_threads(work)
+    assert len(created) == len(set(created))
+    # Поиск по id — индексация плотного списка: каждый id находит свой item
+    assert all(main.get_item(item_id)["id"] == item_id for item_id in created)
@@ -0,0 +1,71 @@
+"""Тесты для хранилища данных (индексы, пагинация)."""
+
+import pytest
+
+from app.database import (
+    create_item,
+    create_user,
+    delete_item,
+    get_items,
+    get_user_by_email,
+    get_user_by_username,
+)
+
+
+def test_user_lookup_by_indexes():
+    """Тест: поиск пользователя по username и email через индексы."""
+    user = create_user(username="indexed", email="Indexed@Example.com", hashed_password="x")
+
+    assert get_user_by_username("indexed") is user
+    assert get_user_by_email("indexed@example.com") is user
+    assert get_user_by_email("INDEXED@EXAMPLE.COM") is user
+    assert get_user_by_username("missing") is None
+
+
+def test_create_user_duplicate_rejected():
+    """Негативный тест: индексы не допускают дубликатов username/email."""
+    create_user(username="uniq", email="uniq@example.com", hashed_password="x")
+
+    with pytest.raises(ValueError):
+        create_user(username="uniq", email="other@example.com", hashed_password="x")
+    with pytest.raises(ValueError):
+        create_user(username="other", email="UNIQ@example.com", hashed_password="x")
+    assert get_user_by_username("other") is None
+
+
+def test_get_items_uses_owner_index():
+    """Тест: пагинация по индексу владельца и его обновление при удалении."""
+    owner = create_user(username="pager", email="pager@example.com", hashed_password="x")
+    other = create_user(username="pager2", email="pager2@example.com", hashed_password="x")
+    created = [create_item(name=f"Page {i}", owner_id=owner.id) for i in range(5)]
+    create_item(name="Foreign", owner_id=other.id)
+
+    page = get_items(owner_id=owner.id, limit=2, offset=1)
+    assert [item.id for item in page] == [created[1].id, created[2].id]
+
+    assert delete_item(created[1].id) is True
+    assert delete_item(created[1].id) is False
+    page = get_items(owner_id=owner.id, limit=10, offset=0)
+    assert [item.id for item in page] == [created[0].id] + [i.id for i in created[2:]]
+
+
+def test_get_items_admin_listing():
+    """Тест: admin видит items всех владельцев в порядке id."""
+    item = create_item(name="Admin visible", owner_id=424242)
+
+    ids = [i.id for i in get_items(owner_id=None, limit=100_000, offset=0)]
+    assert item.id in ids
+    assert ids == sorted(ids)
+
+
+def test_get_items_after_id_seek():
+    """Тест: keyset-пагинация начинается с первого id > after_id."""
+    owner_id = 515151
+    created = [create_item(name=f"Seek {i}", owner_id=owner_id) for i in range(4)]
+
+    page = get_items(owner_id=owner_id, limit=2, after_id=created[0].id)
+    assert [item.id for item in page] == [created[1].id, created[2].id]
+
+    delete_item(created[1].id)
+    page = get_items(owner_id=owner_id, limit=2, after_id=created[1].id)
+    assert [item.id for item in page] == [created[2].id, created[3].id]
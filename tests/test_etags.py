@@ -0,0 +1,135 @@
+"""Тесты ETag: условные GET (304) и If-Match (412) для items."""
+
+from fastapi.testclient import TestClient
+
+from app import database
+from app.api.v1 import items as items_api
+from app.main import app
+
+client = TestClient(app)
+
+
+def test_item_conditional_get(store, auth_headers):
+    """Тест: 304 при совпадении ETag, новый ETag после изменения."""
+    user = store.create_user("etaguser", "etag@example.com", "x")
+    item = store.create_item("Tagged", owner_id=user.id)
+    headers = auth_headers(user)
+
+    r = client.get(f"/api/v1/items/{item.id}", headers=headers)
+    etag = r.headers["ETag"]
+    assert r.status_code == 200 and etag.startswith('"')
+
+    r = client.get(f"/api/v1/items/{item.id}", headers={**headers, "If-None-Match": etag})
+    assert r.status_code == 304 and r.content == b"" and r.headers["ETag"] == etag
+    weak = {**headers, "If-None-Match": f'"other", W/{etag}'}
+    assert client.get(f"/api/v1/items/{item.id}", headers=weak).status_code == 304
+
+    client.patch(f"/api/v1/items/{item.id}", json={"name": "Retagged"}, headers=headers)
+    r = client.get(f"/api/v1/items/{item.id}", headers={**headers, "If-None-Match": etag})
+    assert r.status_code == 200 and r.headers["ETag"] != etag
+    assert r.json()["name"] == "Retagged"
+
+
+def test_conditional_get_does_not_build_body_on_cache_miss(store, auth_headers, monkeypatch):
+    """Тест: при выключенном кэше 304 отдаётся без построения ItemResponse."""
+    monkeypatch.setattr(database.item_cache, "max_entries", 0)
+    user = store.create_user("etagmiss", "etagmiss@example.com", "x")
+    item = store.create_item("Uncached", owner_id=user.id)
+    headers = auth_headers(user)
+    etag = _etag(headers, item.id)
+
+    def no_body(**fields):
+        raise AssertionError("ItemResponse must not be built for 304")
+
+    monkeypatch.setattr(items_api, "ItemResponse", no_body)
+    r = client.get(f"/api/v1/items/{item.id}", headers={**headers, "If-None-Match": etag})
+    assert r.status_code == 304 and r.headers["ETag"] == etag
+
+
+def test_item_conditional_get_checks_access_first(store, auth_headers):
+    """Тест: чужой item с верным ETag — 403, а не 304."""
+    owner = store.create_user("etagowner", "etagowner@example.com", "x")
+    stranger = store.create_user("etagstranger", "etagstranger@example.com", "x")
+    item = store.create_item("Private", owner_id=owner.id)
+    etag = _etag(auth_headers(owner), item.id)
+
+    r = client.get(
+        f"/api/v1/items/{item.id}", headers=auth_headers(stranger, **{"If-None-Match": etag})
+    )
+    assert r.status_code == 403
+
+
+def test_list_conditional_get(store, auth_headers):
+    """Тест: ETag списка меняется при изменении своего набора, но не чужого."""
+    alice = store.create_user("alice", "alice@example.com", "x")
+    bob = store.create_user("bob", "bob@example.com", "x")
+    admin = store.create_user("root", "root@example.com", "x", "admin")
+    store.create_item("Alice 1", owner_id=alice.id)
+
+    alice_etag = client.get("/api/v1/items", headers=auth_headers(alice)).headers["ETag"]
+    admin_etag = client.get("/api/v1/items", headers=auth_headers(admin)).headers["ETag"]
+    alice_cond = auth_headers(alice, **{"If-None-Match": alice_etag})
+    admin_cond = auth_headers(admin, **{"If-None-Match": admin_etag})
+    assert client.get("/api/v1/items", headers=alice_cond).status_code == 304
+    assert client.get("/api/v1/items?limit=5", headers=alice_cond).status_code == 200
+
+    store.create_item("Bob 1", owner_id=bob.id)
+    assert client.get("/api/v1/items", headers=alice_cond).status_code == 304
+    r = client.get("/api/v1/items", headers=admin_cond)
+    assert r.status_code == 200 and len(r.json()) == 2
+
+    store.create_item("Alice 2", owner_id=alice.id)
+    r = client.get("/api/v1/items", headers=alice_cond)
+    assert r.status_code == 200 and len(r.json()) == 2
+
+
+def test_patch_with_if_match(store, auth_headers):
+    """Тест: PATCH с актуальным ETag проходит, с устаревшим — 412."""
+    user = store.create_user("ifmatch", "ifmatch@example.com", "x")
+    headers = auth_headers(user)
+    item_id = client.post("/api/v1/items", json={"name": "V1"}, headers=headers).json()["id"]
+    etag = _etag(headers, item_id)
+
+    r = client.patch(
+        f"/api/v1/items/{item_id}",
+        json={"name": "V2"},
+        headers={**headers, "If-Match": etag},
+    )
+    assert r.status_code == 200 and r.headers["ETag"] != etag
+
+    r = client.patch(
+        f"/api/v1/items/{item_id}",
+        json={"name": "Lost update"},
+        headers={**headers, "If-Match": etag},
+    )
+    assert r.status_code == 412
+    assert r.headers["content-type"].startswith("application/problem+json")
+    assert client.get(f"/api/v1/items/{item_id}", headers=headers).json()["name"] == "V2"
+
+    star = {**headers, "If-Match": "*"}
+    r = client.patch(f"/api/v1/items/{item_id}", json={"name": "V3"}, headers=star)
+    assert r.status_code == 200
+    listed = {**headers, "If-Match": f'"stale", {_etag(headers, item_id)}'}
+    r = client.patch(f"/api/v1/items/{item_id}", json={"name": "V4"}, headers=listed)
+    assert r.status_code == 200
+    weak = {**headers, "If-Match": f"W/{_etag(headers, item_id)}"}
+    r = client.patch(f"/api/v1/items/{item_id}", json={"name": "V5"}, headers=weak)
+    assert r.status_code == 412
+
+
+def test_delete_with_if_match(store, auth_headers):
+    """Тест: DELETE с устаревшим ETag — 412, с актуальным — 204."""
+    user = store.create_user("ifmatchdel", "ifmatchdel@example.com", "x")
+    headers = auth_headers(user)
+    created = client.post("/api/v1/items", json={"name": "Doomed"}, headers=headers)
+    item_id, etag = created.json()["id"], created.headers["ETag"]
+    client.patch(f"/api/v1/items/{item_id}", json={"name": "Changed"}, headers=headers)
+
+    stale = {**headers, "If-Match": etag}
+    assert client.delete(f"/api/v1/items/{item_id}", headers=stale).status_code == 412
+    current = {**headers, "If-Match": _etag(headers, item_id)}
+    assert client.delete(f"/api/v1/items/{item_id}", headers=current).status_code == 204
+
+
+def _etag(headers: dict, item_id: int) -> str:
+    return client.get(f"/api/v1/items/{item_id}", headers=headers).headers["ETag"]
@@ -0,0 +1,136 @@
+"""Тесты кэша ответов items (app.cache и GET /api/v1/items/{id})."""
+
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app import database
+from app.cache import CachedItem, ItemResponseCache
+from app.main import app
+from app.storage.memory import MemoryStorage
+from app.storage.sqlite import SQLiteStorage
+
+client = TestClient(app)
+
+
+@pytest.fixture
+def store(store):
+    """Движок приложения из conftest с включённым кэшем."""
+    size = database.item_cache.max_entries
+    database.item_cache.max_entries = 100
+    yield store
+    database.item_cache.max_entries = size
+
+
+def _cached(version: int) -> CachedItem:
+    return CachedItem(owner_id=1, version=version, etag=f'"{version}"', body=b"{}")
+
+
+def test_cache_evicts_least_recently_used():
+    """Тест: сверх лимита вытесняется давно не читавшаяся запись."""
+    cache = ItemResponseCache(max_entries=2, ttl=60)
+    cache.put(1, _cached(1))
+    cache.put(2, _cached(1))
+    assert cache.get(1) is not None
+    cache.put(3, _cached(1))
+
+    assert cache.get(2) is None
+    assert cache.get(1) is not None and cache.get(3) is not None
+    stats = cache.stats()
+    assert stats["entries"] == 2 and stats["evictions"] == 1
+    assert stats["hits"] == 3 and stats["misses"] == 1
+
+
+def test_cache_expires_entries():
+    """Тест: запись старше TTL — промах."""
+    cache = ItemResponseCache(max_entries=10, ttl=0.01)
+    cache.put(1, _cached(1))
+    time.sleep(0.02)
+    assert cache.get(1) is None and cache.stats()["entries"] == 0
+
+
+def test_cache_rejects_stale_bodies_after_invalidation():
+    """Тест: после записи не принимается тело старой версии, после удаления — никакое."""
+    cache = ItemResponseCache(max_entries=10, ttl=60)
+    cache.put(1, _cached(1))
+    cache.invalidate(1, 2)
+    assert cache.get(1) is None
+    cache.put(1, _cached(1))
+    assert cache.get(1) is None
+    cache.put(1, _cached(2))
+    assert cache.get(1).version == 2
+
+    cache.invalidate(1)
+    cache.put(1, _cached(3))
+    assert cache.get(1) is None
+
+
+def test_disabled_cache_stores_nothing():
+    """Тест: max_entries = 0 — кэш выключен."""
+    cache = ItemResponseCache(max_entries=0)
+    cache.put(1, _cached(1))
+    assert cache.get(1) is None and cache.stats()["entries"] == 0
+
+
+def test_cache_is_off_for_multi_process_engines(tmp_path, monkeypatch):
+    """Тест: с движком, общим для воркеров, кэш по умолчанию выключен."""
+    monkeypatch.delenv("ITEM_CACHE_SIZE", raising=False)
+    storage = SQLiteStorage(str(tmp_path / "app.db"))
+    previous = database.set_engine(storage)
+    try:
+        assert database.item_cache.max_entries == 0
+        database.set_engine(MemoryStorage())
+        assert database.item_cache.max_entries > 0
+
+        monkeypatch.setenv("ITEM_CACHE_SIZE", "7")
+        database.set_engine(storage)
+        assert database.item_cache.max_entries == 7
+    finally:
+        database.set_engine(previous)
+        storage.close()
+
+
+def test_item_reads_are_cached_and_invalidated(store, auth_headers):
+    """Тест: повторный GET из кэша, PATCH и DELETE сбрасывают запись."""
+    user = store.create_user("cacheuser", "cache@example.com", "x")
+    item = database.create_item("Cached", owner_id=user.id)
+    url = f"/api/v1/items/{item.id}"
+    hits = database.item_cache.hits
+
+    first = client.get(url, headers=auth_headers(user))
+    second = client.get(url, headers=auth_headers(user))
+    assert second.status_code == 200 and second.json() == first.json()
+    assert second.headers["ETag"] == first.headers["ETag"]
+    assert database.item_cache.hits == hits + 1
+
+    client.patch(url, json={"name": "Renamed"}, headers=auth_headers(user))
+    r = client.get(url, headers=auth_headers(user))
+    assert r.json()["name"] == "Renamed" and r.headers["ETag"] != first.headers["ETag"]
+    r = client.get(url, headers=auth_headers(user, **{"If-None-Match": r.headers["ETag"]}))
+    assert r.status_code == 304
+
+    database.delete_item(item.id)
+    assert client.get(url, headers=auth_headers(user)).status_code == 404
+
+
+def test_cached_item_checks_access(store, auth_headers):
+    """Тест: ответ из кэша не отдаётся чужому пользователю."""
+    owner = store.create_user("cacheowner", "cacheowner@example.com", "x")
+    stranger = store.create_user("cachestranger", "cachestranger@example.com", "x")
+    item = store.create_item("Private", owner_id=owner.id)
+    url = f"/api/v1/items/{item.id}"
+
+    assert client.get(url, headers=auth_headers(owner)).status_code == 200
+    assert client.get(url, headers=auth_headers(stranger)).status_code == 403
+
+
+def test_cache_stats_endpoint_is_admin_only(store, auth_headers):
+    """Тест: счётчики кэша доступны только admin."""
+    user = store.create_user("statsuser", "statsuser@example.com", "x")
+    admin = store.create_user("statsadmin", "statsadmin@example.com", "x", "admin")
+
+    assert client.get("/api/v1/items/cache-stats", headers=auth_headers(user)).status_code == 403
+    r = client.get("/api/v1/items/cache-stats", headers=auth_headers(admin))
+    assert r.status_code == 200
+    assert {"entries", "hits", "misses", "evictions", "invalidations"} <= r.json().keys()
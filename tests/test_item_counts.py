@@ -0,0 +1,39 @@
+"""Тесты счётчиков items: X-Total-Count и GET /api/v1/items/stats."""
+
+from fastapi.testclient import TestClient
+
+from app.main import app
+
+client = TestClient(app)
+
+
+def test_list_items_reports_total_count(store, auth_headers):
+    """Тест: X-Total-Count — число всех items пользователя, а не страницы."""
+    user = store.create_user("countuser", "count@example.com", "x")
+    other = store.create_user("countother", "countother@example.com", "x")
+    admin = store.create_user("countadmin", "countadmin@example.com", "x", "admin")
+    store.create_items([(f"Item {n}", user.id, None) for n in range(5)])
+    store.create_item("Foreign", owner_id=other.id)
+
+    r = client.get("/api/v1/items?limit=2", headers=auth_headers(user))
+    assert len(r.json()) == 2 and r.headers["X-Total-Count"] == "5"
+    r = client.get("/api/v1/items", headers=auth_headers(admin))
+    assert r.headers["X-Total-Count"] == "6"
+
+    item_id = r.json()[0]["id"]
+    client.delete(f"/api/v1/items/{item_id}", headers=auth_headers(user))
+    r = client.get("/api/v1/items?limit=2", headers=auth_headers(user))
+    assert r.headers["X-Total-Count"] == "4"
+
+
+def test_item_stats_endpoint(store, auth_headers):
+    """Тест: admin получает счётчики items, обычный пользователь — 403."""
+    user = store.create_user("statsowner", "statsowner@example.com", "x")
+    admin = store.create_user("statsroot", "statsroot@example.com", "x", "admin")
+    store.create_items([("A", user.id, None), ("B", user.id, None), ("C", admin.id, None)])
+
+    assert client.get("/api/v1/items/stats", headers=auth_headers(user)).status_code == 403
+    r = client.get("/api/v1/items/stats", headers=auth_headers(admin))
+    assert r.json() == {"total_items": 3, "owners": 2, "owner_items": None}
+    r = client.get(f"/api/v1/items/stats?owner_id={user.id}", headers=auth_headers(admin))
+    assert r.json()["owner_items"] == 2
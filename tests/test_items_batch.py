@@ -0,0 +1,101 @@
+"""Тесты пакетных эндпойнтов items (create/update/delete)."""
+
+from fastapi.testclient import TestClient
+
+from app.api.v1.items import MAX_BATCH_SIZE
+from app.main import app
+
+client = TestClient(app)
+
+
+def _register(username: str) -> dict:
+    r = client.post(
+        "/api/v1/auth/register",
+        json={
+            "username": username,
+            "email": f"{username}@example.com",
+            "password": "securepassword123",
+        },
+    )
+    return {"Authorization": f"Bearer {r.json()['access_token']}"}
+
+
+def test_batch_create_with_per_entry_results():
+    """Тест: пакетное создание, невалидная запись не мешает остальным."""
+    headers = _register("batchcreator")
+    r = client.post(
+        "/api/v1/items:batch",
+        json={
+            "items": [
+                {"name": "Batch 1", "description": "first"},
+                {"name": "<script>alert(1)</script>"},
+                {"name": "Batch 3"},
+            ]
+        },
+        headers=headers,
+    )
+    assert r.status_code == 200
+    results = r.json()["results"]
+    assert [res["status"] for res in results] == [201, 422, 201]
+    assert results[0]["item"]["description"] == "first"
+    assert results[1]["item"] is None and "dangerous" in results[1]["detail"]
+    assert results[2]["id"] > results[0]["id"]
+
+    r = client.get(f"/api/v1/items/{results[2]['id']}", headers=headers)
+    assert r.json()["name"] == "Batch 3"
+
+
+def test_batch_update_authorizes_each_entry():
+    """Тест: пакетное обновление своих, чужих и отсутствующих items."""
+    owner = _register("batchupdater")
+    stranger = _register("batchstranger")
+    own = client.post("/api/v1/items", json={"name": "Own"}, headers=owner).json()["id"]
+    foreign = client.post("/api/v1/items", json={"name": "Foreign"}, headers=stranger).json()["id"]
+
+    r = client.patch(
+        "/api/v1/items:batch",
+        json={
+            "items": [
+                {"id": own, "name": "Own renamed"},
+                {"id": foreign, "name": "Hacked"},
+                {"id": 10**9, "name": "Missing"},
+                {"id": own, "name": ""},
+                {"id": 0, "name": "Zero"},
+            ]
+        },
+        headers=owner,
+    )
+    assert r.status_code == 200
+    assert [res["status"] for res in r.json()["results"]] == [200, 403, 404, 422, 422]
+    assert r.json()["results"][0]["item"]["name"] == "Own renamed"
+    assert client.get(f"/api/v1/items/{foreign}", headers=stranger).json()["name"] == "Foreign"
+
+
+def test_batch_delete():
+    """Тест: пакетное удаление, повтор id в пакете даёт 404."""
+    headers = _register("batchdeleter")
+    created = client.post(
+        "/api/v1/items:batch",
+        json={"items": [{"name": f"Delete {i}"} for i in range(3)]},
+        headers=headers,
+    ).json()["results"]
+    ids = [res["id"] for res in created]
+
+    r = client.request(
+        "DELETE", "/api/v1/items:batch", json={"ids": [ids[0], ids[1], ids[0]]}, headers=headers
+    )
+    assert r.status_code == 200
+    assert [res["status"] for res in r.json()["results"]] == [204, 204, 404]
+    r = client.get("/api/v1/items?limit=100", headers=headers)
+    assert [item["id"] for item in r.json()] == [ids[2]]
+
+
+def test_batch_size_limits():
+    """Негативный тест: пустой и слишком большой пакет отклоняются целиком."""
+    headers = _register("batchlimits")
+    r = client.post("/api/v1/items:batch", json={"items": []}, headers=headers)
+    assert r.status_code == 422
+    too_many = [{"name": f"Item {i}"} for i in range(MAX_BATCH_SIZE + 1)]
+    r = client.post("/api/v1/items:batch", json={"items": too_many}, headers=headers)
+    assert r.status_code == 422
+    assert client.get("/api/v1/items", headers=headers).json() == []
@@ -0,0 +1,149 @@
+"""Тесты WAL и снапшотов in-memory хранилища."""
+
+import threading
+import time
+
+from fastapi.testclient import TestClient
+
+from app import database
+from app.main import app
+from app.storage.journal import SNAPSHOT_FILE, JournaledMemoryStorage
+
+
+def _fill(storage):
+    user = storage.create_user("waluser", "wal@example.com", "hash", "admin")
+    kept = storage.create_item("Kept", owner_id=user.id, description="d")
+    removed = storage.create_item("Removed", owner_id=user.id)
+    storage.update_item(kept.id, name="Renamed")
+    storage.delete_item(removed.id)
+    return user, kept, removed
+
+
+def _assert_restored(storage, user, kept, removed):
+    assert storage.get_user_by_email("WAL@example.com").id == user.id
+    assert storage.get_user_by_username("waluser").role == "admin"
+    assert storage.get_item_by_id(kept.id).to_dict() == {
+        "id": kept.id,
+        "name": "Renamed",
+        "owner_id": user.id,
+        "description": "d",
+    }
+    assert storage.get_item_by_id(kept.id).version == 2
+    assert storage.get_item_by_id(removed.id) is None
+    assert [i.id for i in storage.get_items(owner_id=user.id)] == [kept.id]
+    # Удалённый последним id не выдаётся повторно
+    assert storage.create_item("Next", owner_id=user.id).id > removed.id
+
+
+def test_recover_from_wal(tmp_path):
+    """Тест: состояние восстанавливается проигрыванием журнала."""
+    storage = JournaledMemoryStorage(str(tmp_path))
+    user, kept, removed = _fill(storage)
+    storage.close()
+
+    reopened = JournaledMemoryStorage(str(tmp_path))
+    _assert_restored(reopened, user, kept, removed)
+    reopened.close()
+
+
+def test_recover_from_snapshot_and_wal_tail(tmp_path):
+    """Тест: снапшот + хвост журнала, старые сегменты удаляются."""
+    storage = JournaledMemoryStorage(str(tmp_path))
+    user, kept, removed = _fill(storage)
+    storage.snapshot()
+    tail = storage.create_item("Tail", owner_id=user.id)
+    storage.close()
+
+    assert (tmp_path / SNAPSHOT_FILE).exists()
+    assert len(list(tmp_path.glob("wal-*.jsonl"))) == 1
+
+    reopened = JournaledMemoryStorage(str(tmp_path))
+    assert reopened.get_item_by_id(tail.id).name == "Tail"
+    reopened.delete_item(tail.id)
+    _assert_restored(reopened, user, kept, removed)
+    reopened.close()
+
+
+def test_periodic_snapshot(tmp_path):
+    """Тест: снапшот создаётся автоматически после snapshot_every записей."""
+    storage = JournaledMemoryStorage(str(tmp_path), snapshot_every=10)
+    for i in range(25):
+        storage.create_item(f"Item {i}", owner_id=1)
+    deadline = time.monotonic() + 5
+    while not (tmp_path / SNAPSHOT_FILE).exists() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    storage.close()
+
+    assert (tmp_path / SNAPSHOT_FILE).exists()
+    reopened = JournaledMemoryStorage(str(tmp_path))
+    assert len(reopened.get_items(limit=100)) == 25
+    reopened.close()
+
+
+def test_truncated_wal_tail_ignored(tmp_path):
+    """Тест: недописанная последняя запись журнала не ломает восстановление."""
+    storage = JournaledMemoryStorage(str(tmp_path))
+    item = storage.create_item("Durable", owner_id=1)
+    storage.close()
+    segment = sorted(tmp_path.glob("wal-*.jsonl"))[-1]
+    with open(segment, "a", encoding="utf-8") as f:
+        f.write('["ci", 99, "Tor')
+
+    reopened = JournaledMemoryStorage(str(tmp_path))
+    assert reopened.get_item_by_id(item.id).name == "Durable"
+    assert reopened.get_item_by_id(99) is None
+    reopened.close()
+
+
+def test_repeated_create_record_is_idempotent(tmp_path):
+    """Тест: повтор записи ["ci", ...] не дублирует item в индексах и счётчиках."""
+    storage = JournaledMemoryStorage(str(tmp_path))
+    first = storage.create_item("First", owner_id=1)
+    second = storage.create_item("Second", owner_id=1)
+    storage.close()
+    segment = sorted(tmp_path.glob("wal-*.jsonl"))[-1]
+    with open(segment, "a", encoding="utf-8") as f:
+        f.write(f'["ci", {second.id}, "Second", 1, null]\n')
+
+    reopened = JournaledMemoryStorage(str(tmp_path))
+    assert [i.id for i in reopened.get_items(limit=10)] == [first.id, second.id]
+    assert reopened.count_items() == 2 and reopened.count_items(owner_id=1) == 2
+    reopened.close()
+
+
+def test_snapshot_during_writes_loses_and_duplicates_nothing(tmp_path):
+    """Тест: записи, идущие во время снапшотов, восстанавливаются ровно один раз."""
+    storage = JournaledMemoryStorage(str(tmp_path), fsync_interval=0.001)
+
+    def writer():
+        for n in range(2000):
+            storage.create_item(f"Item {n}", owner_id=n % 3 + 1)
+
+    thread = threading.Thread(target=writer)
+    thread.start()
+    while thread.is_alive():
+        storage.snapshot()
+    thread.join()
+    storage.close()
+
+    reopened = JournaledMemoryStorage(str(tmp_path))
+    assert [i.id for i in reopened.get_items(limit=5000)] == list(range(1, 2001))
+    assert reopened.count_items() == 2000
+    reopened.close()
+
+
+def test_app_shutdown_flushes_journal(tmp_path, auth_headers):
+    """Тест: остановка приложения дописывает подтверждённые записи на диск."""
+    storage = JournaledMemoryStorage(str(tmp_path), fsync_interval=60)
+    previous = database.set_engine(storage)
+    try:
+        user = storage.create_user("shutdown", "shutdown@example.com", "x")
+        with TestClient(app) as client:
+            r = client.post("/api/v1/items", json={"name": "Acked"}, headers=auth_headers(user))
+            assert r.status_code == 201
+    finally:
+        database.set_engine(previous)
+
+    reopened = JournaledMemoryStorage(str(tmp_path))
+    assert reopened.get_item_by_id(r.json()["id"]).name == "Acked"
+    reopened.close()
@@ -0,0 +1,90 @@
+"""Тесты кодека HS256 (app.security.jwt_hs256) и совместимости с python-jose."""
+
+import json
+import time
+from datetime import datetime, timedelta
+
+import pytest
+from jose import jwt
+
+from app.security import auth
+from app.security.jwt_hs256 import HS256Codec, b64url_encode, supports_key
+
+KEY = "test-secret"
+
+
+def _token(header: dict, claims: dict, key: str = KEY) -> str:
+    """Токен с произвольным заголовком, подписанный HS256."""
+    return jwt.encode(claims, key, algorithm="HS256", headers=header)
+
+
+@pytest.mark.parametrize("key", [KEY, "k" * 100, "ключ"])
+def test_encode_matches_jose_byte_for_byte(key):
+    """Тест: токены совпадают с jose, включая exp из datetime и длинный ключ."""
+    codec = HS256Codec(key)
+    exp = datetime.utcnow() + timedelta(minutes=5)
+    claims = {"sub": "42", "role": "admin", "name": "Имя", "jti": "abc", "exp": exp}
+    assert codec.encode(dict(claims)) == jwt.encode(dict(claims), key, algorithm="HS256")
+
+    token = jwt.encode(dict(claims), key, algorithm="HS256")
+    assert codec.decode(token) == jwt.decode(token, key, algorithms=["HS256"])
+
+
+def test_decode_rejects_algorithm_confusion():
+    """Тест: alg none, другие алгоритмы и crit отклоняются."""
+    codec = HS256Codec(KEY)
+    claims = {"sub": "1"}
+    payload = b64url_encode(json.dumps(claims).encode()).decode()
+    none_header = b64url_encode(b'{"alg":"none","typ":"JWT"}').decode()
+    assert codec.decode(f"{none_header}.{payload}.") is None
+
+    assert codec.decode(jwt.encode(claims, KEY, algorithm="HS512")) is None
+    assert codec.decode(_token({"alg": "HS256", "crit": ["exp"]}, claims)) is None
+    assert codec.decode(_token({"typ": "JOSE"}, claims)) is None
+    # Допустимый заголовок в другой записи принимается
+    assert codec.decode(_token({"kid": "1"}, claims)) == claims
+
+
+def test_decode_rejects_tampering_and_malformed():
+    """Тест: подмена подписи/payload, чужой ключ и неверный base64url."""
+    codec = HS256Codec(KEY)
+    token = codec.encode({"sub": "1"})
+    header, payload, signature = token.split(".")
+    forged = b64url_encode(b'{"sub":"2"}').decode()
+    assert codec.decode(f"{header}.{forged}.{signature}") is None
+    assert codec.decode(HS256Codec("other").encode({"sub": "1"})) is None
+    assert codec.decode(token + "=") is None
+    assert codec.decode(f"{token}.x") is None
+    assert codec.decode(f"{header}.{payload}") is None
+    assert codec.decode("токен") is None
+
+
+def test_decode_validates_claims_like_jose():
+    """Тест: exp, nbf, типы sub/jti, aud без audience."""
+    codec = HS256Codec(KEY)
+    now = int(time.time())
+    assert codec.decode(codec.encode({"exp": now - 1})) is None
+    assert codec.decode(codec.encode({"exp": now + 60}))["exp"] == now + 60
+    assert codec.decode(codec.encode({"nbf": now + 60})) is None
+    assert codec.decode(codec.encode({"exp": "soon"})) is None
+    assert codec.decode(codec.encode({"sub": 1})) is None
+    assert codec.decode(codec.encode({"jti": 1})) is None
+    assert codec.decode(codec.encode({"aud": "api"})) is None
+
+
+def test_supports_key_defers_to_jose():
+    """Тест: JSON-ключи и асимметричные ключи остаются python-jose."""
+    assert supports_key(KEY)
+    assert not supports_key('{"kty": "oct", "k": "abc"}')
+    assert not supports_key("12345")
+    assert not supports_key("-----BEGIN PUBLIC KEY-----\nabc")
+
+
+def test_auth_falls_back_to_jose(monkeypatch):
+    """Тест: без кодека create/decode_access_token работают через jose."""
+    fast = auth.create_access_token({"sub": "5"})
+    monkeypatch.setattr(auth, "_codec", None)
+    slow = auth.create_access_token({"sub": "5"})
+    assert auth.decode_access_token(fast)["sub"] == 5
+    monkeypatch.undo()
+    assert auth.decode_access_token(slow)["sub"] == 5
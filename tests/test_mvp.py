@@ -355,3 +355,72 @@ def test_delete_item():
         headers={"Authorization": f"Bearer {token}"},
     )
     assert r.status_code == 404
+
+
+def test_register_duplicate_email_case_insensitive():
+    """Негативный тест: email сравнивается без учёта регистра."""
+    client.post(
+        "/api/v1/auth/register",
+        json={
+            "username": "caseemail1",
+            "email": "CaseEmail@example.com",
+            "password": "securepassword123",
+        },
+    )
+    r = client.post(
+        "/api/v1/auth/register",
+        json={
+            "username": "caseemail2",
+            "email": "caseemail@EXAMPLE.com",
+            "password": "securepassword123",
+        },
+    )
+    assert r.status_code == 409
+
+
+def test_list_items_cursor_pagination():
+    """Тест: keyset-пагинация по курсору устойчива к удалению items."""
+    r = client.post(
+        "/api/v1/auth/register",
+        json={
+            "username": "cursoruser",
+            "email": "cursor@example.com",
+            "password": "securepassword123",
+        },
+    )
+    headers = {"Authorization": f"Bearer {r.json()['access_token']}"}
+    ids = [
+        client.post("/api/v1/items", json={"name": f"Cursor {i}"}, headers=headers).json()["id"]
+        for i in range(5)
+    ]
+
+    r = client.get("/api/v1/items?limit=2", headers=headers)
+    assert [item["id"] for item in r.json()] == ids[:2]
+    cursor = r.headers["X-Next-Cursor"]
+
+    # Удаление уже просмотренного item не сдвигает следующую страницу
+    client.delete(f"/api/v1/items/{ids[0]}", headers=headers)
+    r = client.get(f"/api/v1/items?limit=2&cursor={cursor}", headers=headers)
+    assert [item["id"] for item in r.json()] == ids[2:4]
+
+    r = client.get(f"/api/v1/items?limit=2&cursor={r.headers['X-Next-Cursor']}", headers=headers)
+    assert [item["id"] for item in r.json()] == ids[4:]
+    assert "X-Next-Cursor" not in r.headers
+
+
+def test_list_items_invalid_cursor():
+    """Негативный тест: некорректный курсор и курсор вместе с offset."""
+    r = client.post(
+        "/api/v1/auth/register",
+        json={
+            "username": "badcursor",
+            "email": "badcursor@example.com",
+            "password": "securepassword123",
+        },
+    )
+    headers = {"Authorization": f"Bearer {r.json()['access_token']}"}
+
+    r = client.get("/api/v1/items?cursor=not-a-cursor", headers=headers)
+    assert r.status_code == 422
+    r = client.get("/api/v1/items?cursor=aWQ6MQ&offset=5", headers=headers)
+    assert r.status_code == 422
@@ -0,0 +1,132 @@
+"""Тесты выгрузки и загрузки items в NDJSON (/api/v1/items/export и /import)."""
+
+import asyncio
+import json
+
+from fastapi.testclient import TestClient
+
+from app import database
+from app.api.v1 import items as items_api
+from app.api.v1.items import ndjson_lines
+from app.main import app
+from app.storage.sqlite import SQLiteStorage
+
+client = TestClient(app)
+
+
+def test_export_streams_all_items(store, monkeypatch, auth_headers):
+    """Тест: выгрузка отдаёт все items по страницам, по строке JSON на item."""
+    monkeypatch.setattr(items_api, "EXPORT_PAGE_SIZE", 3)
+    admin = store.create_user("exportadmin", "exportadmin@example.com", "x", "admin")
+    user = store.create_user("exportuser", "exportuser@example.com", "x")
+    entries = [(f"Товар {n}", user.id if n % 2 else admin.id, f"d{n}") for n in range(7)]
+    entries[3] = ("Без описания", user.id, None)
+    entries[5] = ('Кавычки " и \\', admin.id, "строка\nвторая\t😀")
+    created = store.create_items(entries)
+    store.delete_item(created[4].id)
+
+    r = client.get("/api/v1/items/export", headers=auth_headers(admin))
+    assert r.status_code == 200
+    assert r.headers["content-type"].startswith("application/x-ndjson")
+    lines = r.content.decode().splitlines()
+    expected = [
+        items_api.ItemResponse(**item.to_dict()).model_dump()
+        for item in created
+        if item.id != created[4].id
+    ]
+    assert [json.loads(line) for line in lines] == expected
+    assert r.content.endswith(b"\n")
+
+
+def test_export_requires_admin(store, auth_headers):
+    """Тест: выгрузка недоступна обычному пользователю."""
+    user = store.create_user("exportplain", "exportplain@example.com", "x")
+    assert client.get("/api/v1/items/export", headers=auth_headers(user)).status_code == 403
+
+
+def test_ndjson_lines_split_across_chunks(monkeypatch):
+    """Тест: строки собираются из блоков тела, слишком длинные заменяются None."""
+    monkeypatch.setattr(items_api, "MAX_IMPORT_LINE_BYTES", 8)
+
+    async def collect(chunks):
+        async def body():
+            for chunk in chunks:
+                yield chunk
+
+        return [line async for lines in ndjson_lines(body()) for line in lines]
+
+    assert asyncio.run(collect([b"ab", b"c\nde\n", b"f"])) == [b"abc", b"de", b"f"]
+    assert asyncio.run(collect([b"1234567", b"89abc", b"def\nok\n"])) == [None, b"ok"]
+    assert asyncio.run(collect([b"ok\n0123456789\nok"])) == [b"ok", None, b"ok"]
+    assert asyncio.run(collect([b"0123456789"])) == [None]
+
+
+def test_import_creates_items_and_reports_errors(store, monkeypatch, auth_headers):
+    """Тест: корректные строки создаются пакетами, ошибочные — в errors с номером строки."""
+    monkeypatch.setattr(items_api, "IMPORT_CHUNK_SIZE", 2)
+    admin = store.create_user("importadmin", "importadmin@example.com", "x", "admin")
+    user = store.create_user("importuser", "importuser@example.com", "x")
+    lines = [
+        json.dumps({"name": "Первый", "description": "d"}),
+        json.dumps({"id": 99, "name": "Второй", "owner_id": user.id, "description": None}),
+        "",
+        "{not json",
+        json.dumps({"name": "", "owner_id": user.id}),
+        json.dumps({"name": "Чужой", "owner_id": 12345}),
+        json.dumps(["name"]),
+        json.dumps({"name": "Третий", "owner_id": user.id}),
+        json.dumps({"name": "x" * 101}),
+    ]
+    body = "\n".join(lines).encode()
+
+    r = client.post("/api/v1/items/import", content=body, headers=auth_headers(admin))
+    assert r.status_code == 200
+    result = r.json()
+    assert result["created"] == 3 and result["failed"] == 5
+    assert [error["line"] for error in result["errors"]] == [4, 5, 6, 7, 9]
+    assert result["errors"][2]["detail"] == "Unknown owner_id"
+
+    names = [(item.name, item.owner_id) for item in store.get_items(limit=10)]
+    assert names == [("Первый", admin.id), ("Второй", user.id), ("Третий", user.id)]
+    assert database.search_items("Второй")[0].owner_id == user.id
+
+
+def test_import_round_trips_export(store, auth_headers):
+    """Тест: выгрузка загружается обратно без ошибок."""
+    admin = store.create_user("roundadmin", "roundadmin@example.com", "x", "admin")
+    store.create_items([(f"Item {n}", admin.id, f"Описание {n}") for n in range(5)])
+
+    exported = client.get("/api/v1/items/export", headers=auth_headers(admin)).content
+    r = client.post("/api/v1/items/import", content=exported, headers=auth_headers(admin))
+    assert r.json() == {"created": 5, "failed": 0, "errors": []}
+    assert store.count_items(admin.id) == 10
+
+
+def test_import_requires_admin(store, auth_headers):
+    """Тест: загрузка недоступна обычному пользователю."""
+    user = store.create_user("importplain", "importplain@example.com", "x")
+    r = client.post("/api/v1/items/import", content=b'{"name": "x"}', headers=auth_headers(user))
+    assert r.status_code == 403 and store.count_items() == 0
+
+
+def test_import_rejects_owner_id_out_of_range(tmp_path, auth_headers):
+    """Тест: owner_id вне диапазона — ошибка строки, а не 500 (движок sqlite)."""
+    storage = SQLiteStorage(str(tmp_path / "app.db"))
+    previous = database.set_engine(storage)
+    try:
+        admin = storage.create_user("rangeadmin", "rangeadmin@example.com", "x", "admin")
+        lines = [
+            json.dumps({"name": "Huge", "owner_id": 2**70}),
+            json.dumps({"name": "Zero", "owner_id": 0}),
+            json.dumps({"name": "Fine"}),
+        ]
+        body = "\n".join(lines).encode()
+        r = client.post("/api/v1/items/import", content=body, headers=auth_headers(admin))
+        assert r.status_code == 200
+        result = r.json()
+        assert result["created"] == 1 and result["failed"] == 2
+        assert [error["line"] for error in result["errors"]] == [1, 2]
+        assert "overflow" in result["errors"][0]["detail"]
+    finally:
+        database.set_engine(previous)
+        storage.close()
@@ -0,0 +1,107 @@
+"""Тесты пула хеширования паролей (app.security.auth.PasswordHashPool)."""
+
+import asyncio
+import threading
+
+import httpx
+import pytest
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.security import auth
+from app.security.auth import PasswordHasherBusy, PasswordHashPool
+
+client = TestClient(app)
+
+
+def _blocked_pool(workers: int, max_queue: int):
+    """Пул и событие, до которого операции в пуле не завершаются."""
+    pool = PasswordHashPool(workers=workers, max_queue=max_queue)
+    release = threading.Event()
+    return pool, release, lambda: release.wait(5)
+
+
+def test_pool_runs_off_event_loop():
+    """Тест: операция выполняется в потоке пула, результат возвращается."""
+    pool = PasswordHashPool(workers=1, max_queue=0)
+    name = asyncio.run(pool.run(lambda: threading.current_thread().name))
+    assert name.startswith("argon2") and pool.pending == 0
+
+
+def test_pool_rejects_when_saturated():
+    """Тест: сверх workers + max_queue операций — PasswordHasherBusy, место освобождается."""
+    pool, release, blocked = _blocked_pool(workers=1, max_queue=1)
+
+    async def scenario():
+        running = [asyncio.ensure_future(pool.run(blocked)) for _ in range(2)]
+        await asyncio.sleep(0)
+        assert pool.pending == 2
+        with pytest.raises(PasswordHasherBusy):
+            await pool.run(blocked)
+        release.set()
+        await asyncio.gather(*running)
+        assert pool.pending == 0
+        assert await pool.run(lambda: 42) == 42
+
+    asyncio.run(scenario())
+
+
+def test_pool_keeps_slot_until_cancelled_work_finishes():
+    """Тест: отмена ожидания не освобождает место, пока операция идёт в потоке."""
+    pool, release, blocked = _blocked_pool(workers=1, max_queue=0)
+
+    async def scenario():
+        waiter = asyncio.ensure_future(pool.run(blocked))
+        await asyncio.sleep(0)
+        waiter.cancel()
+        await asyncio.gather(waiter, return_exceptions=True)
+        assert pool.pending == 1
+        with pytest.raises(PasswordHasherBusy):
+            await pool.run(blocked)
+        release.set()
+
+    asyncio.run(scenario())
+    pool._executor.shutdown(wait=True)
+    assert pool.pending == 0
+
+
+def test_login_returns_503_when_hasher_busy(store, monkeypatch):
+    """Тест: при занятом пуле вход отвечает 503 с Retry-After."""
+    r = client.post(
+        "/api/v1/auth/register",
+        json={"username": "pooluser", "email": "pool@example.com", "password": "x" * 12},
+    )
+    assert r.status_code == 201
+
+    pool = PasswordHashPool(workers=1, max_queue=0)
+    pool._pending = pool.limit  # пул заполнен
+    monkeypatch.setattr(auth, "password_hash_pool", pool)
+    r = client.post("/api/v1/auth/login", json={"username": "pooluser", "password": "x" * 12})
+    assert r.status_code == 503 and r.headers["Retry-After"] == "1"
+    assert r.json()["status"] == 503
+
+
+def test_concurrent_register_same_username_returns_409(store):
+    """Тест: параллельная регистрация того же username — 201 и 409, не 500."""
+
+    async def scenario():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as ac:
+            return await asyncio.gather(
+                *(
+                    ac.post(
+                        "/api/v1/auth/register",
+                        json={
+                            "username": "raceuser",
+                            "email": f"race{n}@example.com",
+                            "password": "x" * 12,
+                        },
+                    )
+                    for n in range(2)
+                )
+            )
+
+    responses = asyncio.run(scenario())
+    assert sorted(r.status_code for r in responses) == [201, 409]
+    conflict = next(r for r in responses if r.status_code == 409)
+    assert conflict.json()["detail"] == "Username already registered"
@@ -0,0 +1,109 @@
+"""Тесты отзыва токенов (app.security.revocation и POST /api/v1/auth/logout)."""
+
+import time
+
+from fastapi.testclient import TestClient
+
+from app import database
+from app.main import app
+from app.security.auth import create_access_token, decode_access_token
+from app.security.revocation import BloomFilter, RevocationStore
+from app.storage.sqlite import SQLiteStorage
+
+client = TestClient(app)
+
+
+def test_bloom_filter_has_no_false_negatives():
+    """Тест: добавленные ключи всегда найдены, ложных срабатываний — порядка error_rate."""
+    bloom = BloomFilter(capacity=10_000, error_rate=0.01)
+    keys = [f"jti-{n}" for n in range(10_000)]
+    for key in keys:
+        bloom.add(key)
+    assert all(key in bloom for key in keys)
+    false_positives = sum(f"other-{n}" in bloom for n in range(10_000))
+    assert false_positives < 300
+
+
+def test_store_revokes_until_expiry():
+    """Тест: отозванный jti отклоняется до exp, истёкшие удаляются при очистке."""
+    store = RevocationStore(capacity=4)
+    store.revoke("live", time.time() + 60)
+    store.revoke("short", time.time() + 0.05)
+    store.revoke("expired", time.time() - 1)
+    assert store.is_revoked("live") and store.is_revoked("short")
+    assert not store.is_revoked("expired") and not store.is_revoked("other")
+    assert len(store) == 2
+
+    time.sleep(0.06)
+    assert not store.is_revoked("short")
+    store._next_prune = 0
+    store.prune_if_due()
+    assert len(store) == 1 and store.is_revoked("live")
+
+
+def test_store_grows_past_capacity():
+    """Тест: сверх ёмкости фильтр перестраивается вдвое больше, отзывы сохраняются."""
+    store = RevocationStore(capacity=2)
+    for n in range(5):
+        store.revoke(f"jti-{n}", time.time() + 60)
+    assert store.capacity == 8
+    assert all(store.is_revoked(f"jti-{n}") for n in range(5))
+
+
+def test_tokens_have_unique_jti():
+    """Тест: каждый токен получает свой jti."""
+    first = decode_access_token(create_access_token({"sub": "1"}))
+    second = decode_access_token(create_access_token({"sub": "1"}))
+    assert first["jti"] and first["jti"] != second["jti"]
+
+
+def test_logout_revokes_token():
+    """Тест: после logout токен отклоняется, другие токены пользователя работают."""
+    r = client.post(
+        "/api/v1/auth/register",
+        json={"username": "revokeuser", "email": "revoke@example.com", "password": "x" * 12},
+    )
+    token = r.json()["access_token"]
+    headers = {"Authorization": f"Bearer {token}"}
+    other = client.post(
+        "/api/v1/auth/login", json={"username": "revokeuser", "password": "x" * 12}
+    ).json()["access_token"]
+    assert client.get("/api/v1/items", headers=headers).status_code == 200
+
+    assert client.post("/api/v1/auth/logout", headers=headers).status_code == 200
+    r = client.get("/api/v1/items", headers=headers)
+    assert r.status_code == 401 and r.json()["detail"] == "Token has been revoked"
+    assert r.headers["WWW-Authenticate"] == "Bearer"
+    r = client.get("/api/v1/items", headers={"Authorization": f"Bearer {other}"})
+    assert r.status_code == 200
+
+
+def test_revocation_shared_through_multi_process_engine(tmp_path):
+    """Тест: с движком sqlite отзыв другого воркера виден, logout пишет отзыв в движок."""
+    path = str(tmp_path / "app.db")
+    ours, theirs = SQLiteStorage(path), SQLiteStorage(path)
+    previous = database.set_engine(ours)
+    try:
+        user = theirs.create_user("shared", "shared@example.com", "x")
+        token = create_access_token({"sub": str(user.id)})
+        headers = {"Authorization": f"Bearer {token}"}
+        assert client.get("/api/v1/items", headers=headers).status_code == 200
+
+        payload = decode_access_token(token)
+        theirs.revoke_token(payload["jti"], payload["exp"])
+        r = client.get("/api/v1/items", headers=headers)
+        assert r.status_code == 401 and r.json()["detail"] == "Token has been revoked"
+
+        other = create_access_token({"sub": str(user.id)})
+        assert (
+            client.post(
+                "/api/v1/auth/logout", headers={"Authorization": f"Bearer {other}"}
+            ).status_code
+            == 200
+        )
+        jtis = [jti for _, jti, _ in theirs.get_revoked_tokens(0)]
+        assert jtis == [payload["jti"], decode_access_token(other)["jti"]]
+    finally:
+        database.set_engine(previous)
+        ours.close()
+        theirs.close()
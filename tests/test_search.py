@@ -0,0 +1,150 @@
+"""Тесты полнотекстового поиска items (индекс и GET /api/v1/items/search)."""
+
+import sqlite3
+
+from fastapi.testclient import TestClient
+
+from app import database
+from app.main import app
+from app.models import Item
+from app.search import SearchIndex
+from app.storage.memory import MemoryStorage
+from app.storage.sqlite import SQLiteStorage
+
+client = TestClient(app)
+
+
+def test_index_exact_and_prefix_terms():
+    """Тест: все слова, кроме последнего, точные, последнее — префикс."""
+    index = SearchIndex()
+    index.add(Item(1, "Red apple", 1, "Fresh fruit"))
+    index.add(Item(2, "Green apple", 2))
+    index.add(Item(3, "Apricot jam", 1))
+
+    assert index.search("apple") == [1, 2]
+    assert index.search("ap") == [1, 2, 3]
+    assert index.search("RED ap") == [1]
+    assert index.search("fresh apple") == [1]
+    assert index.search("fres apple") == []
+    assert index.search("ap", owner_id=1) == [1, 3]
+    assert index.search("ap", limit=2) == [1, 2]
+    assert index.search("!!!") == []
+
+
+def test_index_update_and_remove():
+    """Тест: переиндексация заменяет токены, удаление чистит словарь."""
+    index = SearchIndex()
+    item = Item(1, "Old name", 1)
+    index.add(item)
+    item.name = "New name"
+    index.add(item)
+
+    assert index.search("old") == []
+    assert index.search("new") == [1]
+    index.remove(1)
+    assert index.search("n") == []
+    assert len(index) == 0
+
+
+def test_index_skips_and_compacts_stale_terms():
+    """Тест: токены без items не находятся, возвращаются и вычищаются."""
+    index = SearchIndex()
+    for n in range(1, 11):
+        index.add(Item(n, f"tag{n}", 1))
+    for n in range(1, 5):
+        index.remove(n)
+
+    assert index.search("tag") == [5, 6, 7, 8, 9, 10]
+    index.add(Item(11, "tag1", 1))
+    assert index.search("tag1") == [10, 11]
+    for n in range(5, 12):
+        index.remove(n)
+    assert index.search("tag") == []
+    assert index._terms == []
+
+
+def test_facade_maintains_index(store):
+    """Тест: create/update/delete фасада обновляют индекс, set_engine перестраивает его."""
+    item = database.create_item("Blue whale", owner_id=1)
+    batch = database.create_items([("Blue sky", 1, None), ("Grey whale", 2, "big")])
+    assert [i.id for i in database.search_items("blue")] == [item.id, batch[0].id]
+
+    database.update_item(item.id, name="Orca")
+    database.delete_items([batch[1].id])
+    assert [i.id for i in database.search_items("whale")] == []
+    assert [i.id for i in database.search_items("or")] == [item.id]
+
+    other = MemoryStorage()
+    other.create_item("Blue moon", owner_id=1)
+    previous = database.set_engine(other)
+    assert [i.name for i in database.search_items("blue")] == ["Blue moon"]
+    database.set_engine(previous)
+    assert [i.name for i in database.search_items("blue")] == ["Blue sky"]
+
+
+def test_sqlite_search_sees_other_workers(tmp_path):
+    """Тест: с движком sqlite поиск видит записи другого воркера (FTS5 в базе)."""
+    path = str(tmp_path / "app.db")
+    ours, theirs = SQLiteStorage(path), SQLiteStorage(path)
+    previous = database.set_engine(ours)
+    try:
+        whale = theirs.create_item("Blue whale", owner_id=1, description="big_fish")
+        sky = theirs.create_item("Blue sky", owner_id=2)
+        assert [i.id for i in database.search_items("blu")] == [whale.id, sky.id]
+        assert [i.id for i in database.search_items("BLUE wh")] == [whale.id]
+        assert [i.id for i in database.search_items("big_f")] == [whale.id]
+        assert [i.id for i in database.search_items("blue", owner_id=2)] == [sky.id]
+        assert [i.id for i in database.search_items("blue", limit=1)] == [whale.id]
+        assert database.search_items("!!!") == []
+
+        theirs.update_item(whale.id, name="Orca")
+        theirs.delete_item(sky.id)
+        assert database.search_items("blue") == []
+        assert [i.name for i in database.search_items("or")] == ["Orca"]
+    finally:
+        database.set_engine(previous)
+        ours.close()
+        theirs.close()
+
+
+def test_sqlite_search_indexes_existing_database(tmp_path):
+    """Тест: база без items_fts индексируется при открытии."""
+    path = str(tmp_path / "app.db")
+    storage = SQLiteStorage(path)
+    item = storage.create_item("Old item", owner_id=1)
+    storage.close()
+    conn = sqlite3.connect(path)
+    conn.execute("DROP TABLE items_fts")
+    conn.close()
+
+    storage = SQLiteStorage(path)
+    assert [i.id for i in storage.search_items("old")] == [item.id]
+    storage.close()
+
+
+def test_search_endpoint_visibility(store, auth_headers):
+    """Тест: пользователь находит только свои items, admin — все."""
+    alice = store.create_user("alice", "alice@example.com", "x")
+    bob = store.create_user("bob", "bob@example.com", "x")
+    admin = store.create_user("root", "root@example.com", "x", "admin")
+    own = client.post("/api/v1/items", json={"name": "Secret plan"}, headers=auth_headers(alice))
+    client.post("/api/v1/items", json={"name": "Secret recipe"}, headers=auth_headers(bob))
+
+    r = client.get("/api/v1/items/search", params={"q": "secr"}, headers=auth_headers(alice))
+    assert r.status_code == 200
+    assert [i["id"] for i in r.json()] == [own.json()["id"]]
+
+    r = client.get("/api/v1/items/search", params={"q": "secret"}, headers=auth_headers(admin))
+    assert [i["name"] for i in r.json()] == ["Secret plan", "Secret recipe"]
+
+
+def test_search_endpoint_validation(store, auth_headers):
+    """Тест: пустой или слишком длинный запрос и неверный limit — 422."""
+    user = store.create_user("carol", "carol@example.com", "x")
+    headers = auth_headers(user)
+
+    assert client.get("/api/v1/items/search", params={"q": ""}, headers=headers).status_code == 422
+    r = client.get("/api/v1/items/search", params={"q": "x" * 101}, headers=headers)
+    assert r.status_code == 422
+    r = client.get("/api/v1/items/search", params={"q": "x", "limit": 0}, headers=headers)
+    assert r.status_code == 422
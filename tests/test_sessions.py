@@ -0,0 +1,128 @@
+"""Тесты сессий refresh-токенов (app.security.sessions и POST /api/v1/auth/refresh)."""
+
+import time
+
+from fastapi.testclient import TestClient
+
+from app import database
+from app.api.v1 import auth as auth_api
+from app.main import app
+from app.security.sessions import SessionStore
+from app.storage.sqlite import SQLiteStorage
+
+client = TestClient(app)
+
+
+def test_rotation_and_reuse_detection():
+    """Тест: refresh выдаёт новый токен, повтор старого закрывает сессию."""
+    sessions = SessionStore(shards=4)
+    first = sessions.create(7)
+    user_id, second = sessions.rotate(first)
+    assert user_id == 7 and second != first
+
+    assert sessions.rotate(first) is None
+    assert sessions.rotate(second) is None
+    assert len(sessions) == 0 and sessions.stats()["reuse_detected"] == 1
+    assert sessions.rotate("garbage") is None and sessions.rotate(".x") is None
+
+
+def test_revoke_requires_current_token():
+    """Тест: сессию закрывает только действующий refresh-токен."""
+    sessions = SessionStore(shards=2)
+    first = sessions.create(1)
+    _, second = sessions.rotate(first)
+    assert not sessions.revoke(first)
+    assert sessions.revoke(second)
+    assert sessions.rotate(second) is None and len(sessions) == 0
+
+
+def test_expiry_sweeps_only_due_buckets():
+    """Тест: истёкшие сессии не принимаются и убираются по корзинам."""
+    sessions = SessionStore(ttl=0.05, shards=1, bucket_seconds=0.01)
+    short = [sessions.create(n) for n in range(50)]
+    sessions.ttl = 60
+    live = sessions.create(99)
+    time.sleep(0.07)
+
+    assert sessions.rotate(short[0]) is None
+    assert len(sessions) == 1 and sessions.stats()["expired"] == 50
+    assert sessions.rotate(live)[0] == 99
+
+
+def test_refresh_endpoint_rotates_without_password(store, monkeypatch):
+    """Тест: /auth/refresh выдаёт рабочий access-токен, не проверяя пароль."""
+    r = client.post(
+        "/api/v1/auth/register",
+        json={"username": "refreshuser", "email": "refresh@example.com", "password": "x" * 12},
+    )
+    refresh_token = r.json()["refresh_token"]
+
+    async def no_hashing(*args):
+        raise AssertionError("password hash must not be used")
+
+    monkeypatch.setattr(auth_api, "averify_password", no_hashing)
+    r = client.post("/api/v1/auth/refresh", json={"refresh_token": refresh_token})
+    assert r.status_code == 200
+    body = r.json()
+    assert body["refresh_token"] != refresh_token
+    headers = {"Authorization": f"Bearer {body['access_token']}"}
+    assert client.get("/api/v1/auth/me", headers=headers).json()["username"] == "refreshuser"
+
+    r = client.post("/api/v1/auth/refresh", json={"refresh_token": refresh_token})
+    assert r.status_code == 401 and r.json()["detail"] == "Invalid refresh token"
+    r = client.post("/api/v1/auth/refresh", json={"refresh_token": body["refresh_token"]})
+    assert r.status_code == 401
+
+
+def test_logout_closes_session(store):
+    """Тест: logout с refresh-токеном закрывает сессию."""
+    r = client.post(
+        "/api/v1/auth/register",
+        json={"username": "logoutuser", "email": "logout@example.com", "password": "x" * 12},
+    )
+    refresh_token = r.json()["refresh_token"]
+    r = client.post("/api/v1/auth/logout", json={"refresh_token": refresh_token})
+    assert r.status_code == 200
+    r = client.post("/api/v1/auth/refresh", json={"refresh_token": refresh_token})
+    assert r.status_code == 401
+
+
+def test_sessions_shared_through_multi_process_engine(tmp_path):
+    """Тест: с движком sqlite refresh-токен одного воркера работает в другом."""
+    path = str(tmp_path / "app.db")
+    ours, theirs = SQLiteStorage(path), SQLiteStorage(path)
+    previous = database.set_engine(ours)
+    local_sessions = len(auth_api.session_store)
+    try:
+        r = client.post(
+            "/api/v1/auth/register",
+            json={"username": "shared", "email": "shared@example.com", "password": "x" * 12},
+        )
+        first = r.json()["refresh_token"]
+        assert len(auth_api.session_store) == local_sessions
+
+        database.set_engine(theirs)
+        r = client.post("/api/v1/auth/refresh", json={"refresh_token": first})
+        assert r.status_code == 200
+        second = r.json()["refresh_token"]
+        headers = {"Authorization": f"Bearer {r.json()['access_token']}"}
+        assert client.get("/api/v1/auth/me", headers=headers).json()["username"] == "shared"
+
+        database.set_engine(ours)
+        r = client.post("/api/v1/auth/refresh", json={"refresh_token": first})
+        assert r.status_code == 401
+        r = client.post("/api/v1/auth/refresh", json={"refresh_token": second})
+        assert r.status_code == 401
+
+        third = client.post(
+            "/api/v1/auth/login", json={"username": "shared", "password": "x" * 12}
+        ).json()["refresh_token"]
+        database.set_engine(theirs)
+        assert client.post("/api/v1/auth/logout", json={"refresh_token": third}).status_code == 200
+        database.set_engine(ours)
+        r = client.post("/api/v1/auth/refresh", json={"refresh_token": third})
+        assert r.status_code == 401
+    finally:
+        database.set_engine(previous)
+        ours.close()
+        theirs.close()
@@ -0,0 +1,77 @@
+"""Тесты хранилища в разделяемой памяти: данные видны из разных процессов."""
+
+import subprocess
+import sys
+import textwrap
+from pathlib import Path
+
+from app.storage.shared import SharedMemoryStorage
+
+ROOT = Path(__file__).resolve().parents[1]  # корень репозитория
+
+
+def _worker_script(path: str, code: str) -> str:
+    """Скрипт процесса-«воркера» со своим экземпляром движка."""
+    header = (
+        "from app.storage.shared import SharedMemoryStorage\n"
+        f"storage = SharedMemoryStorage({path!r})\n"
+    )
+    return header + textwrap.dedent(code)
+
+
+def _run_worker(path: str, code: str) -> str:
+    result = subprocess.run(
+        [sys.executable, "-c", _worker_script(path, code)],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return result.stdout.strip()
+
+
+def test_writes_visible_across_processes(tmp_path):
+    """Тест: запись одного процесса сразу видна другому и обратно."""
+    path = str(tmp_path / "shared.db")
+    storage = SharedMemoryStorage(path)
+    user = storage.create_user("shared", "shared@example.com", "hash")
+
+    item_id = _run_worker(
+        path,
+        f"""
+        user = storage.get_user_by_id({user.id})
+        print(storage.create_item("From worker", owner_id=user.id).id)
+        """,
+    )
+
+    assert storage.get_item_by_id(int(item_id)).name == "From worker"
+    storage.update_item(int(item_id), name="From parent")
+    assert _run_worker(path, f"print(storage.get_item_by_id({item_id}).name)") == "From parent"
+    storage.destroy()
+
+
+def test_concurrent_writers_get_unique_ids(tmp_path):
+    """Тест: параллельные процессы-писатели не дублируют id."""
+    path = str(tmp_path / "shared.db")
+    storage = SharedMemoryStorage(path)
+    script = _worker_script(
+        path,
+        """
+        ids = [storage.create_item(f"item {i}", owner_id=1).id for i in range(200)]
+        print(",".join(map(str, ids)))
+        """,
+    )
+    workers = [
+        subprocess.Popen(
+            [sys.executable, "-c", script], cwd=ROOT, stdout=subprocess.PIPE, text=True
+        )
+        for _ in range(4)
+    ]
+    ids = []
+    for worker in workers:
+        out, _ = worker.communicate(timeout=60)
+        ids.extend(int(i) for i in out.strip().split(","))
+
+    assert len(ids) == len(set(ids)) == 800
+    assert len(storage.get_items(owner_id=1, limit=1000)) == 800
+    storage.destroy()
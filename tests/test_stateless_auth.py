@@ -0,0 +1,83 @@
+"""Тесты stateless-режима аутентификации (AUTH_STATELESS)."""
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app import database, dependencies
+from app.main import app
+from app.models import Principal
+from app.storage.memory import MemoryStorage
+
+client = TestClient(app)
+
+
+class CountingStorage(MemoryStorage):
+    """MemoryStorage, считающий чтения пользователей по id."""
+
+    def __init__(self):
+        super().__init__()
+        self.user_reads = 0
+
+    def get_user_by_id(self, user_id):
+        self.user_reads += 1
+        return super().get_user_by_id(user_id)
+
+
+@pytest.fixture
+def store():
+    """Свежий считающий движок приложения на время теста."""
+    storage = CountingStorage()
+    previous = database.set_engine(storage)
+    yield storage
+    database.set_engine(previous)
+
+
+@pytest.fixture
+def stateless(monkeypatch):
+    monkeypatch.setattr(dependencies, "STATELESS_AUTH", True)
+
+
+def test_stateless_mode_skips_user_lookup(store, stateless, auth_headers):
+    """Тест: запросы к items не читают пользователя, владение проверяется по claims."""
+    owner = store.create_user("stateowner", "stateowner@example.com", "x")
+    stranger = store.create_user("statestranger", "statestranger@example.com", "x")
+    item = store.create_item("Stateless", owner_id=owner.id)
+
+    assert client.get(f"/api/v1/items/{item.id}", headers=auth_headers(owner)).status_code == 200
+    assert client.get(f"/api/v1/items/{item.id}", headers=auth_headers(stranger)).status_code == 403
+    assert store.user_reads == 0
+
+
+def test_stateless_role_comes_from_token(store, stateless, auth_headers):
+    """Тест: роль берётся из claims, без claim role — обычный пользователь."""
+    admin = store.create_user("stateadmin", "stateadmin@example.com", "x", "admin")
+
+    r = client.get("/api/v1/items/stats", headers=auth_headers(admin, role="admin"))
+    assert r.status_code == 200
+    assert client.get("/api/v1/items/stats", headers=auth_headers(admin)).status_code == 403
+
+
+def test_full_record_is_loaded_on_demand(store, stateless, auth_headers):
+    """Тест: /auth/me читает запись пользователя, несуществующий — 401."""
+    user = store.create_user("stateme", "stateme@example.com", "x")
+
+    r = client.get("/api/v1/auth/me", headers=auth_headers(user))
+    assert r.json() == {
+        "id": user.id,
+        "username": "stateme",
+        "email": "stateme@example.com",
+        "role": "user",
+    }
+    assert store.user_reads == 1
+    ghost = Principal(999)
+    assert client.get("/api/v1/auth/me", headers=auth_headers(ghost)).status_code == 401
+
+
+def test_stateful_mode_reads_user(store, auth_headers):
+    """Тест: по умолчанию пользователь читается из хранилища на каждом запросе."""
+    user = store.create_user("statefull", "statefull@example.com", "x")
+
+    r = client.get("/api/v1/auth/me", headers=auth_headers(user))
+    assert r.json()["username"] == "statefull"
+    assert client.get("/api/v1/items", headers=auth_headers(user)).status_code == 200
+    assert store.user_reads == 2
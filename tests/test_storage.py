@@ -0,0 +1,263 @@
+"""Тесты контракта движков хранилища (memory, journal, SQLite и shared)."""
+
+import random
+import sqlite3
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app import database
+from app.main import app
+from app.storage import id_index
+from app.storage.base import VersionConflictError
+from app.storage.id_index import IdIndex
+from app.storage.journal import JournaledMemoryStorage
+from app.storage.memory import MemoryStorage
+from app.storage.shared import SharedMemoryStorage
+from app.storage.sqlite import SQLiteStorage
+
+client = TestClient(app)
+
+
+@pytest.fixture(params=["memory", "journal", "sqlite", "shared"])
+def engine(request, tmp_path):
+    """Свежий движок хранилища каждого типа."""
+    if request.param == "memory":
+        storage = MemoryStorage()
+    elif request.param == "journal":
+        storage = JournaledMemoryStorage(str(tmp_path / "journal"))
+    elif request.param == "shared":
+        storage = SharedMemoryStorage(str(tmp_path / "shared.db"))
+    else:
+        storage = SQLiteStorage(str(tmp_path / "test.db"))
+    yield storage
+    storage.close()
+
+
+@pytest.fixture
+def sqlite_backend(tmp_path):
+    """Подменить движок приложения на SQLite на время теста."""
+    storage = SQLiteStorage(str(tmp_path / "app.db"))
+    previous = database.set_engine(storage)
+    yield storage
+    database.set_engine(previous)
+    storage.close()
+
+
+def test_engine_users(engine):
+    """Тест: создание и поиск пользователей, уникальность username/email."""
+    user = engine.create_user("alice", "Alice@Example.com", "hash", "admin")
+
+    assert engine.get_user_by_id(user.id).username == "alice"
+    assert engine.get_user_by_username("alice").id == user.id
+    assert engine.get_user_by_email("alice@example.com").role == "admin"
+    assert engine.get_user_by_username("Alice") is None
+    with pytest.raises(ValueError, match="Username"):
+        engine.create_user("alice", "other@example.com", "hash")
+    with pytest.raises(ValueError, match="Email"):
+        engine.create_user("bob", "ALICE@example.com", "hash")
+
+
+def test_engine_items(engine):
+    """Тест: CRUD и пагинация items одинаковы для всех движков."""
+    first = engine.create_item("First", owner_id=1, description="desc")
+    second = engine.create_item("Second", owner_id=2)
+    third = engine.create_item("Third", owner_id=1)
+
+    assert engine.get_item_by_id(first.id).to_dict() == first.to_dict()
+    assert [i.id for i in engine.get_items(owner_id=1)] == [first.id, third.id]
+    assert [i.id for i in engine.get_items(limit=2, offset=1)] == [second.id, third.id]
+    assert [i.id for i in engine.get_items(after_id=first.id)] == [second.id, third.id]
+
+    updated = engine.update_item(first.id, name="Renamed")
+    assert updated.name == "Renamed" and updated.description == "desc"
+    assert engine.update_item(999, name="Missing") is None
+
+    assert engine.delete_item(first.id) is True
+    assert engine.delete_item(first.id) is False
+    assert engine.get_item_by_id(first.id) is None
+    for missing_id in (0, -1, 10**9):
+        assert engine.get_item_by_id(missing_id) is None
+    # id не переиспользуются после удаления
+    assert engine.create_item("Fourth", owner_id=1).id > third.id
+
+
+def test_engine_batch_operations(engine):
+    """Тест: пакетные операции одинаковы для всех движков."""
+    created = engine.create_items([("A", 1, None), ("B", 1, "b"), ("C", 2, None)])
+    ids = [item.id for item in created]
+    assert ids == sorted(ids) and len(set(ids)) == 3
+    assert [i.id for i in engine.get_items(owner_id=1)] == ids[:2]
+
+    found = engine.get_items_by_ids([ids[2], 999, ids[0]])
+    assert [i.name if i else None for i in found] == ["C", None, "A"]
+
+    updated = engine.update_items([(ids[0], "A2", None), (999, "X", None)])
+    assert updated[0].name == "A2" and updated[1] is None
+    assert engine.get_item_by_id(ids[0]).name == "A2"
+
+    assert engine.delete_items([ids[1], ids[1], 999]) == [True, False, False]
+    assert [i.id for i in engine.get_items()] == [ids[0], ids[2]]
+
+
+def test_engine_versions_and_generations(engine):
+    """Тест: версия item растёт с изменениями, поколения наборов меняются."""
+    item = engine.create_item("Versioned", owner_id=1)
+    assert item.version == 1
+    owner_gen = engine.get_items_generation(1)
+    other_gen = engine.get_items_generation(2)
+    all_gen = engine.get_items_generation()
+
+    assert engine.update_item(item.id, name="Changed").version == 2
+    assert engine.get_item_by_id(item.id).version == 2
+    assert engine.get_items_generation(1) != owner_gen
+    assert engine.get_items_generation() != all_gen
+    assert engine.get_items_generation(2) == other_gen
+
+    owner_gen = engine.get_items_generation(1)
+    engine.delete_item(item.id)
+    assert engine.get_items_generation(1) != owner_gen
+    assert engine.epoch
+
+
+def test_engine_compare_and_set(engine):
+    """Тест: update/delete с expected_version выполняются только при совпадении версии."""
+    item = engine.create_item("CAS", owner_id=1)
+
+    assert engine.update_item(item.id, name="V2", expected_version=1).version == 2
+    with pytest.raises(VersionConflictError):
+        engine.update_item(item.id, name="Stale", expected_version=1)
+    assert engine.get_item_by_id(item.id).name == "V2"
+    with pytest.raises(VersionConflictError):
+        engine.delete_item(item.id, expected_version=1)
+    assert engine.delete_item(item.id, expected_version=2) is True
+    assert engine.update_item(item.id, name="Gone", expected_version=2) is None
+    assert engine.delete_item(item.id, expected_version=2) is False
+
+
+def test_engine_item_counts(engine):
+    """Тест: счётчики items (всего, по владельцу, владельцев) следуют за вставками и удалениями."""
+    first = engine.create_item("One", owner_id=1)
+    engine.create_items([("Two", 1, None), ("Three", 2, None)])
+    assert (engine.count_items(), engine.count_items(1), engine.count_items(2)) == (3, 2, 1)
+    assert engine.count_items(3) == 0 and engine.count_item_owners() == 2
+
+    engine.update_item(first.id, name="Renamed")
+    assert engine.count_items(1) == 2
+    engine.delete_items([first.id, first.id + 2, 999])
+    assert (engine.count_items(), engine.count_items(1), engine.count_items(2)) == (1, 1, 0)
+    assert engine.count_item_owners() == 1
+
+
+def test_memory_items_compact_layout():
+    """Тест: items хранятся в плотном списке по id, owner_id общий на владельца."""
+    storage = MemoryStorage()
+    first, second = storage.create_items([("A", int("1000"), None), ("B", int("1000"), None)])
+
+    assert storage.get_item_by_id(first.id) is first
+    assert first.owner_id is second.owner_id
+    assert not hasattr(first, "__dict__")
+    storage.delete_item(first.id)
+    assert storage.get_item_by_id(first.id) is None
+    assert storage.create_item("C", owner_id=1000).id == second.id + 1
+
+
+def test_id_index_matches_sorted_list(monkeypatch):
+    """Тест: IdIndex с мелкими блоками ведёт себя как отсортированный список."""
+    monkeypatch.setattr(id_index, "BLOCK_SIZE", 4)
+    rng = random.Random(7)
+    index, reference = IdIndex(range(1, 40)), list(range(1, 40))
+    for _ in range(300):
+        item_id = rng.randint(1, 120)
+        if item_id in reference:
+            assert index.remove(item_id)
+            reference.remove(item_id)
+        else:
+            index.add(item_id)
+            reference.append(item_id)
+            reference.sort()
+        assert not index.remove(1000)
+        offset, limit = rng.randint(0, len(reference) + 2), rng.randint(1, 9)
+        after = rng.choice(reference) if reference else None
+        start = reference.index(after) + 1 if after is not None else 0
+        assert index.page(offset, limit) == reference[offset : offset + limit]
+        assert index.page(offset, limit, after) == reference[start + offset :][:limit]
+    assert list(index) == reference and len(index) == len(reference)
+
+
+def test_memory_pages_after_deletes():
+    """Тест: страницы по offset и курсору корректны после удалений из середины."""
+    storage = MemoryStorage()
+    items = storage.create_items([(f"i{n}", 1 + n % 2, None) for n in range(3000)])
+    for item in items[100:2500:3]:
+        storage.delete_item(item.id)
+    alive = [item.id for item in items if storage.get_item_by_id(item.id) is not None]
+    owner = [item_id for item_id in alive if storage.get_item_by_id(item_id).owner_id == 2]
+
+    assert storage.count_items() == len(alive)
+    assert [i.id for i in storage.get_items(limit=50, offset=1500)] == alive[1500:1550]
+    page = storage.get_items(limit=20, after_id=alive[700], offset=5)
+    assert [i.id for i in page] == alive[706:726]
+    assert [i.id for i in storage.get_items(2, limit=30, offset=400)] == owner[400:430]
+
+
+def test_sqlite_persists_across_reopen(tmp_path):
+    """Тест: данные SQLite переживают перезапуск движка."""
+    path = str(tmp_path / "persist.db")
+    storage = SQLiteStorage(path)
+    user = storage.create_user("persist", "persist@example.com", "hash")
+    item = storage.create_item("Kept", owner_id=user.id)
+    storage.close()
+
+    reopened = SQLiteStorage(path)
+    assert reopened.get_user_by_username("persist").id == user.id
+    assert reopened.get_item_by_id(item.id).name == "Kept"
+    reopened.close()
+
+
+def test_sqlite_adds_version_to_old_database(tmp_path):
+    """Тест: база без колонки version дополняется при открытии."""
+    path = str(tmp_path / "old.db")
+    conn = sqlite3.connect(path)
+    conn.execute(
+        "CREATE TABLE items (id INTEGER PRIMARY KEY AUTOINCREMENT, name TEXT NOT NULL, "
+        "owner_id INTEGER NOT NULL, description TEXT)"
+    )
+    conn.execute("INSERT INTO items (name, owner_id) VALUES ('Old', 1)")
+    conn.commit()
+    conn.close()
+
+    storage = SQLiteStorage(path)
+    assert storage.get_item_by_id(1).version == 1
+    assert storage.count_items() == storage.count_items(1) == storage.count_item_owners() == 1
+    assert storage.update_item(1, name="New").version == 2
+    storage.close()
+
+
+def test_api_with_sqlite_backend(sqlite_backend):
+    """Тест: эндпойнты работают без изменений на SQLite."""
+    r = client.post(
+        "/api/v1/auth/register",
+        json={
+            "username": "sqliteuser",
+            "email": "sqlite@example.com",
+            "password": "securepassword123",
+        },
+    )
+    assert r.status_code == 201
+    headers = {"Authorization": f"Bearer {r.json()['access_token']}"}
+
+    r = client.post("/api/v1/items", json={"name": "Stored"}, headers=headers)
+    assert r.status_code == 201
+    item_id = r.json()["id"]
+
+    r = client.patch(f"/api/v1/items/{item_id}", json={"name": "Changed"}, headers=headers)
+    assert r.json()["name"] == "Changed"
+    r = client.get("/api/v1/items", headers=headers)
+    assert [item["id"] for item in r.json()] == [item_id]
+    assert sqlite_backend.get_item_by_id(item_id).name == "Changed"
+
+    r = client.delete(f"/api/v1/items/{item_id}", headers=headers)
+    assert r.status_code == 204
+    r = client.get(f"/api/v1/items/{item_id}", headers=headers)
+    assert r.status_code == 404
@@ -0,0 +1,68 @@
+"""Тесты кэша проверенных токенов (app.security.auth.VerifiedTokenCache)."""
+
+import time
+from datetime import timedelta
+
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.security.auth import (
+    VerifiedTokenCache,
+    create_access_token,
+    decode_access_token_cached,
+    token_cache,
+)
+
+client = TestClient(app)
+
+
+def test_cache_returns_claims_until_exp():
+    """Тест: запись живёт не дольше exp токена и ttl."""
+    cache = VerifiedTokenCache(max_entries=10, ttl=60)
+    cache.put("a", {"sub": 1, "exp": time.time() + 0.05})
+    cache.put("b", {"sub": 2, "exp": time.time() + 3600})
+    assert cache.get("a")["sub"] == 1
+    time.sleep(0.06)
+    assert cache.get("a") is None and cache.get("b")["sub"] == 2
+
+    short = VerifiedTokenCache(max_entries=10, ttl=0.01)
+    short.put("c", {"sub": 3, "exp": time.time() + 3600})
+    time.sleep(0.02)
+    assert short.get("c") is None
+
+
+def test_cache_evicts_and_discards():
+    """Тест: LRU-вытеснение сверх лимита и удаление при отзыве."""
+    cache = VerifiedTokenCache(max_entries=2, ttl=60)
+    cache.put("a", {"sub": 1})
+    cache.put("b", {"sub": 2})
+    cache.get("a")
+    cache.put("c", {"sub": 3})
+    assert cache.get("b") is None and cache.get("a") is not None
+    cache.discard("a")
+    assert cache.get("a") is None
+    assert cache.stats()["evictions"] == 1
+
+
+def test_decode_caches_only_valid_tokens():
+    """Тест: валидный токен проверяется один раз, невалидный не кэшируется."""
+    token = create_access_token({"sub": "7"}, expires_delta=timedelta(minutes=5))
+    hits = token_cache.hits
+    assert decode_access_token_cached(token)["sub"] == 7
+    assert decode_access_token_cached(token)["sub"] == 7
+    assert token_cache.hits == hits + 1
+
+    entries = token_cache.stats()["entries"]
+    assert decode_access_token_cached(token + "x") is None
+    assert token_cache.stats()["entries"] == entries
+    token_cache.discard(token)
+
+
+def test_authenticated_requests_hit_cache(store, auth_headers):
+    """Тест: повторные запросы с тем же токеном проходят аутентификацию по кэшу."""
+    user = store.create_user("tokenuser", "token@example.com", "x")
+    headers = auth_headers(user)
+    assert client.get("/api/v1/items", headers=headers).status_code == 200
+    hits = token_cache.hits
+    assert client.get("/api/v1/items", headers=headers).status_code == 200
+    assert token_cache.hits == hits + 1